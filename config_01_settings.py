@@ -19,7 +19,12 @@ def load_settings():
         "font_size": 12,
         "line_spacing_within": 4,  # 段落內行距
         "dark_mode": False,
-        "custom_shortcuts": []
+        "custom_shortcuts": [],
+        "conversion_cache_on_disk": False,  # 是否將段落轉換結果快取到磁碟
+        # 校正階段 ("correction_stages"、"word_import_stages") 不在預設設定中：只有使用者
+        # 自訂時才寫入設定檔，未設定時使用 text_11_pipeline 的預設階段，新增的階段因此能自動套用
+        "live_correction": False,  # 輸入停頓後自動校正可見範圍
+        "conversion": "s2t"  # OpenCC 轉換設定
     }
     
     # 設定檔路徑
@@ -0,0 +1,10 @@
+"""
+pytest 設定：讓測試可以直接匯入專案根目錄的模組
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 打包輸出的資料夾不收集測試
+collect_ignore = ["build", "dist"]
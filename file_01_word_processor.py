@@ -77,8 +77,10 @@ def load_and_display_word_content(self, file_path, password=None, skip_processin
                     from text_01_correction import correct_text_for_word_import
                     corrected_content = correct_text_for_word_import(self, content)
                     
-                    # 插入修正後的文字
+                    # 插入修正後的文字並標示修正
                     self.text_area.insert("1.0", corrected_content)
+                    from text_01_correction import tag_word_import_corrections
+                    tag_word_import_corrections(self)
                     
                     # 提取圖片
                     from file_02_image_handler import extract_images_from_docx
@@ -104,8 +106,10 @@ def load_and_display_word_content(self, file_path, password=None, skip_processin
             from text_01_correction import correct_text_for_word_import
             corrected_content = correct_text_for_word_import(self, content)
             
-            # 插入修正後的文字
+            # 插入修正後的文字並標示修正
             self.text_area.insert("1.0", corrected_content)
+            from text_01_correction import tag_word_import_corrections
+            tag_word_import_corrections(self)
             
             # 提取圖片
             from file_02_image_handler import extract_images_from_docx
@@ -197,6 +201,33 @@ def _process_unencrypted_file(self, file_path):
             # 兩種方法都失敗，拋出異常
             raise Exception(f"無法讀取檔案: {str(docx_error)}")
 
+def read_word_text(file_path, password=None):
+    """讀取 Word 檔案的文字內容 (不需要視窗介面，供批次處理使用)
+
+    參數:
+        file_path: Word檔案路徑
+        password: 檔案密碼（如果有的話）
+
+    回傳:
+        檔案內容
+    """
+    if not password:
+        return _process_unencrypted_file(None, file_path)
+
+    # 先解密到記憶體中，再以與未加密檔案相同的方式讀取
+    decrypted = BytesIO()
+    with open(file_path, 'rb') as file:
+        office_file = msoffcrypto.OfficeFile(file)
+        office_file.load_key(password=password)
+        office_file.decrypt(decrypted)
+    try:
+        decrypted.seek(0)
+        return docx2txt.process(decrypted)
+    except Exception as docx2txt_error:
+        print(f"docx2txt 處理解密檔案失敗: {str(docx2txt_error)}")
+        decrypted.seek(0)
+        return _extract_text_from_document(None, Document(decrypted))
+
 def _is_password_error(self, error_message):
     """檢查錯誤訊息是否與密碼保護相關
 
@@ -453,8 +484,10 @@ def handle_password_protected_file(self, file_path):
                 from text_01_correction import correct_text_for_word_import
                 corrected_content = correct_text_for_word_import(self, content)
                 
-                # 插入修正後的文字
+                # 插入修正後的文字並標示修正
                 self.text_area.insert("1.0", corrected_content)
+                from text_01_correction import tag_word_import_corrections
+                tag_word_import_corrections(self)
                 
                 # 更新狀態欄
                 self.status_bar.config(text=f"已載入加密檔案: {os.path.basename(file_path)}")
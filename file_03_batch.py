@@ -0,0 +1,271 @@
+"""
+批次校正模組：不開啟視窗，從命令列校正整個資料夾的文件
+
+用法:
+    python file_03_batch.py 輸入資料夾 [-o 輸出資料夾] [-j 行程數] [-r] [--password 密碼] [--conversion 轉換設定]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 可批次處理的副檔名
+BATCH_EXTENSIONS = ('.docx', '.txt')
+
+# 預設輸出資料夾名稱 (建立在輸入資料夾旁)
+DEFAULT_OUTPUT_SUFFIX = "_corrected"
+
+# 批次摘要報告檔名
+SUMMARY_FILENAME = "batch_summary.json"
+
+# 工作行程內的校正對象與校正流程 (由 _init_batch_worker 建立)
+_batch_tool = None
+_batch_pipeline = None
+
+def create_headless_tool(conversion, protected_words, settings=None):
+    """建立不需要視窗的校正對象 (提供校正流程需要的 converter、protected_words、settings)
+
+    參數:
+        conversion: OpenCC 轉換設定名稱，None 表示使用設定中的轉換設定
+        protected_words: 保護詞彙列表
+        settings: 設定字典
+
+    回傳:
+        校正對象
+    """
+    from types import SimpleNamespace
+    from text_09_converter import get_converter
+    return SimpleNamespace(converter=get_converter(conversion),
+                           protected_words=list(protected_words), settings=dict(settings or {}))
+
+def _init_batch_worker(conversion, protected_words, settings, stage_ids):
+    """工作行程初始化：每個行程只載入一次 OpenCC 字典並建立校正流程"""
+    global _batch_tool, _batch_pipeline
+    from text_11_pipeline import CorrectionPipeline
+    _batch_tool = create_headless_tool(conversion, protected_words, settings)
+    _batch_pipeline = CorrectionPipeline(stage_ids)
+
+def find_batch_files(input_dir, recursive=False):
+    """列出資料夾中可批次處理的檔案
+
+    參數:
+        input_dir: 輸入資料夾
+        recursive: 是否包含子資料夾
+
+    回傳:
+        排序後的檔案路徑列表
+    """
+    files = []
+    for directory, subdirectories, filenames in os.walk(input_dir):
+        for filename in filenames:
+            # 略過 Word 開啟檔案時產生的暫存檔
+            if filename.startswith('~$'):
+                continue
+            if os.path.splitext(filename)[1].lower() in BATCH_EXTENSIONS:
+                files.append(os.path.join(directory, filename))
+        if not recursive:
+            break
+        subdirectories.sort()
+    return sorted(files)
+
+def read_document_text(file_path, password=None):
+    """讀取文件文字 (.docx 或 UTF-8 純文字檔)
+
+    參數:
+        file_path: 檔案路徑
+        password: Word 檔案密碼
+
+    回傳:
+        文件文字
+    """
+    if file_path.lower().endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8-sig') as file:
+            return file.read()
+    from file_01_word_processor import read_word_text
+    return read_word_text(file_path, password) or ""
+
+def batch_output_paths(input_path, input_dir, output_dir):
+    """輸入檔案對應的校正後文字與修正報告路徑
+
+    輸出檔名保留原本的副檔名 (a.docx 輸出 a.docx.txt 與 a.docx.json)，同一資料夾中
+    主檔名相同的 a.docx 與 a.txt 不會寫入同一個檔案。
+
+    參數:
+        input_path: 輸入檔案路徑
+        input_dir: 輸入資料夾
+        output_dir: 輸出資料夾
+
+    回傳:
+        (校正後文字路徑, 修正報告路徑)
+    """
+    base = os.path.join(output_dir, os.path.relpath(input_path, input_dir))
+    return base + ".txt", base + ".json"
+
+def _write_json(path, data):
+    """寫入 JSON 檔案 (先寫入暫存檔再取代，避免中斷時留下不完整的檔案)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+def _process_file(input_path, text_path, report_path, password=None):
+    """在工作行程中校正單一檔案，寫入校正後文字與修正報告
+
+    參數:
+        input_path: 輸入檔案路徑
+        text_path: 校正後文字的輸出路徑
+        report_path: 修正報告的輸出路徑
+        password: Word 檔案密碼
+
+    回傳:
+        檔案處理結果摘要字典
+    """
+    started = time.perf_counter()
+    summary = {"source": input_path, "output": text_path, "report": report_path}
+    try:
+        text = read_document_text(input_path, password)
+        result = _batch_pipeline.run(_batch_tool, text)
+
+        directory = os.path.dirname(text_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(text_path, 'w', encoding='utf-8') as file:
+            file.write(result["text"])
+
+        summary["characters"] = len(text)
+        summary["changes"] = len(result["changes"])
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        from text_13_report import iter_report_records, export_report
+        export_report(report_path, iter_report_records(result["text"], result["changes"]), {
+            "source": input_path,
+            "output": text_path,
+            "characters": len(text),
+            "stages": _batch_pipeline.stage_ids,
+            "timings": result["timings"],
+        })
+        summary["status"] = "ok"
+    except Exception as e:
+        summary["status"] = "error"
+        summary["error"] = str(e)
+        summary["traceback"] = traceback.format_exc()
+    return summary
+
+def run_batch(input_dir, output_dir=None, workers=None, recursive=False, password=None,
+              stage_ids=None, conversion=None):
+    """批次校正資料夾中的文件
+
+    每個檔案輸出一個校正後的 .txt 與一個 .json 修正報告 (檔名保留原本的副檔名，
+    見 batch_output_paths)，保留原本的子資料夾結構，
+    並在輸出資料夾寫入整批的摘要報告。
+
+    參數:
+        input_dir: 輸入資料夾
+        output_dir: 輸出資料夾，None 表示在輸入資料夾旁建立「名稱_corrected」
+        workers: 工作行程數，None 表示使用所有可用核心
+        recursive: 是否包含子資料夾
+        password: 加密 Word 檔案的密碼
+        stage_ids: 校正階段代號列表，None 表示使用匯入 Word 檔案時的設定
+        conversion: OpenCC 轉換設定名稱，None 表示使用設定中的轉換設定
+
+    回傳:
+        摘要字典，含每個檔案的處理結果
+    """
+    from config_01_settings import load_settings
+    from config_02_protected_words import load_protected_words
+    from text_07_parallel import worker_count
+    from text_11_pipeline import get_pipeline
+
+    input_dir = os.path.abspath(input_dir)
+    if output_dir is None:
+        output_dir = input_dir.rstrip(os.sep) + DEFAULT_OUTPUT_SUFFIX
+    output_dir = os.path.abspath(output_dir)
+    settings = load_settings()
+    if conversion is None:
+        conversion = settings.get("conversion") or 's2t'
+    if stage_ids is None:
+        from types import SimpleNamespace
+        stage_ids = get_pipeline(SimpleNamespace(settings=settings), "word_import").stage_ids
+    protected_words = [word for word in load_protected_words() if word]
+
+    files = find_batch_files(input_dir, recursive)
+    # 輸出資料夾位於輸入資料夾內時，不處理先前的輸出
+    files = [path for path in files if not path.startswith(output_dir + os.sep)]
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [(path,) + batch_output_paths(path, input_dir, output_dir) for path in files]
+
+    started = time.perf_counter()
+    results = []
+    workers = max(1, min(workers or worker_count(), len(jobs) or 1))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(conversion, protected_words, settings, stage_ids)) as pool:
+        futures = [pool.submit(_process_file, *job, password) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            summary = future.result()
+            results.append(summary)
+            if summary["status"] == "ok":
+                print(f"[{done}/{len(jobs)}] {summary['source']}: 修正 {summary['changes']} 處")
+            else:
+                print(f"[{done}/{len(jobs)}] {summary['source']}: 失敗 - {summary['error']}")
+
+    results.sort(key=lambda item: item["source"])
+    batch_summary = {
+        "input": input_dir,
+        "output": output_dir,
+        "conversion": conversion,
+        "stages": list(stage_ids),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 3),
+        "processed": sum(1 for item in results if item["status"] == "ok"),
+        "failed": sum(1 for item in results if item["status"] != "ok"),
+        "files": results,
+    }
+    _write_json(os.path.join(output_dir, SUMMARY_FILENAME), batch_summary)
+    return batch_summary
+
+def main(argv=None):
+    """命令列入口點
+
+    參數:
+        argv: 命令列參數，None 表示使用 sys.argv
+
+    回傳:
+        結束代碼 (有檔案失敗時為 1)
+    """
+    from text_09_converter import CONVERSION_PROFILES
+    parser = argparse.ArgumentParser(description="批次校正資料夾中的 Word 與純文字檔案 (不開啟視窗)")
+    parser.add_argument("input_dir", help="輸入資料夾")
+    parser.add_argument("-o", "--output", help=f"輸出資料夾 (預設為輸入資料夾名稱加上 {DEFAULT_OUTPUT_SUFFIX})")
+    parser.add_argument("-j", "--jobs", type=int, help="工作行程數 (預設為可用的 CPU 核心數)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="包含子資料夾")
+    parser.add_argument("--password", help="加密 Word 檔案的密碼")
+    parser.add_argument("--conversion", choices=[conversion for conversion, _ in CONVERSION_PROFILES],
+                        help="OpenCC 轉換設定 (預設使用程式設定中的轉換設定)")
+    parser.add_argument("--stages", help="以逗號分隔的校正階段，例如 normalize,punctuation,rules,opencc,typo")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        print(f"找不到輸入資料夾: {args.input_dir}")
+        return 2
+
+    stage_ids = None
+    if args.stages:
+        from text_11_pipeline import STAGES
+        stage_ids = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+        unknown = [stage for stage in stage_ids if stage not in STAGES]
+        if unknown:
+            print(f"未知的校正階段: {', '.join(unknown)} (可用: {', '.join(STAGES)})")
+            return 2
+    summary = run_batch(args.input_dir, args.output, args.jobs, args.recursive, args.password, stage_ids,
+                        args.conversion)
+    print(f"完成: 成功 {summary['processed']} 個，失敗 {summary['failed']} 個，"
+          f"耗時 {summary['seconds']} 秒，結果位於 {summary['output']}")
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+原文與轉換後文字對齊的測試
+"""
+import random
+
+from text_04_alignment import align_texts, correction_records, map_offset, source_ranges
+
+def _apply(original, corrected, ranges):
+    """以差異區段由原文重建轉換後文字"""
+    pieces = []
+    copied = 0
+    for orig_start, orig_end, corr_start, corr_end in ranges:
+        pieces.append(original[copied:orig_start])
+        pieces.append(corrected[corr_start:corr_end])
+        copied = orig_end
+    pieces.append(original[copied:])
+    return ''.join(pieces)
+
+def test_identical_texts_have_no_ranges():
+    assert align_texts("相同的文字", "相同的文字") == []
+
+def test_same_length_substitutions_are_exact():
+    assert align_texts("这是后面", "這是後面") == [(0, 1, 0, 1), (2, 3, 2, 3)]
+
+def test_length_changes_are_aligned():
+    ranges = align_texts("我的的書，你好", "我的書，你好")
+    assert _apply("我的的書，你好", "我的書，你好", ranges) == "我的書，你好"
+    assert ranges[0][:2] in ((1, 2), (2, 3))
+
+def test_random_edits_reconstruct_corrected_text():
+    generator = random.Random(1)
+    alphabet = "的一是了我，。\n"
+    for _ in range(200):
+        original = ''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 40)))
+        corrected = list(original)
+        for _ in range(generator.randint(0, 5)):
+            position = generator.randint(0, len(corrected))
+            action = generator.random()
+            if action < 0.3 and position < len(corrected):
+                del corrected[position]
+            elif action < 0.6:
+                corrected.insert(position, generator.choice(alphabet))
+            elif position < len(corrected):
+                corrected[position] = generator.choice(alphabet)
+        corrected = ''.join(corrected)
+        assert _apply(original, corrected, align_texts(original, corrected)) == corrected
+
+def test_correction_records_skip_protected_spans():
+    assert correction_records("这是后面", "這是後面") == [(0, 1, "这"), (2, 3, "后")]
+    assert correction_records("这是后面", "這是後面", [(0, 1)]) == [(2, 3, "后")]
+    # 純刪除沒有可標記的字元
+    assert correction_records("我的的書", "我的書") == []
+
+def test_source_ranges_include_adjacent_deletions():
+    alignment = align_texts("我的的書", "我的書")
+    assert source_ranges([(1, 2)], alignment) == [(1, 3)]
+    alignment = align_texts("abcdef", "abXYZdef")
+    assert source_ranges([(2, 5), (6, 8)], alignment) == [(2, 3), (4, 6)]
+
+def test_map_offset_follows_edits():
+    alignment = align_texts("abcdef", "abXYZdef")
+    assert [map_offset(position, alignment) for position in range(7)] == [0, 1, 2, 5, 6, 7, 8]
+    # 游標在被刪除的區域內時移到區域位置
+    alignment = align_texts("abcdef", "aef")
+    assert [map_offset(position, alignment) for position in range(7)] == [0, 1, 1, 1, 1, 2, 3]
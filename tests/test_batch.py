@@ -0,0 +1,35 @@
+"""
+批次校正模組的測試
+"""
+import json
+import os
+
+from docx import Document
+
+from file_03_batch import batch_output_paths, run_batch
+
+def test_output_paths_keep_source_extension(tmp_path):
+    input_dir = str(tmp_path / "in")
+    output_dir = str(tmp_path / "out")
+    assert batch_output_paths(os.path.join(input_dir, "sub", "a.docx"), input_dir, output_dir) == (
+        os.path.join(output_dir, "sub", "a.docx.txt"), os.path.join(output_dir, "sub", "a.docx.json"))
+
+def test_files_with_same_stem_do_not_overwrite_each_other(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    document = Document()
+    document.add_paragraph("文件，，內容")
+    document.save(str(input_dir / "a.docx"))
+    (input_dir / "a.txt").write_text("純文字。。內容", encoding="utf-8")
+
+    summary = run_batch(str(input_dir), str(tmp_path / "out"), workers=1, stage_ids=["rules"])
+    assert summary["processed"] == 2
+    outputs = {os.path.basename(item["source"]): item["output"] for item in summary["files"]}
+    assert len(set(outputs.values())) == 2
+    with open(outputs["a.docx"], encoding="utf-8") as file:
+        assert "文件，內容" in file.read()
+    with open(outputs["a.txt"], encoding="utf-8") as file:
+        assert file.read() == "純文字。內容"
+    with open(tmp_path / "out" / "a.txt.json", encoding="utf-8") as file:
+        assert json.load(file)
@@ -0,0 +1,57 @@
+"""
+OpenCC 混合轉換器與磁碟快取的測試
+"""
+import pickle
+import threading
+from concurrent.futures import Future
+
+import opencc
+
+import text_09_converter
+from text_16_translate_converter import ConversionStep, HybridConverter, sample_text
+
+def test_hybrid_converter_matches_opencc():
+    converter = opencc.OpenCC('s2t')
+    text = sample_text(converter, size=20000)
+    assert HybridConverter(converter).convert(text) == converter.convert(text)
+
+def test_cached_steps_rebuild_converter_without_dictionaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_09_converter, 'CONVERTER_CACHE_DIR', str(tmp_path))
+    original = opencc.OpenCC('s2t')
+    text = sample_text(original, size=20000)
+    text_09_converter._save_cached_converter(HybridConverter(original))
+
+    with open(tmp_path / "s2t.pickle", 'rb') as file:
+        _, steps, chars = pickle.load(file)
+    assert all(isinstance(step, ConversionStep) for step in steps)
+    assert chars
+
+    cached = text_09_converter._load_cached_converter('s2t')
+    assert cached.conversion == 's2t'
+    assert cached.convert(text) == original.convert(text)
+    # 逐詞比對只使用轉換步驟中的字典，原本的轉換器不需要載入字典
+    assert not cached.converter._dict_init_done
+
+def test_stale_cache_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_09_converter, 'CONVERTER_CACHE_DIR', str(tmp_path))
+    with open(tmp_path / "s2t.pickle", 'wb') as file:
+        pickle.dump((("old",), [], frozenset()), file)
+    assert text_09_converter._load_cached_converter('s2t') is None
+
+def test_loader_writes_cache_on_non_daemon_thread(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_09_converter, 'CONVERTER_CACHE_DIR', str(tmp_path))
+    started = []
+    original_thread = threading.Thread
+
+    def record_thread(*args, **kwargs):
+        thread = original_thread(*args, **kwargs)
+        started.append(thread)
+        return thread
+
+    monkeypatch.setattr(threading, 'Thread', record_thread)
+    future = Future()
+    text_09_converter._load_converter('s2t', future)
+    assert future.result().convert("汉字") == "漢字"
+    assert len(started) == 1 and not started[0].daemon
+    started[0].join()
+    assert (tmp_path / "s2t.pickle").exists()
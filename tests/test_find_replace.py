@@ -0,0 +1,31 @@
+"""
+尋找與取代模組的測試：在文字副本上找出所有符合項目並計算取代後的差異區段
+"""
+import re
+
+import pytest
+
+from text_19_find_replace import compile_search, find_matches, replace_matches
+
+def test_plain_text_search_escapes_pattern_and_ignores_case():
+    compiled = compile_search("a.b")
+    assert find_matches("a.b axb A.B", compiled) == [(0, 3), (8, 11)]
+    assert find_matches("a.b A.B", compile_search("a.b", match_case=True)) == [(0, 3)]
+
+def test_regex_search_is_multiline_and_skips_empty_matches():
+    compiled = compile_search("^第.*", regex=True)
+    assert find_matches("第一行\n說明\n第三行", compiled) == [(0, 3), (7, 10)]
+    assert find_matches("abc", compile_search("x*", regex=True)) == []
+    with pytest.raises(re.error):
+        compile_search("(", regex=True)
+
+def test_replace_matches_reports_edits():
+    text, edits = replace_matches("的的 和 的的", compile_search("的的"), "的")
+    assert text == "的 和 的"
+    assert edits == [(0, 2, 0, 1), (5, 7, 4, 5)]
+    assert replace_matches("abc", compile_search("x"), "y") == ("abc", [])
+
+def test_regex_replacement_expands_groups_only_in_regex_mode():
+    compiled = compile_search(r"(\d+)年", regex=True)
+    assert replace_matches("2024年", compiled, r"\1 年", regex=True) == ("2024 年", [(0, 5, 0, 6)])
+    assert replace_matches("a1", compile_search("a"), r"\1")[0] == "\\11"
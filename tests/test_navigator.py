@@ -0,0 +1,74 @@
+"""
+修正導覽模組的測試：拒絕修正時還原原文並更新紀錄與索引
+"""
+from types import SimpleNamespace
+
+from text_06_incremental import paragraph_hash
+from text_18_navigator import _reject_hits, build_correction_index
+
+class FakeText:
+    """只支援單行內修改的假文字區域 (位置格式為「行.列」)"""
+    def __init__(self, text):
+        self.lines = text.split('\n')
+        self.tags = []
+
+    def _position(self, index):
+        line, column = index.split('.')
+        line = int(line)
+        return line, len(self.lines[line - 1]) if column == 'end' else int(column)
+
+    def get(self, start, end):
+        if (start, end) == ("1.0", "end-1c"):
+            return '\n'.join(self.lines)
+        (first, start_column), (last, end_column) = self._position(start), self._position(end)
+        text = '\n'.join(self.lines[first - 1:last])
+        return text[start_column:len(text) - len(self.lines[last - 1]) + end_column]
+
+    def replace(self, start, end, text):
+        (line, start_column), (_, end_column) = self._position(start), self._position(end)
+        content = self.lines[line - 1]
+        self.lines[line - 1] = content[:start_column] + text + content[end_column:]
+
+    def tag_add(self, tag, *indices):
+        self.tags.append((tag,) + indices)
+
+    def tag_remove(self, tag, start, end):
+        pass
+
+    def cget(self, option):
+        return True
+
+    def config(self, **options):
+        pass
+
+    def edit_separator(self):
+        pass
+
+def _tool(text, paragraphs):
+    state = {'key': None, 'paragraphs': {paragraph_hash(line): items for line, items in paragraphs.items()}}
+    return SimpleNamespace(text_area=FakeText(text), correction_state=state, buffer_generation=0)
+
+def test_rejecting_restores_original_and_shifts_kept_corrections():
+    tool = _tool("第一行\n好，的世界", {"好，的世界": [(1, 2, "rules", "，，"), (3, 5, "opencc", "世界")]})
+    index = build_correction_index(tool)
+    _reject_hits(tool, index, [0])
+    assert tool.text_area.get("1.0", "end-1c") == "第一行\n好，，的世界"
+    assert index.hits == [(2, 4, 6, "opencc", "世界", "世界")]
+    assert tool.correction_state['paragraphs'][paragraph_hash("好，，的世界")] == [(4, 6, "opencc", "世界")]
+
+def test_rejecting_overlapping_corrections_restores_the_enclosing_one():
+    # 建議範圍內的轉換與建議一起被拒絕時，只套用建議的文字
+    tool = _tool("甲乙丙丁戊", {"甲乙丙丁戊": [(0, 4, "repeats", "X"), (1, 2, "opencc", "乙")]})
+    index = build_correction_index(tool)
+    _reject_hits(tool, index, [0, 1])
+    assert tool.text_area.get("1.0", "end-1c") == "X戊"
+    assert index.hits == []
+    assert tool.correction_state['paragraphs'][paragraph_hash("X戊")] == []
+
+def test_partially_overlapping_rejections_keep_the_first():
+    tool = _tool("abcdef", {"abcdef": [(0, 2, "rules", "A"), (1, 3, "opencc", "B"), (4, 5, "rules", "C")]})
+    index = build_correction_index(tool)
+    _reject_hits(tool, index, [0, 1, 2])
+    assert tool.text_area.get("1.0", "end-1c") == "AcdCf"
+    assert index.hits == []
+    assert tool.correction_state['paragraphs'][paragraph_hash("AcdCf")] == []
@@ -0,0 +1,51 @@
+"""
+平行校正模組的測試：工作行程異常結束時改用單執行緒處理
+"""
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import text_07_parallel
+from text_11_pipeline import CorrectionPipeline
+
+class BrokenPool:
+    """第 broken_at 個工作開始回報行程池損壞的假行程池"""
+    def __init__(self, broken_at):
+        self.broken_at = broken_at
+        self.submitted = 0
+        self.shut_down = False
+
+    def submit(self, func, text):
+        future = Future()
+        if self.submitted >= self.broken_at:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(func(text))
+        self.submitted += 1
+        return future
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+def _tool():
+    return SimpleNamespace(converter=None, protected_words=[], settings={})
+
+def test_broken_pool_falls_back_to_single_thread(monkeypatch):
+    pipeline = CorrectionPipeline(["rules"])
+    tool = _tool()
+    pool = BrokenPool(broken_at=1)
+    monkeypatch.setattr(text_07_parallel, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(text_07_parallel, "worker_count", lambda: 2)
+    monkeypatch.setattr(text_07_parallel, "get_correction_pool", lambda self, pipeline: pool)
+    # 假行程池在目前行程中執行工作，需要工作行程的全域狀態
+    monkeypatch.setattr(text_07_parallel, "_worker_tool", tool, raising=False)
+    monkeypatch.setattr(text_07_parallel, "_worker_pipeline", pipeline, raising=False)
+    tool.correction_pool = pool
+
+    texts = ["第一段，，文字", "", "第二段。。文字", "第三段  文字"]
+    results = list(text_07_parallel.iter_convert_and_diff(tool, texts, pipeline))
+
+    expected = [pipeline.run(tool, text)["text"] if text else "" for text in texts]
+    assert [result["text"] for result in results] == expected
+    assert pool.shut_down
+    assert tool.correction_pool is None
@@ -0,0 +1,66 @@
+"""
+可設定校正流程與修正位置換算的測試
+"""
+import json
+from types import SimpleNamespace
+
+import text_12_typo_dictionary
+import text_20_repeats
+from config_01_settings import load_settings
+from text_04_alignment import align_texts, remap_ranges
+from text_11_pipeline import (DEFAULT_BUTTON_STAGES, DEFAULT_WORD_IMPORT_STAGES, CorrectionPipeline,
+                              get_pipeline)
+
+def test_remap_ranges_shifts_and_extends_ranges():
+    alignment = align_texts("ab的的cd", "ab的cd")
+    # 改寫區域之後的區段往前移，落在改寫區域內的端點延伸到整個區域
+    assert remap_ranges([(4, 6, "x")], alignment) == [(3, 5, "x")]
+    assert remap_ranges([(0, 2)], alignment) == [(0, 2)]
+    start, end = remap_ranges([(2, 4)], alignment)[0]
+    assert (start, end) == (2, 3)
+
+def test_remap_ranges_without_alignment_copies_ranges():
+    ranges = [(1, 2, "a")]
+    assert remap_ranges(ranges, []) == ranges
+
+def test_pipeline_falls_back_to_default_stages():
+    tool = SimpleNamespace(settings={})
+    assert get_pipeline(tool).stage_ids == DEFAULT_BUTTON_STAGES
+    assert get_pipeline(tool, "word_import").stage_ids == DEFAULT_WORD_IMPORT_STAGES
+    tool.settings = {"correction_stages": ["rules"], "word_import_stages": ["normalize", "unknown"]}
+    assert get_pipeline(tool).stage_ids == ["rules"]
+    assert get_pipeline(tool, "word_import").stage_ids == ["normalize"]
+
+def test_default_settings_do_not_freeze_stage_lists(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = load_settings()
+    assert "correction_stages" not in settings
+    assert "word_import_stages" not in settings
+    (tmp_path / "settings.json").write_text(json.dumps({"correction_stages": ["rules"]}), encoding="utf-8")
+    assert load_settings()["correction_stages"] == ["rules"]
+
+def test_later_stages_remap_earlier_changes():
+    tool = SimpleNamespace(converter=None)
+    result = CorrectionPipeline(["normalize", "rules"]).run(tool, "甲\u200b，，乙\r\n  丙")
+    assert result["text"] == "甲，乙\n丙"
+    stages = {change[2]: change for change in result["changes"]}
+    assert stages["rules"][:2] == (1, 2)
+    assert [item["stage"] for item in result["timings"]] == ["normalize", "rules"]
+
+def test_stage_data_is_loaded_once_per_pipeline(monkeypatch):
+    loads = []
+    dictionary = text_12_typo_dictionary.TypoDictionary([("因該", "應該")])
+    detector = text_20_repeats.RepeatDetector([])
+    monkeypatch.setattr(text_12_typo_dictionary, "get_typo_dictionary", lambda: loads.append("typo") or dictionary)
+    monkeypatch.setattr(text_20_repeats, "get_repeat_detector", lambda: loads.append("repeats") or detector)
+    pipeline = CorrectionPipeline(["typo", "repeats"])
+    tool = SimpleNamespace(converter=None, protected_words=[])
+    # 逐段落預先檢查與執行流程都不再重新取得字典與偵測器
+    assert pipeline.may_change(tool, "因該")
+    assert pipeline.may_change(tool, "的的")
+    assert not pipeline.may_change(tool, "沒有錯誤")
+    result = pipeline.run(tool, "因該的的")
+    assert result["text"] == "應該的的"
+    assert [change[2] for change in result["changes"]] == ["typo", "repeats"]
+    assert sorted(loads) == ["repeats", "typo"]
+    assert dictionary.digest in pipeline.key and detector.digest in pipeline.key
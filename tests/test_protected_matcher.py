@@ -0,0 +1,42 @@
+"""
+保護詞彙比對與遮罩轉換的測試
+"""
+import opencc
+import pytest
+
+from text_03_protected_matcher import ProtectedWordMatcher, convert_protected, convert_segments
+
+@pytest.fixture(scope="module")
+def converter():
+    return opencc.OpenCC('s2t')
+
+def test_find_spans_prefers_longest_match_at_each_start():
+    matcher = ProtectedWordMatcher(["台积", "台积电", "电路"])
+    assert matcher.find_spans("台积电路") == [(0, 3)]
+
+def test_find_spans_skips_overlaps_left_to_right():
+    matcher = ProtectedWordMatcher(["ab", "bc", "cd"])
+    assert matcher.find_spans("abcd") == [(0, 2), (2, 4)]
+
+def test_iter_matches_reports_suffix_words():
+    matcher = ProtectedWordMatcher(["he", "she", "hers"])
+    assert sorted(matcher.iter_matches("ushers")) == [(1, 4), (2, 4), (2, 6)]
+
+def test_empty_matcher():
+    matcher = ProtectedWordMatcher(["", ""])
+    assert not matcher
+    assert matcher.find_spans("任何文字") == []
+
+def test_convert_segments_matches_separate_conversion(converter):
+    segments = ["这是", "", "第一行\n第二行", "后面"]
+    assert convert_segments(converter, segments) == [converter.convert(segment) for segment in segments]
+
+def test_convert_protected_keeps_protected_words(converter):
+    matcher = ProtectedWordMatcher(["台积电"])
+    converted, spans = convert_protected(converter, "这是台积电的发展", matcher)
+    assert converted == "這是台积电的發展"
+    assert spans == [(2, 5)]
+
+def test_convert_protected_without_words_is_plain_conversion(converter):
+    text = "后面的发展"
+    assert convert_protected(converter, text, ProtectedWordMatcher([])) == (converter.convert(text), [])
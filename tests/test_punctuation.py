@@ -0,0 +1,41 @@
+"""
+全形/半形標點正規化的測試
+"""
+from text_21_punctuation import may_need_punctuation, normalize_punctuation
+
+def test_runs_of_marks_are_converted_together():
+    assert normalize_punctuation("你好!!") == ("你好！！", [(2, 4, "!!")])
+    assert normalize_punctuation("真的嗎??") == ("真的嗎？？", [(3, 5, "??")])
+    assert normalize_punctuation("好?!走") == ("好？！走", [(1, 3, "?!")])
+
+def test_space_after_full_width_mark_is_removed():
+    assert normalize_punctuation("元, Hello") == ("元，Hello", [(1, 2, ", ")])
+    assert normalize_punctuation("結束.  下一句") == ("結束。下一句", [(2, 3, ".  ")])
+    # 維持半形的標點保留後面的空白
+    assert normalize_punctuation("Hello, world") == ("Hello, world", [])
+
+def test_english_and_numbers_keep_half_width():
+    assert normalize_punctuation("圓周率3.14") == ("圓周率3.14", [])
+    assert normalize_punctuation("檔名.txt") == ("檔名.txt", [])
+    assert normalize_punctuation("等等...") == ("等等...", [])
+    assert normalize_punctuation("12：30") == ("12:30", [(2, 3, "：")])
+
+def test_parens_and_full_width_alnum():
+    assert normalize_punctuation("中文(test)內容") == ("中文（test）內容", [(2, 3, "("), (7, 8, ")")])
+    assert normalize_punctuation("第１２章,開始") == ("第12章，開始", [(1, 3, "１２"), (4, 5, ",")])
+    assert normalize_punctuation("ａ(b") == ("a(b", [(0, 1, "ａ")])
+
+def test_later_positions_follow_removed_spaces():
+    text, changes = normalize_punctuation("甲, 乙, 丙１")
+    assert text == "甲，乙，丙1"
+    assert [text[start:end] for start, end, _ in changes] == ["，", "，", "1"]
+    assert may_need_punctuation("你好!") and not may_need_punctuation("你好。")
+
+def test_marks_after_converted_parens_use_the_full_width_paren():
+    assert normalize_punctuation("他笑了(真的).\n")[0] == "他笑了（真的）。\n"
+    assert normalize_punctuation("步驟如下(詳見附表):\n")[0] == "步驟如下（詳見附表）：\n"
+    assert normalize_punctuation("請回答(是/否)?")[0] == "請回答（是/否）？"
+    assert normalize_punctuation("call f(x). Then")[0] == "call f(x). Then"
+    for text in ("他笑了(真的).\n", "步驟如下(詳見附表):\n", "請回答(是/否)?"):
+        corrected = normalize_punctuation(text)[0]
+        assert normalize_punctuation(corrected) == (corrected, [])
@@ -0,0 +1,51 @@
+"""
+重複字詞偵測的測試
+"""
+from text_20_repeats import RepeatDetector, load_repeat_detector, parse_allowlist
+
+class FakeConverter:
+    """只轉換「谢」的簡繁轉換器"""
+    def convert(self, text):
+        return text.replace("谢", "謝")
+
+def _detector():
+    return load_repeat_detector("missing_allowlist.txt")
+
+def test_repeats_are_suggested_with_a_single_unit():
+    detector = _detector()
+    assert detector.find("我的的書") == [(1, 3, "的")]
+    assert detector.find("的的的") == [(0, 3, "的")]
+    assert detector.find("我們我們走") == [(0, 4, "我們")]
+    assert detector.find("abab 的") == []
+
+def test_allowed_repeats_are_skipped():
+    detector = _detector()
+    assert detector.find("謝謝你，常常來") == []
+    # 最短的單位優先，「哈哈哈哈」以「哈」判斷
+    assert detector.find("哈哈哈哈") == []
+
+def test_aabb_words_are_checked_as_a_whole():
+    detector = _detector()
+    assert detector.find("高高興興") == []
+    assert detector.find("的的確確") == []
+    # 只有一組在允許清單中時分開判斷
+    assert detector.find("謝謝的的") == [(2, 4, "的")]
+
+def test_protected_spans_are_not_checked():
+    detector = _detector()
+    assert detector.find("的的，的的", [(0, 2)]) == [(3, 5, "的")]
+    assert detector.find("的的，的的", [(1, 4)]) == []
+
+def test_converter_maps_simplified_repeats_to_the_allowlist():
+    detector = _detector()
+    assert detector.find("谢谢") == [(0, 2, "谢")]
+    assert detector.find("谢谢", converter=FakeConverter()) == []
+
+def test_parse_allowlist_and_user_words(tmp_path):
+    assert parse_allowlist("# 註解\n 來來 去去\n\n走走\n") == ["來來", "去去", "走走"]
+    path = tmp_path / "allow.txt"
+    path.write_text("的的\n", encoding="utf-8")
+    detector = load_repeat_detector(str(path))
+    assert detector.find("我的的書") == []
+    assert detector.digest != _detector().digest
+    assert RepeatDetector([]).may_match("的的") and not RepeatDetector([]).may_match("的")
@@ -0,0 +1,75 @@
+"""
+常見文字錯誤修正規則引擎的測試
+"""
+import random
+
+from text_10_rules import DEFAULT_RULES, RuleEngine, benchmark_rules, sample_rule_text
+
+def _baseline(text):
+    """規則引擎之前的做法：依序以 str.replace 套用每條規則，再逐行去除行首行尾空白"""
+    corrections = {'，,': '，', ',.': '。', '。.': '。', '..': '。', '。。': '。', ',,': '，', '，，': '，',
+                   '  ': ' ', '的的': '的', '了了': '了', '是是': '是', '和和': '和'}
+    corrected_text = text
+    for error, correction in corrections.items():
+        corrected_text = corrected_text.replace(error, correction)
+    corrected_text = corrected_text.replace('/\n', '\n')
+    corrected_text = corrected_text.replace('/ \n', '\n')
+    if corrected_text.endswith('/'):
+        corrected_text = corrected_text[:-1]
+    return '\n'.join(line.strip() for line in corrected_text.split('\n'))
+
+def _is_fixpoint(engine, text):
+    """文字中已沒有任何規則或行首行尾空白可以套用"""
+    return (all(error not in text + '\n' for error in engine.rules)
+            and all(line == line.strip() for line in text.split('\n')))
+
+def test_rules_apply_until_nothing_matches():
+    engine = RuleEngine(DEFAULT_RULES)
+    assert engine.apply('。。。。。。。。。') == ('。', [(0, 1)])
+    assert engine.apply('好，，，，,的') == ('好，的', [(1, 2)])
+    assert engine.apply('a     b') == ('a b', [(1, 2)])
+    assert engine.apply('......') == ('。', [(0, 1)])
+
+def test_line_edges_are_trimmed_and_trailing_slash_removed():
+    engine = RuleEngine(DEFAULT_RULES)
+    text, positions = engine.apply('  你好，，世界。。。  \n  第二行/ \n結尾/')
+    assert text == '你好，世界。\n第二行\n結尾'
+    assert positions == [(2, 3), (5, 6), (10, 11)]
+    assert engine.apply('  a\t') == ('a', [])
+    assert engine.apply('a /  \nb') == ('a\nb', [(1, 2)])
+
+def test_longest_rule_wins_and_user_rules_compose():
+    engine = RuleEngine([('ab', 'x'), ('abc', 'y'), ('a', 'z'), ('dd', 'd')])
+    assert engine.apply('abcd') == ('yd', [(0, 1)])
+    assert engine.apply('abx') == ('xx', [(0, 1)])
+    assert engine.apply('ax') == ('zx', [(0, 1)])
+    assert engine.apply('dddd') == ('d', [(0, 1)])
+    # 修正文字與相鄰文字組成新的錯誤時繼續修正
+    assert RuleEngine([('xy', 'b'), ('ab', 'c')]).apply('axy') == ('c', [(0, 1)])
+
+def test_empty_engine_only_trims_lines():
+    assert RuleEngine([]).apply(' a \n b ') == ('a\nb', [])
+    assert RuleEngine([]).apply('') == ('', [])
+
+def test_random_texts_reach_a_fixpoint():
+    generator = random.Random(3)
+    for rules in (DEFAULT_RULES, [('ab', 'b'), ('bb', 'b'), ('ba', 'a b'), ('  ', ' '), ('a\n', '\n')]):
+        engine = RuleEngine(rules)
+        for _ in range(2000):
+            text = ''.join(generator.choice('，,.。 /\nab\t') for _ in range(generator.randint(0, 20)))
+            corrected, positions = engine.apply(text)
+            assert _is_fixpoint(engine, corrected), (text, corrected)
+            assert engine.apply(corrected) == (corrected, [])
+            for start, end in positions:
+                assert 0 <= start < end <= len(corrected)
+
+def test_default_rules_match_the_baseline_on_ordinary_text():
+    engine = RuleEngine(DEFAULT_RULES)
+    text = "第一段，，內容。。\n  第二段 內容  \n第三段/\n結尾,."
+    assert engine.apply(text)[0] == _baseline(text)
+
+def test_benchmark_compares_with_replace_chain():
+    # 只檢查報告內容；計時比較以 python text_10_rules.py 執行，不放在測試中
+    result = benchmark_rules(sample_rule_text(20000), repeat=1)
+    assert result["characters"] >= 20000
+    assert result["replace_seconds"] > 0 and result["engine_seconds"] > 0
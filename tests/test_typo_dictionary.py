@@ -0,0 +1,43 @@
+"""
+自訂錯字字典 (最長匹配字典樹) 的測試
+"""
+from text_12_typo_dictionary import TypoDictionary, compile_typo_dictionary, parse_typo_entries
+
+def test_longest_typo_wins():
+    dictionary = TypoDictionary([("因該", "應該"), ("因該是", "應該是"), ("在再", "再")])
+    text, changes = dictionary.apply("他因該是對的，因該在再說")
+    assert text == "他應該是對的，應該再說"
+    assert changes == [(1, 4, "因該是"), (7, 9, "因該"), (9, 10, "在再")]
+
+def test_longer_unfinished_path_falls_back_to_shorter_typo():
+    dictionary = TypoDictionary([("abcd", "Z"), ("ab", "X")])
+    assert dictionary.apply("abce") == ("Xce", [(0, 1, "ab")])
+    assert dictionary.apply("xyz") == ("xyz", [])
+
+def test_typos_do_not_reach_into_protected_spans():
+    dictionary = TypoDictionary([("ab", "X"), ("abc", "Y")])
+    assert dictionary.apply("abc", [(1, 3)]) == ("abc", [])
+    assert dictionary.apply("abc", [(2, 3)]) == ("Xc", [(0, 1, "ab")])
+    assert dictionary.apply("abc abc", [(0, 3)]) == ("abc Y", [(4, 5, "abc")])
+
+def test_later_entries_override_and_identity_entries_are_ignored():
+    dictionary = TypoDictionary([("ab", "X"), ("ab", "W"), ("cd", "cd")])
+    assert dictionary.count == 1
+    assert dictionary.apply("abcd")[0] == "Wcd"
+    assert not TypoDictionary([])
+    assert dictionary.may_match("xa") and not dictionary.may_match("xyz")
+
+def test_parse_typo_entries():
+    content = "# 註解\n因該\t應該\n\n在再 再\n只有一欄\n 做為\t作為 \n"
+    assert parse_typo_entries(content) == [("因該", "應該"), ("在再", "再"), ("做為", "作為")]
+
+def test_compiled_dictionary_is_cached(tmp_path):
+    path = tmp_path / "typos.txt"
+    cache_path = tmp_path / "cache" / "typos.pickle"
+    path.write_text("因該\t應該\n", encoding="utf-8")
+    first = compile_typo_dictionary(str(path), str(cache_path))
+    assert cache_path.exists()
+    cached = compile_typo_dictionary(str(path), str(cache_path))
+    assert cached.digest == first.digest
+    assert cached.apply("因該") == ("應該", [(0, 2, "因該")])
+    assert not compile_typo_dictionary(str(tmp_path / "missing.txt"), str(cache_path))
@@ -0,0 +1,57 @@
+"""
+Word 匯入校正的測試：插入文字後修正位置記錄到增量校正紀錄並加上標籤
+"""
+from types import SimpleNamespace
+
+import config_02_protected_words
+import text_14_live
+from text_01_correction import correct_text_for_word_import, tag_word_import_corrections
+from text_06_incremental import paragraph_hash
+
+class FakeText:
+    """記錄標籤的假文字區域"""
+    def __init__(self):
+        self.text = ""
+        self.tags = []
+
+    def get(self, start, end):
+        if (start, end) == ("1.0", "end-1c"):
+            return self.text
+        first, last = int(start.split('.')[0]), int(end.split('.')[0])
+        return '\n'.join(self.text.split('\n')[first - 1:last])
+
+    def insert(self, index, text):
+        self.text = text + self.text
+
+    def tag_add(self, tag, *indices):
+        self.tags.append((tag,) + indices)
+
+    def tag_remove(self, tag, start, end):
+        pass
+
+def _tool():
+    return SimpleNamespace(text_area=FakeText(), status_bar=SimpleNamespace(config=lambda **options: None),
+                           converter=None, protected_words=[], highlight_window=None,
+                           settings={"word_import_stages": ["punctuation", "rules"]})
+
+def test_imported_text_corrections_are_tagged(monkeypatch):
+    monkeypatch.setattr(config_02_protected_words, "ensure_converter", lambda self: False)
+    monkeypatch.setattr(text_14_live, "visible_line_range", lambda self, margin=0: (1, 2))
+    tool = _tool()
+    corrected = correct_text_for_word_import(tool, "第一行,，內容\n你好!!")
+    assert corrected == "第一行，內容\n你好！！"
+    tool.text_area.insert("1.0", corrected)
+    tag_word_import_corrections(tool)
+
+    paragraphs = tool.correction_state['paragraphs']
+    assert [item[:2] for item in paragraphs[paragraph_hash("你好！！")]] == [(2, 4)]
+    assert ("corrected", "1.3", "1.4", "2.2", "2.4") in tool.text_area.tags
+    assert tool.word_import_result is None
+
+def test_nothing_is_tagged_when_text_was_not_inserted(monkeypatch):
+    monkeypatch.setattr(config_02_protected_words, "ensure_converter", lambda self: False)
+    tool = _tool()
+    correct_text_for_word_import(tool, "你好!!")
+    tag_word_import_corrections(tool)
+    assert tool.text_area.tags == []
+    assert not hasattr(tool, "correction_state")
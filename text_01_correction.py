@@ -2,13 +2,23 @@
 文字校正相關功能模組
 """
 import tkinter as tk
-import threading
 import traceback
 from tkinter import messagebox
 
+# 文字區域中標記修正位置的標籤 (OpenCC 等一般修正、錯字字典修正、重複字詞建議)
+CORRECTION_TAGS = ("corrected", "typo_corrected", "repeat_suggestion")
+
+# 差異區段超過此數量時，改為一次取代整個範圍
+MAX_MINIMAL_EDITS = 20000
+
 def correct_text(self):
-    """校正文字內容"""
-    text = self.text_area.get("1.0", tk.END)
+    """校正文字內容
+
+    校正工作交給常駐的校正執行緒執行；校正進行中再次按下時，取代尚未完成的校正，
+    以目前的文字重新校正。
+    """
+    # 不包含 Text 元件結尾自動附加的換行
+    text = self.text_area.get("1.0", "end-1c")
     if not text.strip():
         messagebox.showinfo("提示", "沒有文字需要校正")
         return
@@ -16,38 +26,119 @@ def correct_text(self):
     # 更新狀態欄
     self.status_bar.config(text="正在校正文字...")
     
-    # 禁用校正按鈕，防止重複點擊
-    self.correct_button.config(state=tk.DISABLED)
+    # 啟用停止按鈕
+    self.cancel_correct_button.config(state=tk.NORMAL)
     
     # 在背景執行校正，避免凍結UI
-    threading.Thread(target=lambda: correct_text_thread(self, text), daemon=True).start()
+    from text_17_correction_queue import submit_correction_job, FULL_CORRECTION
+    job = submit_correction_job(self, FULL_CORRECTION, lambda job: correct_text_thread(self, text, job))
+    self.correction_job = job
+    self.correction_cancel_event = job.cancel_event
+
+def cancel_correction(self):
+    """停止正在進行的文字校正，已完成的部分會保留"""
+    cancel_event = getattr(self, 'correction_cancel_event', None)
+    if cancel_event and not cancel_event.is_set():
+        cancel_event.set()
+        self.cancel_correct_button.config(state=tk.DISABLED)
+        self.status_bar.config(text="正在停止文字校正...")
+
+def _finish_correction(self, message, job=None, timings=None, records=None):
+    """校正結束後還原按鈕狀態並更新狀態欄 (在主線程中呼叫)
+
+    參數:
+        message: 狀態欄訊息
+        job: 結束的校正工作，已被較新的校正取代時不更新畫面
+        timings: 各階段耗時統計，None 表示不更新
+        records: 修正紀錄，None 表示不更新
+    """
+    if job is not None:
+        if getattr(self, 'correction_job', None) is not job:
+            return
+        if job.stale:
+            message = "文字已被修改，已停止校正 (已套用的部分保留)"
+            records = None
+    if timings is not None:
+        self.last_correction_timings = timings
+    if records is not None:
+        self.last_correction_records = records
+    self.status_bar.config(text=message)
+    self.correct_button.config(state=tk.NORMAL)
+    self.cancel_correct_button.config(state=tk.DISABLED)
+    self.correction_cancel_event = None
+    self.correction_job = None
+
+def correct_text_thread(self, text, job):
+    """在校正執行緒中執行文字校正
 
-def correct_text_thread(self, text):
-    """在背景執行文字校正的執行緒
+    校正結果以區塊為單位由上而下逐步送回主線程套用，狀態欄顯示進度百分比。
+    文字區域在校正開始後被修改時，尚未套用的區塊會被丟棄並停止校正。
 
     參數:
         text: 要校正的文字
+        job: 校正工作 (CorrectionJob)，用於取消與判斷結果是否過期
     """
+    from text_17_correction_queue import apply_job_result
+    cancel_event = job.cancel_event
     try:
-        # 檢查是否有轉換器
+        # 檢查是否有轉換器，背景載入尚未完成時等待
         if not self.converter:
-            # 在主線程中顯示錯誤訊息
-            self.root.after(0, lambda: messagebox.showerror("錯誤", "OpenCC轉換器未初始化"))
-            self.root.after(0, lambda: self.status_bar.config(text="校正失敗: OpenCC轉換器未初始化"))
-            self.root.after(0, lambda: self.correct_button.config(state=tk.NORMAL))
-            return
+            self.root.after(0, lambda: self.status_bar.config(text="正在載入 OpenCC 字典..."))
+            try:
+                from text_09_converter import resolve_converter
+                resolve_converter(self)
+            except Exception as e:
+                error_msg = f"OpenCC轉換器未初始化: {str(e)}"
+                # 在主線程中顯示錯誤訊息
+                self.root.after(0, lambda: messagebox.showerror("錯誤", error_msg))
+                self.root.after(0, lambda: _finish_correction(self, "校正失敗: OpenCC轉換器未初始化", job))
+                return
 
-        # 使用OpenCC進行簡繁轉換
-        corrected_text = self.converter.convert(text)
-        
-        # 找出差異
-        corrections = []
-        find_differences(self, text, corrected_text, corrections)
-        
-        # 在主線程中更新UI
-        self.root.after(0, lambda: _update_text_area(self, corrected_text, corrections))
-        self.root.after(0, lambda: self.status_bar.config(text=f"文字校正完成，找到 {len(corrections)} 處差異"))
-        self.root.after(0, lambda: self.correct_button.config(state=tk.NORMAL))
+        # 使用OpenCC進行簡繁轉換並找出差異 (只重新處理上次校正後有變動的段落，
+        # 保護詞彙以遮罩方式保留原樣)
+        from text_06_incremental import iter_correction_blocks
+        from text_11_pipeline import merge_timings
+        from text_13_report import iter_report_records
+        timings = []
+        records = []
+        block_offset = 0
+        correction_count = 0
+        dirty_count = 0
+        cached_count = 0
+        paragraph_count = 0
+        cancelled = False
+        blocks = iter_correction_blocks(self, text)
+        try:
+            for block in blocks:
+                correction_count += len(block['corrections'])
+                dirty_count += block['dirty_count']
+                cached_count += block['cached_count']
+                paragraph_count += block['paragraph_count']
+                merge_timings(timings, block['timings'])
+                records.extend(iter_report_records(block['text'], block['corrections'],
+                                                   block['first_paragraph'] + 1, block_offset))
+                block_offset += len(block['text']) + 1
+                percent = block['processed'] * 100 // max(len(text), 1)
+
+                # 在主線程中更新這個區塊 (文字已被修改時不套用)
+                self.root.after(0, lambda b=block: apply_job_result(self, job, lambda: _update_text_area(
+                    self, b['text'], b['corrections'], b['first_paragraph'] + 1, b['paragraph_count'])))
+                self.root.after(0, lambda p=percent: job.cancelled() or
+                                self.status_bar.config(text=f"正在校正文字... {p}%"))
+
+                # 使用者按下停止、再次校正或文字已被修改時，不再處理後面的區塊
+                if cancel_event.is_set() and block['processed'] < len(text):
+                    cancelled = True
+                    break
+        finally:
+            blocks.close()
+
+        if cancelled:
+            message = f"文字校正已停止，已完成 {paragraph_count} 段，找到 {correction_count} 處差異"
+        else:
+            message = (f"文字校正完成，找到 {correction_count} 處差異 "
+                       f"(重新校正 {dirty_count}/{paragraph_count} 段，快取 {cached_count} 段)")
+        self.root.after(0, lambda: _finish_correction(self, message, job, timings, records))
         
     except Exception as e:
         error_msg = f"校正文字時發生錯誤: {str(e)}"
@@ -56,8 +147,7 @@ def correct_text_thread(self, text):
         
         # 在主線程中顯示錯誤訊息
         self.root.after(0, lambda: messagebox.showerror("錯誤", error_msg))
-        self.root.after(0, lambda: self.status_bar.config(text="校正失敗"))
-        self.root.after(0, lambda: self.correct_button.config(state=tk.NORMAL))
+        self.root.after(0, lambda: _finish_correction(self, "校正失敗", job))
         
         # 記錄錯誤
         from utils_01_error_handler import log_error
@@ -75,101 +165,114 @@ def find_differences(self, original_text, corrected_text, corrections, offset=0)
     if original_text == corrected_text:
         return
 
-    # 檢查是否有保護詞彙
-    for word in self.protected_words:
-        if word in original_text:
-            # 分割文本在保護詞彙處
-            parts = original_text.split(word)
-            corrected_parts = []
-            
-            # 校正每個部分，但保留保護詞彙
-            current_offset = offset
-            for i, part in enumerate(parts):
-                if i > 0:
-                    # 保護詞彙的偏移量
-                    current_offset += len(parts[i-1])
-                    # 添加保護詞彙（不校正）
-                    corrected_parts.append(word)
-                    current_offset += len(word)
-                
-                # 校正當前部分
-                if part:
-                    corrected_part = self.converter.convert(part)
-                    corrected_parts.append(corrected_part)
-                    # 遞歸查找差異
-                    find_differences(self, part, corrected_part, corrections, current_offset)
-                    current_offset += len(part)
-            
-            return
-    
-    # 如果沒有保護詞彙，則直接比較字符
-    for i, (orig_char, corr_char) in enumerate(zip(original_text, corrected_text)):
-        if orig_char != corr_char:
-            # 添加差異位置
-            start = offset + i
-            corrections.append((start, start + 1))
-
-def _update_text_area(self, corrected_text, corrections=None):
+    # 以保護詞彙比對器一次掃描找出保護區段，保護區段內的差異不標記
+    from text_03_protected_matcher import get_protected_matcher
+    spans = get_protected_matcher(self).find_spans(original_text)
+
+    # 對齊原文與校正後文本，轉換造成長度改變時位置仍然正確 (以校正後文本的位置表示)
+    from text_04_alignment import correction_ranges
+    for start, end in correction_ranges(original_text, corrected_text, spans):
+        corrections.append((offset + start, offset + end))
+
+def _update_text_area(self, corrected_text, corrections=None, first_line=1, line_count=None):
     """更新文字區域的內容
 
     參數:
         corrected_text: 校正後的文字
-        corrections: 修正的位置列表，每個元素是 (start, end) 元組
+        corrections: 修正的位置列表，每個元素是 (start, end, 階段代號) 元組 (相對於 corrected_text)
+        first_line: corrected_text 在文字區域中的起始行號
+        line_count: corrected_text 取代的行數，None 表示取代整個文字區域
     """
-    # 清除現有標記
-    self.text_area.tag_remove("corrected", "1.0", tk.END)
+    if line_count is None:
+        start_index = "1.0"
+        end_index = "end-1c"
+    else:
+        start_index = f"{first_line}.0"
+        end_index = f"{first_line + line_count - 1}.end"
+
+    # 清除範圍內現有標記
+    for tag in CORRECTION_TAGS:
+        self.text_area.tag_remove(tag, start_index, end_index)
     
-    # 更新文字
-    current_text = self.text_area.get("1.0", tk.END)
-    if current_text.strip() != corrected_text.strip():
-        self.text_area.delete("1.0", tk.END)
-        self.text_area.insert("1.0", corrected_text)
+    # 更新文字 (只取代有差異的區段)
+    current_text = self.text_area.get(start_index, end_index)
+    if current_text != corrected_text:
+        apply_minimal_edits(self, current_text, corrected_text, 1 if line_count is None else first_line)
     
-    # 標記修正的部分
+    # 只標記可見範圍附近的修正，其他段落的修正位置保存在增量校正紀錄中，
+    # 捲動到附近時才加上標籤
+    from text_15_highlights import refresh_highlights, add_correction_tags
+    window = refresh_highlights(self)
     if corrections:
-        for start, end in corrections:
-            # 將字符偏移量轉換為tkinter的行列格式
-            start_line = 1
-            start_col = 0
-            for i in range(start):
-                if i < len(corrected_text) and corrected_text[i] == '\n':
-                    start_line += 1
-                    start_col = 0
-                else:
-                    start_col += 1
-            
-            end_line = start_line
-            end_col = start_col + (end - start)
-            
-            # 添加標記
-            start_index = f"{start_line}.{start_col}"
-            end_index = f"{end_line}.{end_col}"
-            self.text_area.tag_add("corrected", start_index, end_index)
+        add_correction_tags(self, corrected_text, corrections, first_line, window)
+
+def apply_minimal_edits(self, current_text, corrected_text, first_line=1, edits=None):
+    """只取代文字區域中實際改變的區段，整組修改為一個復原步驟
+
+    未改變的文字維持原樣，其上的標籤、書籤與捲動位置都會保留，Tk 也只需要重新
+    排版被修改的行。
+
+    參數:
+        current_text: 文字區域中從 first_line 開始的目前內容
+        corrected_text: 取代後的內容
+        first_line: 內容在文字區域中的起始行號
+        edits: 已知的 (orig_start, orig_end, corr_start, corr_end) 差異區段 (依位置排序)，
+               None 表示以 align_texts 比對兩段文字
+    """
+    from text_04_alignment import align_texts
+    from text_05_offset_index import LineIndex
+    if edits is None:
+        edits = align_texts(current_text, corrected_text)
+    if len(edits) > MAX_MINIMAL_EDITS:
+        edits = [(0, len(current_text), 0, len(corrected_text))]
+    line_index = LineIndex(current_text, first_line)
+
+    autoseparators = self.text_area.cget("autoseparators")
+    self.text_area.config(autoseparators=False)
+    self.text_area.edit_separator()
+    try:
+        # 由後往前取代，前面區段的索引不受影響
+        for orig_start, orig_end, corr_start, corr_end in reversed(edits):
+            self.text_area.replace(line_index.to_index(orig_start), line_index.to_index(orig_end),
+                                   corrected_text[corr_start:corr_end])
+    finally:
+        self.text_area.edit_separator()
+        self.text_area.config(autoseparators=autoseparators)
 
 def correct_text_for_word_import(self, text):
     """專門用於 Word 檔案導入時的文字校正處理
     
+    校正結果會暫存起來，呼叫端將文字插入文字區域後以 tag_word_import_corrections
+    標示修正。
+
     參數:
         text: 從 Word 檔案導入的原始文字
         
     回傳:
         校正後的文字
     """
+    self.word_import_result = None
     try:
         # 更新狀態欄
         self.status_bar.config(text="正在進行文字校正...")
         
-        # 進行基本文字修正
-        corrected_text = correct_common_errors(text)
+        # 確認轉換器可用 (無法初始化時流程會略過 OpenCC 階段)
+        from config_02_protected_words import ensure_converter
+        ensure_converter(self)
         
-        # 檢查簡體字並根據 protected_words.json 進行轉換
-        from config_02_protected_words import check_simplified_chinese
-        final_text = check_simplified_chinese(self, corrected_text)
+        # 依序執行匯入用的校正流程 (預設為正規化、規則修正、OpenCC 轉換並保留保護詞彙)
+        from text_11_pipeline import get_pipeline
+        pipeline = get_pipeline(self, "word_import")
+        result = pipeline.run(self, text)
+        self.word_import_result = (result["text"], result["changes"], pipeline)
+        self.last_correction_timings = result["timings"]
+        from text_13_report import iter_report_records
+        self.last_correction_records = list(iter_report_records(result["text"], result["changes"]))
         
         # 更新狀態欄
-        self.status_bar.config(text="文字校正完成")
+        self.status_bar.config(text=f"文字校正完成，修正 {len(result['changes'])} 處")
         
-        return final_text
+        return result["text"]
         
     except Exception as e:
         error_msg = f"Word 文件文字校正時發生錯誤: {str(e)}"
@@ -181,6 +284,27 @@ def correct_text_for_word_import(self, text):
         # 如果校正失敗，返回原始文字
         return text
 
+def tag_word_import_corrections(self):
+    """標示 Word 匯入時的修正 (校正後的文字插入文字區域後呼叫)
+
+    修正位置記錄到增量校正紀錄，可見範圍附近的修正立即加上標籤，其他段落
+    捲動到附近時才加上，修正導覽也能逐一檢視。
+    """
+    pending = getattr(self, 'word_import_result', None)
+    self.word_import_result = None
+    if not pending:
+        return
+    corrected_text, changes, pipeline = pending
+    # 文字區域的內容不是這次校正的結果時 (例如插入失敗) 不標示
+    if self.text_area.get("1.0", "end-1c") != corrected_text:
+        return
+    from text_06_incremental import remember_paragraphs
+    remember_paragraphs(self, corrected_text, changes, pipeline)
+    from text_15_highlights import refresh_highlights, add_correction_tags
+    window = refresh_highlights(self)
+    if changes:
+        add_correction_tags(self, corrected_text, changes, 1, window)
+
 def correct_common_errors(text):
     """進行常見文字錯誤的修正
     
@@ -190,53 +314,23 @@ def correct_common_errors(text):
     回傳:
         修正後的文字
     """
-    if not text:
-        return text
-        
-    # 建立修正規則
-    corrections = {
-        # 標點符號修正
-        '，,': '，',
-        ',.': '。',
-        '。.': '。',
-        ',.': '。',
-        '..': '。',
-        '。。': '。',
-        ',,': '，',
-        '，，': '，',
-        
-        # 空格修正
-        '  ': ' ',  # 雙空格改為單空格
-        
-        # 常見錯字修正
-        '的的': '的',
-        '了了': '了',
-        '是是': '是',
-        '和和': '和',
-    }
-    
-    # 應用修正規則
-    corrected_text = text
-    for error, correction in corrections.items():
-        corrected_text = corrected_text.replace(error, correction)
-    
-    # 移除行尾的"/"符號（可能是Word文件轉換時產生的）
-    corrected_text = corrected_text.replace('/\n', '\n')
-    corrected_text = corrected_text.replace('/ \n', '\n')
-    
-    # 如果文字最後以"/"結尾，移除它
-    if corrected_text.endswith('/'):
-        corrected_text = corrected_text[:-1]
-    
-    # 處理行首行尾空格，但保留換行格式
-    lines = corrected_text.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        # 只清理行首和行尾的空格，保留行中間的空格和格式
-        cleaned_line = line.strip()
-        cleaned_lines.append(cleaned_line)
-    
-    # 使用原始的換行符重新組合文字，確保換行被保留
-    corrected_text = '\n'.join(cleaned_lines)
-    
+    corrected_text, _ = apply_common_error_rules(text)
     return corrected_text
+
+def apply_common_error_rules(text):
+    """以編譯後的規則引擎單次掃描修正常見文字錯誤，並回傳修正位置
+
+    規則包含標點符號、空格與行尾"/"符號的修正，並清理行首行尾空格；
+    可在 correction_rules.json 中加入自訂規則。重複字詞由 "repeats" 校正階段標示。
+
+    參數:
+        text: 要修正的文字
+
+    回傳:
+        (修正後的文字, 修正位置列表)
+    """
+    if not text:
+        return text, []
+
+    from text_10_rules import get_rule_engine
+    return get_rule_engine().apply(text)
@@ -0,0 +1,181 @@
+"""
+保護詞彙多模式比對模組 (Aho-Corasick 自動機)
+"""
+from collections import deque
+
+class ProtectedWordMatcher:
+    """保護詞彙比對器
+
+    由保護詞彙表建立一次 Aho-Corasick 自動機，之後每次比對只需線性掃描一次文字，
+    不論詞彙表有多少個詞彙。
+    """
+    def __init__(self, words):
+        """建立自動機
+
+        參數:
+            words: 保護詞彙列表
+        """
+        self.words = tuple(word for word in words if word)
+        # 每個節點的轉移表、失敗連結、本節點結尾的詞長、輸出連結
+        self.goto = [{}]
+        self.fail = [0]
+        self.length = [0]
+        self.output_link = [0]
+
+        for word in self.words:
+            node = 0
+            for char in word:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.length.append(0)
+                    self.output_link.append(0)
+                    self.goto[node][char] = next_node
+                node = next_node
+            self.length[node] = len(word)
+
+        # 以廣度優先建立失敗連結與輸出連結
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fail_node = self.goto[state].get(char, 0)
+                self.fail[child] = fail_node
+                # 輸出連結指向失敗鏈上最近的一個詞彙結尾節點
+                self.output_link[child] = fail_node if self.length[fail_node] else self.output_link[fail_node]
+
+    def __bool__(self):
+        return bool(self.words)
+
+    def iter_matches(self, text):
+        """列出文字中所有保護詞彙的出現位置 (可能重疊)
+
+        參數:
+            text: 要掃描的文字
+
+        回傳:
+            (start, end) 產生器
+        """
+        goto = self.goto
+        fail = self.fail
+        length = self.length
+        output_link = self.output_link
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            end = index + 1
+            match = node if length[node] else output_link[node]
+            while match:
+                yield end - length[match], end
+                match = output_link[match]
+
+    def find_spans(self, text):
+        """找出不重疊的保護詞彙區段
+
+        由左至右選取，同一起點取最長的詞彙。
+
+        參數:
+            text: 要掃描的文字
+
+        回傳:
+            依位置排序的 (start, end) 列表
+        """
+        if not self.words or not text:
+            return []
+
+        # 每個起點只保留最長的匹配
+        longest = {}
+        for start, end in self.iter_matches(text):
+            if end > longest.get(start, start):
+                longest[start] = end
+
+        spans = []
+        last_end = 0
+        for start in sorted(longest):
+            if start >= last_end:
+                spans.append((start, longest[start]))
+                last_end = longest[start]
+        return spans
+
+def get_protected_matcher(self):
+    """取得目前保護詞彙表對應的比對器，詞彙表變動時才重新建立
+
+    回傳:
+        ProtectedWordMatcher 物件
+    """
+    words = tuple(word for word in (getattr(self, 'protected_words', None) or []) if word)
+    matcher = getattr(self, 'protected_matcher', None)
+    if matcher is None or matcher.words != words:
+        matcher = ProtectedWordMatcher(words)
+        self.protected_matcher = matcher
+    return matcher
+
+def convert_segments(converter, segments):
+    """以單次轉換器呼叫轉換多段文字
+
+    OpenCC 會在換行等分隔符號處切段並原樣保留分隔符號，因此以換行符號串接
+    各段後轉換一次，再依各段原有的換行數切回，結果與逐段轉換相同。
+
+    參數:
+        converter: OpenCC 轉換器
+        segments: 要轉換的文字片段列表
+
+    回傳:
+        轉換後的文字片段列表
+    """
+    if not segments:
+        return []
+    if len(segments) == 1:
+        return [converter.convert(segments[0])]
+
+    pieces = converter.convert('\n'.join(segments)).split('\n')
+    converted = []
+    position = 0
+    for segment in segments:
+        line_count = segment.count('\n') + 1
+        converted.append('\n'.join(pieces[position:position + line_count]))
+        position += line_count
+    return converted
+
+def convert_protected(converter, text, matcher):
+    """轉換文字，但保留保護詞彙原樣不動
+
+    參數:
+        converter: OpenCC 轉換器
+        text: 要轉換的文字
+        matcher: ProtectedWordMatcher 物件
+
+    回傳:
+        (轉換後的文字, 保護詞彙區段列表)
+    """
+    # 不含任何可轉換字元的文字不必經過轉換器
+    from text_09_converter import needs_conversion
+    if not needs_conversion(converter, text):
+        return text, matcher.find_spans(text) if matcher else []
+
+    spans = matcher.find_spans(text) if matcher else []
+    if not spans:
+        return converter.convert(text), spans
+
+    # 只轉換保護詞彙之間的間隙
+    gaps = []
+    position = 0
+    for start, end in spans:
+        gaps.append(text[position:start])
+        position = end
+    gaps.append(text[position:])
+    converted_gaps = convert_segments(converter, gaps)
+
+    result = [converted_gaps[0]]
+    for (start, end), converted_gap in zip(spans, converted_gaps[1:]):
+        result.append(text[start:end])
+        result.append(converted_gap)
+    return ''.join(result), spans
@@ -0,0 +1,229 @@
+"""
+原文與轉換後文字的對齊模組
+"""
+import re
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+
+# 與 OpenCC 相同的分句符號，OpenCC 會在這些符號處切段並原樣保留它們
+SEPARATOR_RE = re.compile(
+    r'(\s+|-|,|\.|\?|!|\*|　|，|。|、|；|：|？|！|…|“|”|‘|’|『|』|「|」|﹁|﹂|—|－|（|）|《|》|〈|〉|～|．|／|＼|︒|︑|︔|︓|︿|﹀|︹|︺|︙|︐|［|﹇|］|﹈|︕|︖|︰|︳|︴|︽|︾|︵|︶|｛|︷|｝|︸|﹃|﹄|【|︻|】|︼)')
+
+# 單一片段字元級比對的上限，超過時整段視為一個差異區段
+MAX_DIFF_WINDOW = 2000
+
+def align_texts(original_text, corrected_text):
+    """找出原文與轉換後文字之間的差異區段
+
+    先依 OpenCC 的分句符號切段逐段比對；若兩邊切段結果對不上 (例如其他修正改動了
+    標點)，改以行為單位比對後再細分。每個片段都先去除共同的前後綴，只對中間
+    不同的部分做有限長度的比對，因此整體花費與文件長度成線性。
+
+    參數:
+        original_text: 原始文字
+        corrected_text: 轉換後的文字
+
+    回傳:
+        依位置排序的 (orig_start, orig_end, corr_start, corr_end) 列表
+    """
+    ranges = []
+    if original_text == corrected_text:
+        return ranges
+
+    original_parts = SEPARATOR_RE.split(original_text)
+    corrected_parts = SEPARATOR_RE.split(corrected_text)
+    if len(original_parts) == len(corrected_parts) and original_parts[1::2] == corrected_parts[1::2]:
+        orig_offset = 0
+        corr_offset = 0
+        for orig_part, corr_part in zip(original_parts, corrected_parts):
+            if orig_part != corr_part:
+                _diff_segment(orig_part, corr_part, orig_offset, corr_offset, ranges)
+            orig_offset += len(orig_part)
+            corr_offset += len(corr_part)
+        return ranges
+
+    # 切段對不上時，以行為單位比對
+    original_lines = original_text.splitlines(True)
+    corrected_lines = corrected_text.splitlines(True)
+    orig_line_starts = _line_starts(original_lines)
+    corr_line_starts = _line_starts(corrected_lines)
+    matcher = SequenceMatcher(None, original_lines, corrected_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        _diff_segment(''.join(original_lines[i1:i2]), ''.join(corrected_lines[j1:j2]),
+                      orig_line_starts[i1], corr_line_starts[j1], ranges)
+    return ranges
+
+def _line_starts(lines):
+    """計算每一行 (含結尾) 的起始偏移量"""
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+    return starts
+
+def _diff_segment(orig_part, corr_part, orig_offset, corr_offset, ranges):
+    """比對單一片段並將差異區段加入 ranges
+
+    參數:
+        orig_part: 原文片段
+        corr_part: 轉換後片段
+        orig_offset: 原文片段的起始偏移量
+        corr_offset: 轉換後片段的起始偏移量
+        ranges: 用於存儲差異區段的列表
+    """
+    # 去除共同前綴
+    prefix = 0
+    limit = min(len(orig_part), len(corr_part))
+    while prefix < limit and orig_part[prefix] == corr_part[prefix]:
+        prefix += 1
+
+    # 等長時逐字比對即可得到精確位置
+    if len(orig_part) == len(corr_part):
+        run_start = None
+        for i in range(prefix, len(orig_part)):
+            if orig_part[i] != corr_part[i]:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                ranges.append((orig_offset + run_start, orig_offset + i,
+                               corr_offset + run_start, corr_offset + i))
+                run_start = None
+        if run_start is not None:
+            end = len(orig_part)
+            ranges.append((orig_offset + run_start, orig_offset + end,
+                           corr_offset + run_start, corr_offset + end))
+        return
+
+    # 去除共同後綴
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and orig_part[-1 - suffix] == corr_part[-1 - suffix]:
+        suffix += 1
+
+    orig_middle = orig_part[prefix:len(orig_part) - suffix]
+    corr_middle = corr_part[prefix:len(corr_part) - suffix]
+    orig_base = orig_offset + prefix
+    corr_base = corr_offset + prefix
+
+    if len(orig_middle) > MAX_DIFF_WINDOW or len(corr_middle) > MAX_DIFF_WINDOW:
+        ranges.append((orig_base, orig_base + len(orig_middle),
+                       corr_base, corr_base + len(corr_middle)))
+        return
+
+    matcher = SequenceMatcher(None, orig_middle, corr_middle, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            ranges.append((orig_base + i1, orig_base + i2, corr_base + j1, corr_base + j2))
+
+def correction_ranges(original_text, corrected_text, protected_spans=()):
+    """找出需要標記的修正位置 (以校正後文字的位置表示)
+
+    參數:
+        original_text: 原始文字
+        corrected_text: 校正後的文字
+        protected_spans: 原文中保護詞彙的 (start, end) 列表，區段內的差異不標記
+
+    回傳:
+        (start, end) 列表
+    """
+    return [(start, end) for start, end, _ in correction_records(original_text, corrected_text, protected_spans)]
+
+def correction_records(original_text, corrected_text, protected_spans=()):
+    """找出需要標記的修正位置與被取代的原文片段
+
+    參數:
+        original_text: 原始文字
+        corrected_text: 校正後的文字
+        protected_spans: 原文中保護詞彙的 (start, end) 列表，區段內的差異不標記
+
+    回傳:
+        (start, end, 原文片段) 列表，位置以校正後文字表示
+    """
+    corrections = []
+    span_index = 0
+    for orig_start, orig_end, corr_start, corr_end in align_texts(original_text, corrected_text):
+        while span_index < len(protected_spans) and protected_spans[span_index][1] <= orig_start:
+            span_index += 1
+        if (span_index < len(protected_spans) and protected_spans[span_index][0] <= orig_start
+                and orig_end <= protected_spans[span_index][1]):
+            continue
+        if corr_start < corr_end:
+            corrections.append((corr_start, corr_end, original_text[orig_start:orig_end]))
+    return corrections
+
+def remap_ranges(ranges, alignment):
+    """將舊文字中的區段位置換算到新文字中
+
+    參數:
+        ranges: (start, end, ...) 列表，位置以舊文字表示，額外欄位原樣保留
+        alignment: align_texts(舊文字, 新文字) 的結果
+
+    回傳:
+        換算後的區段列表；落在被改寫區域內的端點會延伸到整個改寫區域
+    """
+    if not alignment:
+        return list(ranges)
+    orig_starts = [item[0] for item in alignment]
+
+    def map_char(position):
+        # 舊文字第 position 個字元在新文字中的位置；落在改寫區域內時回傳 (區域起點, 區域終點)
+        index = bisect_right(orig_starts, position) - 1
+        if index < 0:
+            return position, position + 1
+        orig_start, orig_end, corr_start, corr_end = alignment[index]
+        if position < orig_end:
+            return corr_start, corr_end
+        return position - orig_end + corr_end, position - orig_end + corr_end + 1
+
+    remapped = []
+    for item in ranges:
+        start = map_char(item[0])[0]
+        end = map_char(item[1] - 1)[1] if item[1] > 0 else 0
+        remapped.append((start, max(start, end)) + tuple(item[2:]))
+    return remapped
+
+def map_offset(position, alignment):
+    """將舊文字中的單一位置 (例如游標) 換算到新文字中
+
+    參數:
+        position: 舊文字中的字元偏移量
+        alignment: align_texts(舊文字, 新文字) 的結果
+
+    回傳:
+        新文字中的字元偏移量；位於改寫區域內時保持相對位置 (最多到區域結尾)
+    """
+    shift = 0
+    for orig_start, orig_end, corr_start, corr_end in alignment:
+        if position < orig_start:
+            break
+        if position < orig_end:
+            return corr_start + min(position - orig_start, corr_end - corr_start)
+        shift = corr_end - orig_end
+    return position + shift
+
+def source_ranges(ranges, alignment):
+    """找出新文字中的區段在舊文字中對應的來源區段
+
+    除了換算位置外，與區段相接的刪除或插入也會併入來源區段，例如「的的」改為
+    「的」時，標記「的」的區段對應到舊文字的「的的」。
+
+    參數:
+        ranges: (start, end) 列表，位置以新文字表示
+        alignment: align_texts(舊文字, 新文字) 的結果
+
+    回傳:
+        (start, end) 列表，位置以舊文字表示
+    """
+    inverse = [(corr_start, corr_end, orig_start, orig_end)
+               for orig_start, orig_end, corr_start, corr_end in alignment]
+    corr_ends = [item[3] for item in alignment]
+    sources = []
+    for (start, end), (orig_start, orig_end) in zip(ranges, remap_ranges(ranges, inverse)):
+        index = bisect_left(corr_ends, start)
+        while index < len(alignment) and alignment[index][2] <= end:
+            orig_start = min(orig_start, alignment[index][0])
+            orig_end = max(orig_end, alignment[index][1])
+            index += 1
+        sources.append((orig_start, orig_end))
+    return sources
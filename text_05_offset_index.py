@@ -0,0 +1,103 @@
+"""
+字元偏移量與 tkinter 行列索引之間的轉換模組
+"""
+from bisect import bisect_right
+
+# 單次 tag_add 呼叫最多帶入的區段數，避免 Tcl 指令參數過長
+TAG_BATCH_SIZE = 500
+
+class LineIndex:
+    """行首偏移量索引
+
+    建立時掃描一次文字記錄每一行的起始偏移量，之後以二分搜尋將字元偏移量
+    轉換為 tkinter 的 "行.列" 索引。
+    """
+    def __init__(self, text, first_line=1):
+        """建立索引
+
+        參數:
+            text: 文字內容
+            first_line: 文字第一行在 Text 元件中的行號 (文字只是其中一段時使用)
+        """
+        self.first_line = first_line
+        self.line_starts = [0]
+        position = text.find('\n')
+        while position != -1:
+            self.line_starts.append(position + 1)
+            position = text.find('\n', position + 1)
+
+    def line_col(self, offset):
+        """將字元偏移量轉換為 (行, 列)，行號從 1 開始
+
+        參數:
+            offset: 字元偏移量
+
+        回傳:
+            (line, column) 元組
+        """
+        line = bisect_right(self.line_starts, offset)
+        return line + self.first_line - 1, offset - self.line_starts[line - 1]
+
+    def to_index(self, offset):
+        """將字元偏移量轉換為 tkinter 的索引字串
+
+        參數:
+            offset: 字元偏移量
+
+        回傳:
+            "行.列" 格式的索引
+        """
+        line, column = self.line_col(offset)
+        return f"{line}.{column}"
+
+    def to_offset(self, index):
+        """將 tkinter 的 "行.列" 索引轉換為字元偏移量
+
+        參數:
+            index: "行.列" 格式的索引
+
+        回傳:
+            字元偏移量
+        """
+        line, column = (int(part) for part in str(index).split('.'))
+        line = min(max(line - self.first_line + 1, 1), len(self.line_starts))
+        return self.line_starts[line - 1] + column
+
+def coalesce_ranges(ranges):
+    """合併重疊或相鄰的區段
+
+    參數:
+        ranges: (start, end, ...) 列表，只使用前兩個欄位
+
+    回傳:
+        排序並合併後的 (start, end) 列表
+    """
+    merged = []
+    for item in sorted(ranges):
+        start, end = item[0], item[1]
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def add_tag_ranges(text_widget, tag, line_index, ranges):
+    """將多個字元區段一次加上標籤
+
+    參數:
+        text_widget: tkinter Text 元件
+        tag: 標籤名稱
+        line_index: 對應文字內容的 LineIndex
+        ranges: (start, end, ...) 列表
+    """
+    indices = []
+    for start, end in coalesce_ranges(ranges):
+        if start < end:
+            indices.append(line_index.to_index(start))
+            indices.append(line_index.to_index(end))
+        if len(indices) >= TAG_BATCH_SIZE * 2:
+            text_widget.tag_add(tag, *indices)
+            indices = []
+    if indices:
+        text_widget.tag_add(tag, *indices)
@@ -0,0 +1,203 @@
+"""
+段落層級的增量校正模組
+"""
+import hashlib
+from bisect import bisect_right
+
+# 串流校正時每個區塊的目標字數 (區塊只在段落邊界切分)
+BLOCK_SIZE = 20000
+
+def paragraph_hash(paragraph):
+    """計算段落內容的雜湊值
+
+    參數:
+        paragraph: 段落文字
+
+    回傳:
+        十六進位雜湊字串
+    """
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).hexdigest()
+
+def correction_state_key(self, pipeline):
+    """增量校正紀錄的鍵 (轉換器、保護詞彙與校正流程)，任一項改變時舊紀錄不再沿用"""
+    from text_03_protected_matcher import get_protected_matcher
+    return (id(self.converter), get_protected_matcher(self).words, pipeline.key)
+
+def distribute_corrections(paragraphs, changes):
+    """將以整段文字表示的修正位置分配到各個段落
+
+    參數:
+        paragraphs: 以換行分隔的段落列表
+        changes: (start, end, ...) 列表，位置以各段落用換行串接後的文字表示
+
+    回傳:
+        每個段落的修正位置列表 (段落內的相對位置，跨段的區段截到段落結尾)
+    """
+    starts = [0]
+    for paragraph in paragraphs:
+        starts.append(starts[-1] + len(paragraph) + 1)
+    local_corrections = [[] for _ in paragraphs]
+    for start, end, *extra in changes:
+        k = bisect_right(starts, start) - 1
+        paragraph_end = starts[k] + len(paragraphs[k])
+        if start <= paragraph_end:
+            local_corrections[k].append((start - starts[k], min(end, paragraph_end) - starts[k], *extra))
+    return local_corrections
+
+def remember_paragraphs(self, text, changes, pipeline):
+    """將一段已校正文字的各段落修正位置加入增量校正紀錄 (例如即時校正的結果)
+
+    參數:
+        text: 校正後文字
+        changes: (start, end, ...) 列表，位置相對於 text
+        pipeline: 產生這些結果的校正流程
+    """
+    state_key = correction_state_key(self, pipeline)
+    state = getattr(self, 'correction_state', None)
+    if not state or state['key'] != state_key:
+        state = {'key': state_key, 'paragraphs': {}}
+    paragraphs = text.split('\n')
+    updated = dict(state['paragraphs'])
+    for paragraph, local in zip(paragraphs, distribute_corrections(paragraphs, changes)):
+        updated[paragraph_hash(paragraph)] = local
+    # 以新的字典整個取代，背景執行緒讀取時不會看到修改到一半的內容
+    self.correction_state = {'key': state_key, 'paragraphs': updated}
+
+def iter_correction_blocks(self, text, pipeline=None, block_size=BLOCK_SIZE):
+    """依文件順序逐區塊校正，只重新校正上次校正後有變動的段落
+
+    上次校正的結果以「校正後段落的雜湊值 -> 段落內的修正位置」保存在
+    self.correction_state。內容與上次輸出相同的段落直接沿用舊的修正標記，
+    預先檢查確定不會被改變的段落直接略過，每個區塊內其餘段落合併成一段文字，
+    只執行一次校正流程。
+    呼叫端可隨時停止迭代 (例如使用者取消)，已處理的段落仍會記錄下來。
+
+    參數:
+        text: 要校正的完整文字
+        pipeline: 校正流程，None 表示使用「文字修正」按鈕的流程
+        block_size: 每個區塊的目標字數
+
+    回傳:
+        區塊字典的產生器，包含:
+            first_paragraph: 區塊第一個段落的索引 (從 0 開始，等於行號減一)
+            paragraph_count: 區塊內的段落數
+            text: 區塊校正後的文字 (不含結尾換行)
+            corrections: 區塊內的 (start, end, 階段代號, 原文片段) 列表 (相對於區塊開頭)
+            dirty_count: 區塊內重新轉換的段落數
+            cached_count: 區塊內取自轉換快取的段落數
+            processed: 到此區塊為止已處理的原文字數
+            timings: 區塊內各校正階段的耗時統計
+    """
+    from text_03_protected_matcher import get_protected_matcher
+    from text_07_parallel import iter_convert_and_diff
+    from text_08_conversion_cache import get_conversion_cache, cache_key_prefix
+    from text_11_pipeline import get_pipeline
+
+    if pipeline is None:
+        pipeline = get_pipeline(self)
+    matcher = get_protected_matcher(self)
+    state_key = correction_state_key(self, pipeline)
+    state = getattr(self, 'correction_state', None)
+    previous = state['paragraphs'] if state and state['key'] == state_key else {}
+
+    paragraphs = text.split('\n')
+    hashes = [paragraph_hash(paragraph) for paragraph in paragraphs]
+
+    # 在段落邊界切分區塊
+    blocks = []
+    block_start = 0
+    block_chars = 0
+    for i, paragraph in enumerate(paragraphs):
+        block_chars += len(paragraph) + 1
+        if block_chars >= block_size:
+            blocks.append((block_start, i + 1))
+            block_start = i + 1
+            block_chars = 0
+    if block_start < len(paragraphs):
+        blocks.append((block_start, len(paragraphs)))
+
+    # 每個區塊內變動的段落；不含可轉換字元或轉換快取中已有結果的段落不必再轉換
+    cache = get_conversion_cache(self)
+    key_prefix = cache_key_prefix(self.converter, matcher.words, pipeline.key)
+    cached = {}
+    unchanged = set()
+    dirty_lists = []
+    for start, end in blocks:
+        dirty = []
+        for i in range(start, end):
+            if hashes[i] in previous:
+                continue
+            if not pipeline.may_change(self, paragraphs[i]):
+                unchanged.add(i)
+                continue
+            hit = cache.get(key_prefix + hashes[i])
+            if hit is None:
+                dirty.append(i)
+            else:
+                cached[i] = hit
+        dirty_lists.append(dirty)
+    dirty_texts = ['\n'.join(paragraphs[i] for i in dirty) for dirty in dirty_lists]
+
+    paragraph_state = {}
+    processed_paragraphs = 0
+    processed_chars = 0
+    try:
+        results = iter_convert_and_diff(self, dirty_texts, pipeline)
+        for (start, end), dirty, result in zip(blocks, dirty_lists, results):
+            converted_dirty = result['text']
+            converted_paragraphs = converted_dirty.split('\n') if dirty else []
+
+            # 將修正位置分配回各個變動段落 (段落內的相對位置)
+            local_corrections = distribute_corrections(converted_paragraphs, result['changes'])
+
+            dirty_lookup = dict(zip(dirty, range(len(dirty))))
+            output = []
+            corrections = []
+            cached_count = 0
+            offset = 0
+            for i in range(start, end):
+                paragraph = paragraphs[i]
+                processed_chars += len(paragraph) + 1
+                k = dirty_lookup.get(i)
+                if k is not None:
+                    paragraph = converted_paragraphs[k]
+                    local = local_corrections[k]
+                    cache.put(key_prefix + hashes[i], paragraph, local)
+                    digest = paragraph_hash(paragraph)
+                elif i in unchanged:
+                    digest = hashes[i]
+                    local = []
+                elif i in cached:
+                    paragraph, local = cached.pop(i)
+                    cached_count += 1
+                    digest = paragraph_hash(paragraph)
+                else:
+                    digest = hashes[i]
+                    local = previous[digest]
+                output.append(paragraph)
+                paragraph_state[digest] = local
+                corrections.extend((offset + corr_start, offset + corr_end, *extra) for corr_start, corr_end, *extra in local)
+                offset += len(paragraph) + 1
+
+            processed_paragraphs = end
+            yield {
+                'first_paragraph': start,
+                'paragraph_count': end - start,
+                'text': '\n'.join(output),
+                'corrections': corrections,
+                'dirty_count': len(dirty),
+                'cached_count': cached_count,
+                'processed': min(processed_chars, len(text)),
+                'timings': result['timings'],
+            }
+    finally:
+        cache.flush()
+        # 未處理的段落保留上次的紀錄
+        for digest in hashes[processed_paragraphs:]:
+            if digest in previous and digest not in paragraph_state:
+                paragraph_state[digest] = previous[digest]
+        self.correction_state = {'key': state_key, 'paragraphs': paragraph_state}
+
+def reset_correction_state(self):
+    """清除增量校正的紀錄，下次校正會重新處理所有段落"""
+    self.correction_state = None
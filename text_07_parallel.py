@@ -0,0 +1,113 @@
+"""
+大型文件的多行程平行校正模組
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+
+# 超過此字數時自動改用多行程平行校正
+PARALLEL_THRESHOLD = 200000
+
+# 工作行程內的校正對象與校正流程 (由 _init_worker 建立)
+_worker_tool = None
+_worker_pipeline = None
+
+def _init_worker(conversion, protected_words, stage_ids):
+    """工作行程初始化：每個行程只載入一次 OpenCC 字典並建立校正流程
+
+    參數:
+        conversion: OpenCC 轉換設定名稱
+        protected_words: 保護詞彙列表
+        stage_ids: 校正流程的階段代號列表
+    """
+    global _worker_tool, _worker_pipeline
+    from types import SimpleNamespace
+    from text_09_converter import get_converter
+    from text_11_pipeline import CorrectionPipeline
+    _worker_tool = SimpleNamespace(converter=get_converter(conversion),
+                                   protected_words=list(protected_words), settings={})
+    _worker_pipeline = CorrectionPipeline(stage_ids)
+
+def _correct_chunk(chunk_text):
+    """在工作行程中校正一個區塊
+
+    參數:
+        chunk_text: 區塊文字
+
+    回傳:
+        校正流程的結果字典
+    """
+    return _worker_pipeline.run(_worker_tool, chunk_text)
+
+def worker_count():
+    """可用的 CPU 核心數 (優先採用本行程可使用的核心)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def get_correction_pool(self, pipeline):
+    """取得 (必要時建立) 平行校正用的行程池
+
+    轉換設定、保護詞彙或校正階段變動時會關閉舊的行程池並重新建立。
+
+    參數:
+        pipeline: 校正流程
+
+    回傳:
+        ProcessPoolExecutor 物件
+    """
+    conversion = getattr(self.converter, 'conversion', None) or 's2t'
+    words = [word for word in self.protected_words if word]
+    pool_key = (conversion, tuple(words), pipeline.key)
+    pool = getattr(self, 'correction_pool', None)
+    if pool is not None and getattr(self, 'correction_pool_key', None) == pool_key:
+        return pool
+    if pool is not None:
+        pool.shutdown(wait=False)
+    self.correction_pool = ProcessPoolExecutor(
+        max_workers=worker_count(), initializer=_init_worker,
+        initargs=(conversion, words, pipeline.stage_ids))
+    self.correction_pool_key = pool_key
+    return self.correction_pool
+
+def iter_convert_and_diff(self, texts, pipeline):
+    """依序對多段文字執行校正流程，總字數超過門檻時交給行程池平行處理
+
+    結果依輸入順序逐一產生，前面的區塊完成後即可使用，不必等待全部完成。
+
+    參數:
+        texts: 要校正的文字列表
+        pipeline: 校正流程
+
+    回傳:
+        校正流程結果字典 (text, changes, timings) 的產生器
+    """
+    empty_result = {"text": "", "changes": [], "timings": []}
+    if sum(len(text) for text in texts) > PARALLEL_THRESHOLD and worker_count() > 1:
+        try:
+            pool = get_correction_pool(self, pipeline)
+            futures = [pool.submit(_correct_chunk, text) if text else None for text in texts]
+        except Exception as e:
+            print(f"平行校正失敗，改用單執行緒處理: {str(e)}")
+            self.correction_pool = None
+        else:
+            done = 0
+            try:
+                for future in futures:
+                    yield future.result() if future else empty_result
+                    done += 1
+            except BrokenExecutor as e:
+                # 工作行程異常結束時，尚未取得結果的區塊改用單執行緒處理
+                print(f"平行校正的工作行程異常結束，剩餘部分改用單執行緒處理: {str(e)}")
+                pool.shutdown(wait=False)
+                self.correction_pool = None
+                texts = texts[done:]
+            else:
+                return
+            finally:
+                # 提前停止或改用單執行緒時取消尚未開始的工作
+                for future in futures:
+                    if future:
+                        future.cancel()
+
+    for text in texts:
+        yield pipeline.run(self, text) if text else empty_result
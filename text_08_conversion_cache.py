@@ -0,0 +1,146 @@
+"""
+段落轉換結果快取模組 (記憶體 LRU，可選擇加上磁碟快取)
+"""
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 記憶體快取的大小上限 (位元組，估計值)
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# 磁碟快取檔案路徑
+CACHE_DB_PATH = os.path.join("cache", "conversion_cache.sqlite3")
+
+# 快取項目格式版本，修正位置的欄位改變時遞增讓舊的磁碟快取失效
+CACHE_FORMAT = 2
+
+class ConversionCache:
+    """段落轉換結果的 LRU 快取
+
+    以「轉換設定 + 保護詞彙版本 + 段落雜湊值」為鍵，保存轉換後的段落文字與段落內
+    的修正位置。記憶體部分依估計大小淘汰最久未使用的項目；啟用磁碟快取時，
+    記憶體中找不到的項目會再到 SQLite 檔案中查詢。
+    """
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, disk_path=None):
+        """建立快取
+
+        參數:
+            max_bytes: 記憶體快取的大小上限
+            disk_path: 磁碟快取檔案路徑，None 表示不使用磁碟快取
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if disk_path:
+            try:
+                directory = os.path.dirname(disk_path)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory)
+                self.db = sqlite3.connect(disk_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, converted TEXT, ranges TEXT)")
+            except Exception as e:
+                print(f"無法開啟轉換快取檔案: {str(e)}")
+                self.db = None
+
+    @staticmethod
+    def _entry_size(key, converted, ranges):
+        """估計單一項目佔用的記憶體大小"""
+        return sys.getsizeof(key) + sys.getsizeof(converted) + 64 * len(ranges) + 128
+
+    def _remember(self, key, converted, ranges):
+        """將項目放入記憶體快取並淘汰超出上限的舊項目 (呼叫時需持有鎖)"""
+        if key in self.entries:
+            self.size -= self._entry_size(key, *self.entries.pop(key))
+        self.entries[key] = (converted, ranges)
+        self.size += self._entry_size(key, converted, ranges)
+        while self.size > self.max_bytes and self.entries:
+            old_key, old_value = self.entries.popitem(last=False)
+            self.size -= self._entry_size(old_key, *old_value)
+
+    def get(self, key):
+        """查詢快取
+
+        參數:
+            key: 快取鍵
+
+        回傳:
+            (轉換後文字, 修正位置列表)，找不到時回傳 None
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                return value
+            if self.db is None:
+                return None
+            row = self.db.execute("SELECT converted, ranges FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value = (row[0], [tuple(item) for item in json.loads(row[1])])
+            self._remember(key, *value)
+            return value
+
+    def put(self, key, converted, ranges):
+        """寫入快取
+
+        參數:
+            key: 快取鍵
+            converted: 轉換後的段落文字
+            ranges: 段落內的修正位置列表
+        """
+        with self.lock:
+            self._remember(key, converted, ranges)
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO cache (key, converted, ranges) VALUES (?, ?, ?)",
+                                (key, converted, json.dumps(ranges)))
+
+    def flush(self):
+        """將磁碟快取的變更寫入檔案"""
+        with self.lock:
+            if self.db is not None:
+                self.db.commit()
+
+    def clear(self):
+        """清除記憶體與磁碟快取"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            if self.db is not None:
+                self.db.execute("DELETE FROM cache")
+                self.db.commit()
+
+def get_conversion_cache(self):
+    """取得 (必要時建立) 轉換結果快取，依設定決定是否使用磁碟快取
+
+    回傳:
+        ConversionCache 物件
+    """
+    cache = getattr(self, 'conversion_cache', None)
+    if cache is None:
+        settings = getattr(self, 'settings', None) or {}
+        disk_path = CACHE_DB_PATH if settings.get("conversion_cache_on_disk") else None
+        cache = ConversionCache(disk_path=disk_path)
+        self.conversion_cache = cache
+    return cache
+
+def cache_key_prefix(converter, protected_words, pipeline_key=''):
+    """計算快取鍵的前綴 (轉換設定、保護詞彙版本與校正階段)
+
+    參數:
+        converter: OpenCC 轉換器
+        protected_words: 保護詞彙序列
+        pipeline_key: 校正流程的階段組合
+
+    回傳:
+        快取鍵前綴字串
+    """
+    conversion = getattr(converter, 'conversion', None) or 's2t'
+    words_digest = hashlib.blake2b('\n'.join(protected_words).encode('utf-8'), digest_size=8).hexdigest()
+    return f"{CACHE_FORMAT}:{conversion}:{words_digest}:{pipeline_key}:"
@@ -0,0 +1,258 @@
+"""
+OpenCC 轉換器輔助功能模組 (共用轉換器登錄表、背景預先載入、可轉換字元集合)
+"""
+import os
+import pickle
+import threading
+from concurrent.futures import Future
+
+# 預設的轉換設定 (簡體轉繁體)
+DEFAULT_CONVERSION = 's2t'
+
+# 可選擇的轉換設定 (轉換設定名稱, 顯示名稱)
+CONVERSION_PROFILES = [
+    ('s2t', "簡體 → 繁體"),
+    ('s2tw', "簡體 → 臺灣正體"),
+    ('s2twp', "簡體 → 臺灣正體 (含臺灣慣用詞)"),
+    ('s2hk', "簡體 → 香港繁體"),
+    ('t2tw', "繁體 → 臺灣正體"),
+    ('t2hk', "繁體 → 香港繁體"),
+]
+
+# 已解析字典的磁碟快取資料夾
+CONVERTER_CACHE_DIR = os.path.join("cache", "opencc")
+
+# 快取格式版本，儲存內容改變時遞增讓舊快取失效
+CONVERTER_CACHE_FORMAT = 2
+
+# 已載入或載入中的轉換器 (轉換設定名稱 -> Future)，同一設定在整個行程中只載入一次字典
+_converter_futures = {}
+_converter_lock = threading.Lock()
+
+# 各轉換設定的可轉換字元集合 (轉換設定名稱 -> frozenset)
+_convertible_chars_cache = {}
+_convertible_chars_lock = threading.Lock()
+
+_dictionary_signature = None
+
+def dictionary_signature():
+    """OpenCC 套件內設定檔與字典檔的版本資訊 (檔名、修改時間、大小)，字典更新時磁碟快取隨之失效"""
+    global _dictionary_signature
+    if _dictionary_signature is None:
+        import opencc
+        package_dir = os.path.dirname(os.path.abspath(opencc.__file__))
+        files = []
+        for directory, _, filenames in os.walk(package_dir):
+            for filename in filenames:
+                if filename.endswith(('.json', '.txt')):
+                    path = os.path.join(directory, filename)
+                    stat = os.stat(path)
+                    files.append((os.path.relpath(path, package_dir), stat.st_mtime_ns, stat.st_size))
+        _dictionary_signature = (CONVERTER_CACHE_FORMAT, package_dir, tuple(sorted(files)))
+    return _dictionary_signature
+
+def _converter_cache_path(conversion):
+    return os.path.join(CONVERTER_CACHE_DIR, f"{conversion}.pickle")
+
+def _load_cached_converter(conversion):
+    """從磁碟快取建立混合轉換器 (不重新解析字典檔)，快取不存在或已過期時回傳 None"""
+    path = _converter_cache_path(conversion)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            signature, steps, chars = pickle.load(file)
+        if signature != dictionary_signature():
+            return None
+        import opencc
+        from text_16_translate_converter import HybridConverter
+        # 轉換器只用於逐詞比對 (字典由轉換步驟提供)，需要時才會自行載入字典
+        converter = opencc.OpenCC()
+        converter.set_conversion(conversion)
+        converter = HybridConverter(converter, steps)
+    except Exception as e:
+        print(f"OpenCC 字典快取無法使用，重新載入: {str(e)}")
+        return None
+    with _convertible_chars_lock:
+        _convertible_chars_cache.setdefault(conversion, chars)
+    return converter
+
+def _save_cached_converter(converter):
+    """將混合轉換器的轉換步驟與可轉換字元集合寫入磁碟快取"""
+    chars = convertible_chars(converter)
+    if chars is None or converter.steps is None:
+        return
+    path = _converter_cache_path(converter.conversion)
+    try:
+        os.makedirs(CONVERTER_CACHE_DIR, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump((dictionary_signature(), converter.steps, chars), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"無法寫入 OpenCC 字典快取: {str(e)}")
+
+def _load_converter(conversion, future):
+    """在背景執行緒中建立轉換器
+
+    優先使用磁碟快取；沒有快取時解析字典檔並包裝為混合轉換器 (單字對照以
+    translate 表轉換，見 text_16_translate_converter)。新建立的轉換器交給呼叫端後，
+    在另一個非 daemon 執行緒中建立預先檢查用的可轉換字元集合並寫入快取，程式
+    結束時會等待寫入完成，之後切換回這個轉換設定時不必重新解析。
+    """
+    from text_16_translate_converter import HybridConverter
+    try:
+        converter = _load_cached_converter(conversion)
+        if converter is not None:
+            future.set_result(converter)
+            return
+        import opencc
+        converter = HybridConverter(opencc.OpenCC(conversion))
+    except Exception as e:
+        future.set_exception(e)
+        return
+    future.set_result(converter)
+    threading.Thread(target=_save_cached_converter, args=(converter,), daemon=False).start()
+
+def get_converter_future(conversion=DEFAULT_CONVERSION):
+    """取得轉換器的 Future，尚未開始載入時在背景執行緒中開始載入
+
+    參數:
+        conversion: OpenCC 轉換設定名稱
+
+    回傳:
+        完成時結果為 OpenCC 轉換器的 Future
+    """
+    with _converter_lock:
+        future = _converter_futures.get(conversion)
+        # 載入失敗的設定下次取得時重新嘗試
+        if future is None or (future.done() and future.exception() is not None):
+            future = Future()
+            _converter_futures[conversion] = future
+            threading.Thread(target=_load_converter, args=(conversion, future), daemon=True).start()
+        return future
+
+def get_converter(conversion=DEFAULT_CONVERSION, timeout=None):
+    """取得共用的轉換器，仍在載入時等待載入完成
+
+    參數:
+        conversion: OpenCC 轉換設定名稱
+        timeout: 最長等待秒數，None 表示一直等待
+
+    回傳:
+        OpenCC 轉換器 (載入失敗時拋出原本的例外)
+    """
+    return get_converter_future(conversion).result(timeout)
+
+def current_conversion(self):
+    """取得目前選擇的轉換設定名稱"""
+    settings = getattr(self, 'settings', None) or {}
+    return settings.get("conversion") or DEFAULT_CONVERSION
+
+def resolve_converter(self):
+    """確保 self.converter 可用，背景載入尚未完成時等待
+
+    回傳:
+        OpenCC 轉換器 (載入失敗時拋出例外)
+    """
+    converter = getattr(self, 'converter', None)
+    if converter is None:
+        converter = get_converter(current_conversion(self))
+        self.converter = converter
+    return converter
+
+def switch_conversion(self, conversion):
+    """切換轉換設定；已載入過的設定直接沿用，否則在背景載入 (載入完成前的校正會等待)
+
+    參數:
+        conversion: OpenCC 轉換設定名稱
+
+    回傳:
+        載入中轉換器的 Future
+    """
+    self.settings["conversion"] = conversion
+    future = get_converter_future(conversion)
+    if future.done() and future.exception() is None:
+        self.converter = future.result()
+    else:
+        self.converter = None
+    return future
+
+def _reset_after_fork():
+    """子行程中重新建立鎖，並捨棄父行程中尚未載入完成的轉換器 (子行程沒有對應的載入執行緒)"""
+    global _converter_lock, _convertible_chars_lock
+    _converter_lock = threading.Lock()
+    _convertible_chars_lock = threading.Lock()
+    for conversion, future in list(_converter_futures.items()):
+        if not future.done() or future.exception() is not None:
+            del _converter_futures[conversion]
+
+# 以 fork 建立的工作行程直接沿用父行程已載入的字典，不必重新載入
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def convertible_chars(converter):
+    """取得轉換器字典中所有可能被轉換的字元
+
+    由轉換鏈中每個字典收集會改變文字的對照項目：等長的項目只取與轉換結果不同
+    位置的字元，不等長的項目取整個鍵的字元，對照到自己的項目略過。每個會改變
+    文字的鍵都至少含有一個收集到的字元，因此若文字不含其中任何一個字元，轉換
+    結果必定與原文相同。每個轉換設定只需建立一次。
+
+    參數:
+        converter: OpenCC 轉換器
+
+    回傳:
+        字元的 frozenset；無法取得字典內容時回傳 None
+    """
+    conversion = getattr(converter, 'conversion', None)
+    if not conversion:
+        return None
+    chars = _convertible_chars_cache.get(conversion)
+    if chars is not None:
+        return chars
+
+    with _convertible_chars_lock:
+        chars = _convertible_chars_cache.get(conversion)
+        if chars is not None:
+            return chars
+        try:
+            if not getattr(converter, '_dict_init_done', True):
+                converter._init_dict()
+            collected = set()
+            pending = list(converter._dict_chain_data)
+            while pending:
+                item = pending.pop()
+                if isinstance(item, list):
+                    pending.extend(item)
+                else:
+                    # 字典項目格式為 (最長鍵長, 最短鍵長, 對照表)，多個候選值時使用第一個
+                    for key, value in item[2].items():
+                        value = value.split(' ')[0]
+                        if key == value:
+                            continue
+                        if len(key) == len(value):
+                            collected.update(a for a, b in zip(key, value) if a != b)
+                        else:
+                            collected.update(key)
+        except Exception as e:
+            print(f"無法建立可轉換字元集合: {str(e)}")
+            return None
+        chars = frozenset(collected)
+        _convertible_chars_cache[conversion] = chars
+        return chars
+
+def needs_conversion(converter, text):
+    """快速檢查文字是否可能被轉換器改變
+
+    參數:
+        converter: OpenCC 轉換器
+        text: 要檢查的文字
+
+    回傳:
+        文字含有可轉換字元 (或無法判斷) 時回傳 True
+    """
+    chars = convertible_chars(converter)
+    if chars is None:
+        return True
+    return not chars.isdisjoint(text)
@@ -0,0 +1,455 @@
+"""
+常見文字錯誤修正規則引擎模組
+"""
+import os
+import re
+import json
+import time
+import hashlib
+from bisect import bisect_right
+
+from text_05_offset_index import coalesce_ranges
+
+# 使用者自訂規則檔案路徑 (JSON 物件，鍵為錯誤文字，值為修正文字)
+USER_RULES_PATH = "correction_rules.json"
+
+# 預設修正規則 (錯誤文字, 修正文字)
+DEFAULT_RULES = [
+    # 標點符號修正
+    ('，,', '，'),
+    (',.', '。'),
+    ('。.', '。'),
+    ('..', '。'),
+    ('。。', '。'),
+    (',,', '，'),
+    ('，，', '，'),
+
+    # 空格修正
+    ('  ', ' '),  # 雙空格改為單空格
+
+    # 移除行尾的"/"符號（可能是Word文件轉換時產生的）
+    ('/\n', '\n'),
+    ('/ \n', '\n'),
+]
+
+# 規則反覆套用的輪數上限 (避免使用者規則互相改寫造成無窮迴圈)
+MAX_RULE_PASSES = 64
+
+# 換行符號以外的空白字元 (與 str.isspace 相同)
+_SPACE_SET = frozenset(char for char in map(chr, range(0x110000)) if char.isspace() and char != '\n')
+_SPACE_CHARS = ''.join(re.escape(char) for char in sorted(_SPACE_SET))
+
+# 文字開頭的空白與換行後的空白 (行尾空白在反轉後的文字中同樣是換行後的空白)
+_LEADING_SPACE_RE = re.compile(f'[{_SPACE_CHARS}]+')
+_LINE_SPACE_RE = re.compile(f'\n[{_SPACE_CHARS}]+')
+
+class _Replacements(dict):
+    """錯誤文字對應修正文字的字典，也能查詢合併規則符合的整段連續重複 (「，，，」)"""
+    def __init__(self, rules):
+        super().__init__(rules)
+        self.units = [correction for error, correction in rules.items() if error == correction * 2]
+
+    def __missing__(self, key):
+        for unit in self.units:
+            if key == unit * (len(key) // len(unit)):
+                return unit
+        raise KeyError(key)
+
+def _trie_pattern(rules):
+    """將錯誤文字組成字首樹形式的正規表示式
+
+    共用字首的規則合併為一個分支，每個位置只需比對一次字首；同一位置優先符合
+    最長的錯誤文字。「，，」改為「，」這類把重複的片段合併為一個的規則 (沒有更長
+    的規則以它為字首時) 直接符合整段連續的重複，一輪就能合併完成。
+
+    參數:
+        rules: 錯誤文字對應修正文字的字典
+
+    回傳:
+        正規表示式字串
+    """
+    root = {}
+    for error in rules:
+        node = root
+        for char in error:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node, prefix):
+        branches = []
+        leaves = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if list(child) == [''] and rules[prefix + char] * 2 != prefix + char:
+                leaves.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + build(child, prefix + char))
+        if len(leaves) == 1:
+            branches.append(leaves[0])
+        elif leaves:
+            branches.append(f"[{''.join(leaves)}]")
+        pattern = '|'.join(branches)
+        if '' not in node:
+            return pattern if len(branches) == 1 or not prefix else f'(?:{pattern})'
+        if branches:
+            return f'(?:{pattern})?'
+        # 沒有更長的規則以此為字首時，重複片段的合併規則延伸到整段連續的重複
+        return f'(?:{re.escape(rules[prefix])})*' if rules[prefix] * 2 == prefix else ''
+
+    return build(root, '')
+
+def _remap_sorted(ranges, alignment):
+    """將區段位置換算到改寫後的文字中 (與 remap_ranges 相同，但區段須依位置排序且不重疊)
+
+    參數:
+        ranges: (start, end) 列表
+        alignment: 依位置排序的 (舊起點, 舊終點, 新起點, 新終點) 列表
+
+    回傳:
+        換算後的 (start, end) 列表；落在被改寫區域內的端點會延伸到整個改寫區域
+    """
+    remapped = []
+    index = -1
+    count = len(alignment)
+    orig_end = corr_end = 0
+    for start, end in ranges:
+        while index + 1 < count and alignment[index + 1][0] <= start:
+            index += 1
+            _, orig_end, _, corr_end = alignment[index]
+        if start < orig_end:
+            new_start = alignment[index][2]
+        else:
+            new_start = start - orig_end + corr_end
+        end -= 1
+        while index + 1 < count and alignment[index + 1][0] <= end:
+            index += 1
+            _, orig_end, _, corr_end = alignment[index]
+        if end < orig_end:
+            new_end = corr_end
+        else:
+            new_end = end - orig_end + corr_end + 1
+        remapped.append((new_start, max(new_start, new_end)))
+    return remapped
+
+class RuleEngine:
+    """以正規表示式套用的文字修正規則引擎
+
+    所有規則編譯成一個字首樹形式的多選分支 (同一位置以最長的規則優先)，
+    第一輪以 finditer 掃描整份文字，之後每一輪只重新掃描上一輪可能產生新符合的
+    改寫位置附近，直到沒有任何符合為止，因此結果與反覆套用所有規則直到不再變化相同
+    (例如「。。。」會完全合併為「。」)，花費則接近只掃描一次。
+    同時會移除每一行行首與行尾的空白字元 (換行符號除外)：第一輪之前先逐行
+    strip，之後改寫產生的行首行尾空白在重新掃描的範圍中尋找；行尾空白以反轉後的
+    文字搜尋，使每個搜尋的開頭都是換行符號，正規表示式可以快速略過其他字元。
+    """
+    def __init__(self, rules):
+        """編譯規則
+
+        參數:
+            rules: (錯誤文字, 修正文字) 列表，後面的規則會覆蓋前面相同的錯誤文字
+        """
+        self.rules = dict((error, correction) for error, correction in rules if error and error != correction)
+        # 規則內容的雜湊值，用於區分不同版本的規則
+        self.digest = hashlib.blake2b(json.dumps(sorted(self.rules.items()), ensure_ascii=False).encode('utf-8'),
+                                      digest_size=8).hexdigest()
+        errors = sorted(self.rules)
+        self.replacements = _Replacements(self.rules)
+        self.pattern = re.compile(_trie_pattern(self.rules)) if errors else None
+        # 改寫後需要重新檢查的範圍 (改寫位置前後各 reach 個字元)
+        self.reach = max([len(error) for error in errors] + [2]) - 1
+        # 新的符合一定跨過改寫位置的邊界，邊界兩側的兩個字元必須是某個錯誤文字中
+        # 相鄰的兩個字元，或是空白與換行、空白與空白 (文字開頭的空白記為單一字元)。
+        # 修正文字本身不含錯誤文字與行首行尾空白、邊界兩側也不是這些組合時，下一輪
+        # 不必重新檢查
+        self.pairs = frozenset(error[index:index + 2] for error in errors for index in range(len(error) - 1))
+        self.pairs |= frozenset(first + second for first in _SPACE_SET | {'\n'} for second in _SPACE_SET)
+        self.pairs |= frozenset(first + '\n' for first in _SPACE_SET) | _SPACE_SET
+        self.settled = frozenset(correction for correction in self.rules.values()
+                                 if not any(error in correction for error in errors)
+                                 and not _LINE_SPACE_RE.search(correction)
+                                 and not _LINE_SPACE_RE.search(correction[::-1])) | {''}
+
+    def _scan(self, text, at_start):
+        """掃描一段文字，找出所有符合規則或行首行尾空白的位置
+
+        參數:
+            text: 要掃描的文字
+            at_start: text 是否從整份文字的開頭開始 (開頭的空白也是行首空白)
+
+        回傳:
+            (start, -end, 優先順序, 修正文字) 列表 (可能重疊)
+        """
+        if self.pattern is not None:
+            replacements = self.replacements
+            candidates = [(match.start(), -match.end(), 1, replacements[match.group()])
+                          for match in self.pattern.finditer(text)]
+        else:
+            candidates = []
+        if at_start:
+            match = _LEADING_SPACE_RE.match(text)
+            if match:
+                candidates.append((0, -match.end(), 0, ''))
+        candidates.extend([(match.start() + 1, -match.end(), 0, '') for match in _LINE_SPACE_RE.finditer(text)])
+        # 行尾空白 (在反轉後的文字中是換行後的空白)
+        length = len(text)
+        candidates.extend([(length - match.end(), match.start() + 1 - length, 0, '')
+                           for match in _LINE_SPACE_RE.finditer(text[::-1])])
+        return candidates
+
+    def _candidates(self, text, windows):
+        """找出一輪可能改寫的位置
+
+        參數:
+            text: 目前的文字
+            windows: 要掃描的 (start, end) 範圍列表 (依位置排序、不重疊)，None 表示整份文字
+
+        回傳:
+            依 (start, -end, 優先順序) 排序的 (start, -end, 優先順序, 修正文字) 列表 (可能重疊)，
+            同一起點最長的在前，長度相同時空白優先
+        """
+        if windows is None:
+            # 行首行尾空白已在第一輪之前移除，只需找出符合規則的位置 (finditer 的結果已排序且不重疊)
+            if self.pattern is None:
+                return []
+            replacements = self.replacements
+            return [(match.start(), -match.end(), 1, replacements[match.group()])
+                    for match in self.pattern.finditer(text)]
+        # 各範圍以不會出現在規則中的字元串接後一次掃描，再換算回原本的位置
+        snippet_starts = []
+        pieces = []
+        position = 0
+        for low, high in windows:
+            snippet_starts.append(position)
+            pieces.append(text[low:high])
+            position += high - low + 1
+        candidates = []
+        for start, negative_end, priority, replacement in self._scan('\x00'.join(pieces), windows[0][0] == 0):
+            window = bisect_right(snippet_starts, start) - 1
+            shift = windows[window][0] - snippet_starts[window]
+            candidates.append((start + shift, negative_end - shift, priority, replacement))
+        candidates.sort()
+        return candidates
+
+    def _windows(self, text, edited):
+        """改寫位置附近需要重新掃描的範圍
+
+        範圍包含改寫位置前後各 reach 個字元，並延伸到相接的整段空白與其外的一個
+        字元 (換行符號)，行首行尾空白因此能被完整找到。
+
+        參數:
+            text: 改寫後的文字
+            edited: 改寫後文字中的 (start, end) 列表 (依位置排序)
+        """
+        reach = self.reach
+        last = len(text)
+        windows = []
+        for corr_start, corr_end in edited:
+            low = corr_start - reach
+            high = corr_end + reach
+            if low < 1:
+                low = 0
+            else:
+                while low > 0 and text[low - 1] in _SPACE_SET:
+                    low -= 1
+                low -= 1
+            if high >= last:
+                high = last
+            else:
+                while high < last and text[high] in _SPACE_SET:
+                    high += 1
+                high += 1
+            if windows and low <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], high)
+            else:
+                windows.append((low, high))
+        return windows
+
+    def apply(self, text):
+        """套用所有規則
+
+        參數:
+            text: 要修正的文字
+
+        回傳:
+            (修正後的文字, 修正位置列表)，修正位置為修正後文字中被改寫字元的 (start, end)
+        """
+        if not text:
+            return text, []
+
+        pairs = self.pairs
+        settled = self.settled
+        # 先逐行移除行首行尾空白，文字結尾再補上一個換行，讓行尾規則也能套用在最後一行
+        current = '\n'.join([line.strip() for line in text.split('\n')]) + '\n'
+        ranges = []
+        windows = None
+        for _ in range(MAX_RULE_PASSES):
+            pieces = []
+            alignment = []
+            changed = []
+            unsettled = []
+            copied = 0
+            length = 0
+            # 由左至右選取不重疊的位置 (候選位置已依優先順序排序)
+            for start, negative_end, _, replacement in self._candidates(current, windows):
+                if start < copied:
+                    continue
+                end = -negative_end
+                corr_start = length + start - copied
+                corr_end = corr_start + len(replacement)
+                pieces.append(current[copied:start])
+                pieces.append(replacement)
+                alignment.append((start, end, corr_start, corr_end))
+                if corr_start < corr_end:
+                    if changed and changed[-1][1] == corr_start:
+                        changed[-1] = (changed[-1][0], corr_end)
+                    else:
+                        changed.append((corr_start, corr_end))
+                # 緊接前一個改寫位置時邊界兩側的字元還不確定，一律重新檢查
+                if replacement not in settled or (start == copied and start):
+                    unsettled.append((corr_start, corr_end))
+                else:
+                    left = current[start - 1] if start else ''
+                    right = current[end:end + 1]
+                    if replacement:
+                        if left + replacement[0] in pairs or replacement[-1] + right in pairs:
+                            unsettled.append((corr_start, corr_end))
+                    elif left + right in pairs:
+                        unsettled.append((corr_start, corr_end))
+                length = corr_end
+                copied = end
+            if not alignment:
+                break
+            pieces.append(current[copied:])
+            current = ''.join(pieces)
+            # 先前的修正位置換算到這一輪的結果上，再加入這一輪改寫的字元
+            ranges = coalesce_ranges(_remap_sorted(ranges, alignment) + changed) if ranges else changed
+            if not unsettled:
+                break
+            # 下一輪只掃描可能產生新符合的改寫位置附近
+            windows = self._windows(current, unsettled)
+
+        # 移除結尾補上的換行
+        current = current[:-1]
+        while ranges and ranges[-1][0] >= len(current):
+            ranges.pop()
+        if ranges and ranges[-1][1] > len(current):
+            ranges[-1] = (ranges[-1][0], len(current))
+        return current, ranges
+
+def load_user_rules(path=USER_RULES_PATH):
+    """載入使用者自訂修正規則
+
+    參數:
+        path: 規則檔案路徑
+
+    回傳:
+        (錯誤文字, 修正文字) 列表
+    """
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            rules = json.load(file)
+        if not isinstance(rules, dict):
+            print(f"修正規則檔案格式不正確，應為 JSON 物件: {path}")
+            return []
+        return [(str(error), str(correction)) for error, correction in rules.items()]
+    except Exception as e:
+        print(f"載入修正規則時發生錯誤: {str(e)}")
+        return []
+
+_engine = None
+_engine_mtime = None
+
+def get_rule_engine():
+    """取得編譯後的規則引擎，使用者規則檔案變動時才重新編譯
+
+    回傳:
+        RuleEngine 物件
+    """
+    global _engine, _engine_mtime
+    mtime = os.path.getmtime(USER_RULES_PATH) if os.path.exists(USER_RULES_PATH) else None
+    if _engine is None or mtime != _engine_mtime:
+        _engine = RuleEngine(DEFAULT_RULES + load_user_rules())
+        _engine_mtime = mtime
+    return _engine
+
+def _replace_chain(rules, text):
+    """規則引擎之前的做法：依序以 str.replace 套用每條規則一次，再逐行去除行首行尾空白 (效能比較用)"""
+    text += '\n'
+    for error, correction in rules.items():
+        text = text.replace(error, correction)
+    return '\n'.join(line.strip() for line in text[:-1].split('\n'))
+
+def sample_rule_text(size=1000000, seed=0):
+    """組成效能測試用的中文文字，約 5% 的句子含有重複逗號、行首空白或行尾空白
+
+    參數:
+        size: 大約的字元數
+        seed: 亂數種子
+
+    回傳:
+        測試文字
+    """
+    import random
+    generator = random.Random(seed)
+    sentence = "這是一段用來測試效能的中文句子，內容包含常見的標點符號與文字。"
+    parts = []
+    length = 0
+    while length < size:
+        part = sentence
+        roll = generator.random()
+        if roll < 0.05:
+            part = part.replace("，", "，，")
+        elif roll < 0.1:
+            part = part + "  "
+        elif roll < 0.15:
+            part = "  " + part
+        if generator.random() < 0.2:
+            part += "\n"
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+def benchmark_rules(text=None, repeat=15):
+    """比較規則引擎與依序 str.replace 的速度
+
+    兩種做法交錯執行並各取最快的一次，兩者在相同的系統狀態下計時。
+
+    參數:
+        text: 測試文字，None 表示以 sample_rule_text 組成約 1 MB 的文字
+        repeat: 重複次數
+
+    回傳:
+        結果字典 (characters、replace_seconds、engine_seconds、speedup)
+    """
+    engine = RuleEngine(DEFAULT_RULES)
+    if text is None:
+        text = sample_rule_text()
+    replace_seconds = engine_seconds = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _replace_chain(engine.rules, text)
+        seconds = time.perf_counter() - started
+        replace_seconds = seconds if replace_seconds is None else min(replace_seconds, seconds)
+        started = time.perf_counter()
+        engine.apply(text)
+        seconds = time.perf_counter() - started
+        engine_seconds = seconds if engine_seconds is None else min(engine_seconds, seconds)
+    return {
+        "characters": len(text),
+        "replace_seconds": replace_seconds,
+        "engine_seconds": engine_seconds,
+        "speedup": replace_seconds / engine_seconds if engine_seconds else float('inf'),
+    }
+
+if __name__ == "__main__":
+    import sys
+    text = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8-sig') as file:
+            text = file.read()
+    result = benchmark_rules(text)
+    print(f"文字長度: {result['characters']} 字")
+    print(f"str.replace: {result['replace_seconds']:.4f} 秒，規則引擎: {result['engine_seconds']:.4f} 秒，"
+          f"加速 {result['speedup']:.2f} 倍")
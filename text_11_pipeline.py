@@ -0,0 +1,284 @@
+"""
+文字校正流程模組：依序執行可設定的校正階段，並記錄每個階段的耗時與修正數
+"""
+import re
+import time
+
+# 按下「文字修正」按鈕時的預設校正階段
+DEFAULT_BUTTON_STAGES = ["opencc", "typo", "repeats"]
+
+# 匯入 Word 檔案時的預設校正階段
+DEFAULT_WORD_IMPORT_STAGES = ["normalize", "punctuation", "rules", "opencc", "typo", "repeats"]
+
+# 已註冊的校正階段 (階段代號 -> (顯示名稱, 處理函數, 預先檢查函數, 版本函數, 標記名稱, 是否為建議, 資料載入函數))
+STAGES = {}
+
+def register_stage(stage_id, label, func, prefilter=None, version=None, tag="corrected", suggestion=False,
+                   resource=None):
+    """註冊校正階段
+
+    參數:
+        stage_id: 階段代號
+        label: 顯示名稱
+        func: 處理函數 func(tool, text)，回傳 (處理後文字, 修正位置列表)；修正位置為
+              (start, end) 或 (start, end, 被取代的原文片段)，未提供原文片段時由對齊結果推算
+        prefilter: 預先檢查函數 prefilter(tool, text)，回傳 False 表示此階段不會改變文字；
+                   None 表示無法預先判斷
+        version: 版本函數 version()，回傳此階段所用資料 (規則、字典) 的版本字串，
+                 版本改變時快取的校正結果會失效；None 表示沒有外部資料
+        tag: 文字區域中標記此階段修正位置的標籤名稱
+        suggestion: 此階段只標示建議而不修改文字；修正位置的第三個欄位為建議的文字，
+                    而不是被取代的原文片段
+        resource: 資料載入函數 resource()，回傳此階段使用的資料 (字典、偵測器)；建立
+                  校正流程時只載入一次，func、prefilter 與 version 會多收到這份資料作為
+                  最後一個參數，逐段落預先檢查時不必每次重新取得；None 表示沒有外部資料
+    """
+    STAGES[stage_id] = (label, func, prefilter, version, tag, suggestion, resource)
+
+def stage_tag(stage_id):
+    """取得校正階段對應的標籤名稱 (未註冊的階段使用 "corrected")"""
+    stage = STAGES.get(stage_id)
+    return stage[4] if stage else "corrected"
+
+def is_suggestion_stage(stage_id):
+    """校正階段是否只標示建議 (修正位置記錄的是建議的文字而不是原文片段)"""
+    stage = STAGES.get(stage_id)
+    return bool(stage and stage[5])
+
+# 需要正規化的字元：Windows/舊版 Mac 換行符號與零寬字元
+_NORMALIZE_RE = re.compile('\r\n?|[\u200b\u200c\u200d\ufeff]')
+
+def _normalize_stage(tool, text):
+    """正規化：統一換行符號並移除零寬字元"""
+    pieces = []
+    changes = []
+    position = 0
+    length = 0
+    for match in _NORMALIZE_RE.finditer(text):
+        pieces.append(text[position:match.start()])
+        length += match.start() - position
+        replacement = '\n' if match.group().startswith('\r') else ''
+        pieces.append(replacement)
+        changes.append((length, length + len(replacement), match.group()))
+        length += len(replacement)
+        position = match.end()
+    if not changes:
+        return text, []
+    pieces.append(text[position:])
+    return ''.join(pieces), changes
+
+def _normalize_prefilter(tool, text):
+    return _NORMALIZE_RE.search(text) is not None
+
+def _punctuation_stage(tool, text):
+    """全形/半形：與中文相鄰的半形標點改為全形，全形數字與英文字母改為半形"""
+    from text_21_punctuation import normalize_punctuation
+    return normalize_punctuation(text)
+
+def _punctuation_prefilter(tool, text):
+    from text_21_punctuation import may_need_punctuation
+    return may_need_punctuation(text)
+
+def _rules_stage(tool, text):
+    """規則修正：標點、空格等常見錯誤"""
+    from text_01_correction import apply_common_error_rules
+    return apply_common_error_rules(text)
+
+def _rules_version():
+    from text_10_rules import get_rule_engine
+    return get_rule_engine().digest
+
+def _opencc_stage(tool, text):
+    """OpenCC 簡繁轉換 (保護詞彙在轉換前遮罩，轉換後依位置原樣放回)"""
+    converter = getattr(tool, 'converter', None)
+    if not converter:
+        return text, []
+    from text_03_protected_matcher import get_protected_matcher, convert_protected
+    from text_04_alignment import correction_records
+    converted, spans = convert_protected(converter, text, get_protected_matcher(tool))
+    return converted, correction_records(text, converted, spans)
+
+def _opencc_prefilter(tool, text):
+    converter = getattr(tool, 'converter', None)
+    if not converter:
+        return False
+    from text_09_converter import needs_conversion
+    return needs_conversion(converter, text)
+
+def _typo_stage(tool, text, dictionary):
+    """自訂錯字字典：最長匹配替換錯誤詞 (不修改保護詞彙)"""
+    if not dictionary:
+        return text, []
+    from text_03_protected_matcher import get_protected_matcher
+    return dictionary.apply(text, get_protected_matcher(tool).find_spans(text))
+
+def _typo_prefilter(tool, text, dictionary):
+    return dictionary.may_match(text)
+
+def _typo_version(dictionary):
+    return dictionary.digest
+
+def _typo_resource():
+    from text_12_typo_dictionary import get_typo_dictionary
+    return get_typo_dictionary()
+
+def _repeats_stage(tool, text, detector):
+    """重複字詞：標示緊接重複的字或短詞 (不修改文字，建議保留一個)"""
+    if not detector.may_match(text):
+        return text, []
+    from text_03_protected_matcher import get_protected_matcher
+    spans = get_protected_matcher(tool).find_spans(text)
+    return text, detector.find(text, spans, getattr(tool, 'converter', None))
+
+def _repeats_prefilter(tool, text, detector):
+    return detector.may_match(text)
+
+def _repeats_version(detector):
+    return detector.digest
+
+def _repeats_resource():
+    from text_20_repeats import get_repeat_detector
+    return get_repeat_detector()
+
+register_stage("normalize", "正規化", _normalize_stage, _normalize_prefilter)
+register_stage("punctuation", "全形/半形標點", _punctuation_stage, _punctuation_prefilter)
+register_stage("rules", "規則修正", _rules_stage, version=_rules_version)
+register_stage("opencc", "OpenCC 轉換", _opencc_stage, _opencc_prefilter)
+register_stage("typo", "錯字字典", _typo_stage, _typo_prefilter, _typo_version, tag="typo_corrected",
+               resource=_typo_resource)
+register_stage("repeats", "重複字詞", _repeats_stage, _repeats_prefilter, _repeats_version,
+               tag="repeat_suggestion", suggestion=True, resource=_repeats_resource)
+
+class CorrectionPipeline:
+    """文字校正流程
+
+    依序執行各個校正階段。後面的階段改變文字時，前面階段留下的修正位置會依
+    兩段文字的對齊結果換算到新的位置，最後得到以最終文字表示的修正位置。
+    """
+    def __init__(self, stage_ids):
+        """建立校正流程
+
+        參數:
+            stage_ids: 依執行順序排列的階段代號列表 (未註冊的代號會被忽略)
+        """
+        self.stage_ids = [stage_id for stage_id in stage_ids if stage_id in STAGES]
+        # 各階段的資料 (字典、偵測器) 在建立流程時載入一次，之後每次呼叫都附加在參數最後
+        self.stage_args = {}
+        for stage_id in self.stage_ids:
+            resource = STAGES[stage_id][6]
+            self.stage_args[stage_id] = (resource(),) if resource else ()
+        # 流程鍵包含各階段資料的版本，規則或字典變動後快取的結果不會被誤用
+        parts = []
+        for stage_id in self.stage_ids:
+            version = STAGES[stage_id][3]
+            parts.append(f"{stage_id}@{version(*self.stage_args[stage_id])}" if version else stage_id)
+        self.key = ','.join(parts)
+
+    def may_change(self, tool, text):
+        """預先檢查文字是否可能被任何階段改變
+
+        參數:
+            tool: 提供 converter、protected_words 等屬性的物件
+            text: 要檢查的文字
+
+        回傳:
+            可能改變 (或無法判斷) 時回傳 True
+        """
+        for stage_id in self.stage_ids:
+            prefilter = STAGES[stage_id][2]
+            if prefilter is None or prefilter(tool, text, *self.stage_args[stage_id]):
+                return True
+        return False
+
+    def run(self, tool, text):
+        """執行校正流程
+
+        參數:
+            tool: 提供 converter、protected_words 等屬性的物件
+            text: 要校正的文字
+
+        回傳:
+            字典，包含:
+                text: 校正後文字
+                changes: (start, end, 階段代號, 原文片段) 列表，位置以校正後文字表示
+                timings: 各階段的 {"stage", "label", "seconds", "changes"} 列表
+        """
+        from text_04_alignment import align_texts, remap_ranges, source_ranges
+
+        changes = []
+        timings = []
+        for stage_id in self.stage_ids:
+            label, func = STAGES[stage_id][:2]
+            started = time.perf_counter()
+            new_text, stage_changes = func(tool, text, *self.stage_args[stage_id])
+            alignment = None
+            if changes and new_text != text:
+                alignment = align_texts(text, new_text)
+                changes = remap_ranges(changes, alignment)
+            if any(len(change) < 3 for change in stage_changes):
+                # 階段未提供原文片段時，以對齊結果換算回處理前的文字
+                if alignment is None:
+                    alignment = align_texts(text, new_text)
+                sources = source_ranges([change[:2] for change in stage_changes], alignment)
+                stage_changes = [(start, end, text[orig_start:orig_end])
+                                 for (start, end), (orig_start, orig_end) in zip(stage_changes, sources)]
+            changes.extend((start, end, stage_id, original) for start, end, original in stage_changes)
+            timings.append({
+                "stage": stage_id,
+                "label": label,
+                "seconds": time.perf_counter() - started,
+                "changes": len(stage_changes),
+            })
+            text = new_text
+        changes.sort()
+        return {"text": text, "changes": changes, "timings": timings}
+
+def merge_timings(total, timings):
+    """將一次執行的各階段耗時累加到統計中
+
+    參數:
+        total: 累計用的列表 (會被修改)
+        timings: CorrectionPipeline.run 回傳的 timings
+    """
+    for timing in timings:
+        for item in total:
+            if item["stage"] == timing["stage"]:
+                item["seconds"] += timing["seconds"]
+                item["changes"] += timing["changes"]
+                break
+        else:
+            total.append(dict(timing))
+
+def format_timings(timings):
+    """將各階段耗時整理成可顯示的文字
+
+    參數:
+        timings: 各階段的耗時統計列表
+
+    回傳:
+        多行文字
+    """
+    if not timings:
+        return "尚未執行文字校正"
+    total = sum(item["seconds"] for item in timings) or 1e-9
+    lines = []
+    for item in timings:
+        lines.append(f"{item['label']}: {item['seconds'] * 1000:.1f} ms "
+                     f"({item['seconds'] * 100 / total:.0f}%)，修正 {item['changes']} 處")
+    return "\n".join(lines)
+
+def get_pipeline(self, purpose="button"):
+    """取得指定用途的校正流程，階段可在設定中調整
+
+    參數:
+        purpose: "button" (文字修正按鈕) 或 "word_import" (匯入 Word 檔案)
+
+    回傳:
+        CorrectionPipeline 物件
+    """
+    settings = getattr(self, 'settings', None) or {}
+    if purpose == "word_import":
+        stage_ids = settings.get("word_import_stages") or DEFAULT_WORD_IMPORT_STAGES
+    else:
+        stage_ids = settings.get("correction_stages") or DEFAULT_BUTTON_STAGES
+    return CorrectionPipeline(stage_ids)
@@ -0,0 +1,241 @@
+"""
+自訂錯字字典模組 (最長匹配字典樹，編譯結果快取到磁碟)
+"""
+import os
+import re
+import pickle
+import hashlib
+import threading
+
+# 錯字字典檔案路徑 (每行一組「錯誤詞<Tab>正確詞」，# 開頭為註解)
+TYPO_DICT_PATH = "typo_dictionary.txt"
+
+# 編譯後字典的磁碟快取路徑
+TYPO_CACHE_PATH = os.path.join("cache", "typo_dictionary.pickle")
+
+# 快取格式版本，編譯方式改變時遞增讓舊快取失效
+TYPO_CACHE_FORMAT = 1
+
+class TypoDictionary:
+    """錯字字典
+
+    錯誤詞編譯成以字元為節點的字典樹，由左至右掃描一次文字，每個位置取最長的
+    錯誤詞替換後跳到詞尾繼續掃描。不可能是錯誤詞開頭的字元由正規表示式直接略過，
+    因此字典大小幾乎不影響掃描速度。
+    """
+    def __init__(self, entries, digest=''):
+        """編譯字典
+
+        參數:
+            entries: (錯誤詞, 正確詞) 列表，後面的項目會覆蓋前面相同的錯誤詞
+            digest: 字典內容的雜湊值，用於區分不同版本的字典
+        """
+        self.trie = {}
+        self.count = 0
+        for typo, correction in entries:
+            if not typo or typo == correction:
+                continue
+            node = self.trie
+            for char in typo:
+                node = node.setdefault(char, {})
+            if None not in node:
+                self.count += 1
+            node[None] = correction
+        self.digest = digest
+        self._compile_first_chars()
+
+    def _compile_first_chars(self):
+        """建立錯誤詞開頭字元的集合與搜尋用的正規表示式"""
+        self.first_chars = frozenset(self.trie)
+        if self.first_chars:
+            self.first_re = re.compile('[' + ''.join(re.escape(char) for char in sorted(self.first_chars)) + ']')
+        else:
+            self.first_re = None
+
+    def __bool__(self):
+        return bool(self.trie)
+
+    def __getstate__(self):
+        # 正規表示式不存入快取，載入時重新建立
+        return {'trie': self.trie, 'count': self.count, 'digest': self.digest}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile_first_chars()
+
+    def may_match(self, text):
+        """快速檢查文字是否可能含有錯誤詞"""
+        return not self.first_chars.isdisjoint(text)
+
+    def apply(self, text, protected_spans=()):
+        """以最長匹配替換文字中的錯誤詞
+
+        參數:
+            text: 要修正的文字
+            protected_spans: 不可修改的 (start, end) 區段列表 (依位置排序、不重疊)
+
+        回傳:
+            (修正後的文字, 修正位置列表)，修正位置為修正後文字中替換詞的 (start, end, 錯誤詞)
+        """
+        if not self.trie or not text:
+            return text, []
+
+        trie = self.trie
+        search = self.first_re.search
+        length = len(text)
+        spans = list(protected_spans)
+        span_index = 0
+        limit = spans[0][0] if spans else length
+
+        pieces = []
+        changes = []
+        copied = 0
+        output_length = 0
+        position = 0
+        while position < length:
+            if position >= limit:
+                # 跳過保護區段
+                position = max(position, spans[span_index][1])
+                span_index += 1
+                limit = spans[span_index][0] if span_index < len(spans) else length
+                continue
+
+            match = search(text, position, limit)
+            if match is None:
+                position = limit
+                continue
+            position = match.start()
+
+            node = trie[text[position]]
+            best = None
+            end = position + 1
+            if None in node:
+                best = (end, node[None])
+            # 錯誤詞不可延伸進保護區段
+            while end < limit:
+                node = node.get(text[end])
+                if node is None:
+                    break
+                end += 1
+                if None in node:
+                    best = (end, node[None])
+
+            if best is None:
+                position += 1
+                continue
+
+            end, correction = best
+            pieces.append(text[copied:position])
+            output_length += position - copied
+            pieces.append(correction)
+            changes.append((output_length, output_length + len(correction), text[position:end]))
+            output_length += len(correction)
+            copied = position = end
+
+        if not changes:
+            return text, []
+        pieces.append(text[copied:])
+        return ''.join(pieces), changes
+
+def parse_typo_entries(content):
+    """解析錯字字典檔案內容
+
+    參數:
+        content: 檔案文字，每行為「錯誤詞<Tab>正確詞」，也接受以空白分隔
+
+    回傳:
+        (錯誤詞, 正確詞) 列表
+    """
+    entries = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split('\t') if '\t' in line else line.split(None, 1)
+        if len(parts) < 2:
+            continue
+        entries.append((parts[0].strip(), parts[1].strip()))
+    return entries
+
+def compile_typo_dictionary(path=TYPO_DICT_PATH, cache_path=TYPO_CACHE_PATH):
+    """讀取並編譯錯字字典，字典檔案未變動時直接載入磁碟上的編譯結果
+
+    參數:
+        path: 錯字字典檔案路徑
+        cache_path: 編譯結果快取路徑，None 表示不使用快取
+
+    回傳:
+        TypoDictionary 物件 (字典檔案不存在時為空字典)
+    """
+    if not os.path.exists(path):
+        return TypoDictionary([])
+
+    stat = os.stat(path)
+    source = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, TYPO_CACHE_FORMAT)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as file:
+                cached_source, dictionary = pickle.load(file)
+            if cached_source == source:
+                return dictionary
+        except Exception as e:
+            print(f"錯字字典快取無法使用，重新編譯: {str(e)}")
+
+    with open(path, 'rb') as file:
+        data = file.read()
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    dictionary = TypoDictionary(parse_typo_entries(data.decode('utf-8-sig')), digest)
+
+    if cache_path:
+        try:
+            directory = os.path.dirname(cache_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump((source, dictionary), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"無法寫入錯字字典快取: {str(e)}")
+    return dictionary
+
+_dictionary = None
+_dictionary_mtime = None
+_dictionary_lock = threading.Lock()
+
+def get_typo_dictionary():
+    """取得編譯後的錯字字典，字典檔案變動時才重新載入
+
+    回傳:
+        TypoDictionary 物件
+    """
+    global _dictionary, _dictionary_mtime
+    try:
+        mtime = os.stat(TYPO_DICT_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _dictionary is not None and mtime == _dictionary_mtime:
+        return _dictionary
+    with _dictionary_lock:
+        if _dictionary is None or mtime != _dictionary_mtime:
+            _dictionary = compile_typo_dictionary()
+            _dictionary_mtime = mtime
+        return _dictionary
+
+def import_typo_dictionary(source_path):
+    """匯入錯字字典檔案，取代目前使用的字典
+
+    參數:
+        source_path: 要匯入的字典檔案路徑
+
+    回傳:
+        匯入的錯誤詞數量
+    """
+    with open(source_path, 'rb') as file:
+        data = file.read()
+    # 先解析確認格式可用，再寫入字典檔案
+    entries = parse_typo_entries(data.decode('utf-8-sig'))
+    count = TypoDictionary(entries).count
+    with open(TYPO_DICT_PATH, 'wb') as file:
+        file.write(data)
+    return count
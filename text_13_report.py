@@ -0,0 +1,140 @@
+"""
+校正報告匯出模組 (JSON / CSV，逐筆寫入)
+"""
+import os
+import csv
+import json
+import datetime
+import threading
+import traceback
+from tkinter import filedialog, messagebox
+
+# 報告欄位：修正位置 (校正後文字的字元偏移量)、行、列、原文片段、修正後片段、校正階段
+REPORT_FIELDS = ("offset", "line", "column", "original", "replacement", "stage")
+
+def iter_report_records(text, changes, first_line=1, base_offset=0):
+    """將校正流程的修正位置轉換為報告紀錄
+
+    參數:
+        text: 校正後文字
+        changes: (start, end, 階段代號, 原文片段) 列表，位置相對於 text
+        first_line: text 第一行的行號
+        base_offset: text 在整份文件中的起始偏移量
+
+    回傳:
+        (offset, line, column, original, replacement, stage) 產生器，欄位順序同 REPORT_FIELDS；
+        只標示建議的階段 (例如重複字詞) 的 replacement 為建議的文字
+    """
+    from text_05_offset_index import LineIndex
+    from text_11_pipeline import is_suggestion_stage
+    line_index = LineIndex(text, first_line)
+    for change in changes:
+        start, end = change[0], change[1]
+        stage = change[2] if len(change) > 2 else ""
+        original = change[3] if len(change) > 3 else ""
+        line, column = line_index.line_col(start)
+        if is_suggestion_stage(stage):
+            # 建議不修改文字，replacement 為建議的文字
+            yield (base_offset + start, line, column, text[start:end], original, stage)
+        else:
+            yield (base_offset + start, line, column, original, text[start:end], stage)
+
+def write_report_json(file, records, header=None):
+    """以 JSON 格式逐筆寫入報告
+
+    輸出為一個 JSON 物件，header 的欄位在前，修正紀錄在 "corrections" 陣列中。
+    每筆紀錄各自編碼後直接寫入檔案，不會先組成整份報告的字串。
+
+    參數:
+        file: 已開啟的文字檔案
+        records: 報告紀錄的可疊代物件
+        header: 要寫在報告開頭的欄位字典
+
+    回傳:
+        寫入的紀錄數
+    """
+    file.write('{\n')
+    for key, value in (header or {}).items():
+        file.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+    file.write('  "corrections": [')
+    count = 0
+    for record in records:
+        file.write(',\n    ' if count else '\n    ')
+        file.write(json.dumps(dict(zip(REPORT_FIELDS, record)), ensure_ascii=False))
+        count += 1
+    file.write('\n  ]\n}\n' if count else ']\n}\n')
+    return count
+
+def write_report_csv(file, records):
+    """以 CSV 格式逐筆寫入報告 (第一列為欄位名稱)
+
+    參數:
+        file: 以 newline='' 開啟的文字檔案
+        records: 報告紀錄的可疊代物件
+
+    回傳:
+        寫入的紀錄數
+    """
+    writer = csv.writer(file)
+    writer.writerow(REPORT_FIELDS)
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+def export_report(path, records, header=None):
+    """依副檔名將報告寫入 JSON 或 CSV 檔案
+
+    參數:
+        path: 報告檔案路徑 (.csv 為 CSV，其他為 JSON)
+        records: 報告紀錄的可疊代物件
+        header: JSON 報告開頭的欄位字典 (CSV 不使用)
+
+    回傳:
+        寫入的紀錄數
+    """
+    # 先寫入暫存檔再取代，避免中斷時留下不完整的報告
+    temp_path = f"{path}.tmp"
+    if path.lower().endswith('.csv'):
+        # 加上 BOM 讓 Excel 正確辨識 UTF-8
+        with open(temp_path, 'w', encoding='utf-8-sig', newline='') as file:
+            count = write_report_csv(file, records)
+    else:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            count = write_report_json(file, records, header)
+    os.replace(temp_path, path)
+    return count
+
+def export_correction_report(self):
+    """將最近一次校正的修正紀錄匯出為 JSON 或 CSV 檔案 (在背景執行緒中寫入)"""
+    records = getattr(self, 'last_correction_records', None)
+    if not records:
+        messagebox.showinfo("提示", "沒有可匯出的校正紀錄，請先執行文字校正")
+        return
+
+    file_path = filedialog.asksaveasfilename(
+        title="匯出校正報告",
+        defaultextension=".json",
+        filetypes=[("JSON 檔案", "*.json"), ("CSV 檔案", "*.csv")])
+    if not file_path:
+        return
+
+    header = {
+        "generated": datetime.datetime.now().isoformat(timespec='seconds'),
+        "count": len(records),
+    }
+    self.status_bar.config(text="正在匯出校正報告...")
+
+    def export_thread():
+        try:
+            count = export_report(file_path, records, header)
+            self.root.after(0, lambda: self.status_bar.config(text=f"已匯出 {count} 筆校正紀錄: {file_path}"))
+        except Exception as e:
+            error_msg = f"匯出校正報告時發生錯誤: {str(e)}"
+            self.root.after(0, lambda: messagebox.showerror("錯誤", error_msg))
+            self.root.after(0, lambda: self.status_bar.config(text="匯出校正報告失敗"))
+            from utils_01_error_handler import log_error
+            log_error(self, "Report Export Error", error_msg, traceback.format_exc())
+
+    threading.Thread(target=export_thread, daemon=True).start()
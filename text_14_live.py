@@ -0,0 +1,126 @@
+"""
+即時校正模組：輸入停頓後只校正文字區域中可見的行
+"""
+import traceback
+import tkinter as tk
+
+# 停止輸入多久後開始校正 (毫秒)
+LIVE_DELAY_MS = 600
+
+# 可見範圍上下額外校正的行數
+LIVE_MARGIN_LINES = 30
+
+def toggle_live_correction(self):
+    """切換即時校正模式並儲存設定"""
+    self.settings["live_correction"] = bool(self.live_correction_var.get())
+    from config_01_settings import save_settings
+    save_settings(self)
+    if self.settings["live_correction"]:
+        self.status_bar.config(text="已開啟即時校正")
+        schedule_live_correction(self)
+    else:
+        cancel_live_correction(self)
+        self.status_bar.config(text="已關閉即時校正")
+
+def schedule_live_correction(self, event=None):
+    """文字變動後重新計時，停止輸入 LIVE_DELAY_MS 毫秒後才校正可見範圍
+
+    先前尚未套用的結果在文字被修改後自然過期 (見 apply_job_result)。
+    """
+    if not self.settings.get("live_correction"):
+        return
+    if self.live_correction_after:
+        self.root.after_cancel(self.live_correction_after)
+    self.live_correction_after = self.root.after(LIVE_DELAY_MS, lambda: start_live_correction(self))
+
+def cancel_live_correction(self):
+    """取消尚未開始的即時校正，並讓執行中的結果不被套用"""
+    if self.live_correction_after:
+        self.root.after_cancel(self.live_correction_after)
+        self.live_correction_after = None
+    from text_17_correction_queue import LIVE_CORRECTION
+    self.correction_queue.cancel(LIVE_CORRECTION)
+
+def visible_line_range(self, margin=LIVE_MARGIN_LINES):
+    """取得文字區域中可見的行範圍 (含上下額外的行數)
+
+    回傳:
+        (第一行, 最後一行) 行號
+    """
+    first = int(self.text_area.index("@0,0").split('.')[0])
+    last = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split('.')[0])
+    total = int(self.text_area.index("end-1c").split('.')[0])
+    return max(1, first - margin), min(total, last + margin)
+
+def start_live_correction(self):
+    """將可見範圍的校正加入校正工作佇列 (取代尚未完成的即時校正)"""
+    self.live_correction_after = None
+    # 完整校正進行中時不做即時校正
+    if self.correction_cancel_event is not None or not self.converter:
+        return
+
+    first_line, last_line = visible_line_range(self)
+    region = self.text_area.get(f"{first_line}.0", f"{last_line}.end")
+    # 範圍內容與上次校正後相同時不必再校正
+    if self.live_correction_last == (first_line, region):
+        return
+
+    from text_11_pipeline import get_pipeline
+    from text_17_correction_queue import submit_correction_job, LIVE_CORRECTION
+    pipeline = get_pipeline(self)
+
+    def live_job(job):
+        try:
+            result = pipeline.run(self, region)
+        except Exception as e:
+            result = None
+            print(f"即時校正時發生錯誤: {str(e)}")
+            print(traceback.format_exc())
+        self.root.after(0, lambda: _apply_live_result(self, job, first_line, last_line, region, result, pipeline))
+
+    submit_correction_job(self, LIVE_CORRECTION, live_job)
+
+def _apply_live_result(self, job, first_line, last_line, region, result, pipeline):
+    """套用即時校正結果 (在主線程中呼叫)，使用者已繼續輸入時丟棄結果
+
+    參數:
+        job: 即時校正工作 (CorrectionJob)
+        first_line: 校正範圍的第一行
+        last_line: 校正範圍的最後一行
+        region: 校正時範圍內的文字
+        result: 校正流程的結果字典，失敗時為 None
+        pipeline: 使用的校正流程
+    """
+    if result is None or job.cancelled() or self.correction_cancel_event is not None:
+        return
+    from text_17_correction_queue import apply_job_result
+    if not apply_job_result(self, job, lambda: _replace_live_region(self, first_line, last_line, region,
+                                                                     result)):
+        return
+
+    # 記錄到增量校正紀錄，捲動離開後再回來時仍能加上標記
+    from text_06_incremental import remember_paragraphs
+    remember_paragraphs(self, result["text"], result["changes"], pipeline)
+    self.live_correction_last = (first_line, result["text"])
+
+def _replace_live_region(self, first_line, last_line, region, result):
+    """以校正結果取代範圍內的文字，保留游標與捲動位置"""
+    from text_01_correction import _update_text_area
+    from text_05_offset_index import LineIndex
+    corrected = result["text"]
+
+    # 記住游標與捲動位置，取代文字後還原
+    cursor = None
+    insert_line = int(self.text_area.index(tk.INSERT).split('.')[0])
+    if corrected != region and first_line <= insert_line <= last_line:
+        from text_04_alignment import align_texts, map_offset
+        offset = LineIndex(region, first_line).to_offset(self.text_area.index(tk.INSERT))
+        offset = map_offset(offset, align_texts(region, corrected))
+        cursor = LineIndex(corrected, first_line).to_index(offset)
+    view = self.text_area.yview()[0]
+
+    _update_text_area(self, corrected, result["changes"], first_line, last_line - first_line + 1)
+    if corrected != region:
+        if cursor:
+            self.text_area.mark_set(tk.INSERT, cursor)
+        self.text_area.yview_moveto(view)
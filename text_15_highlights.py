@@ -0,0 +1,110 @@
+"""
+修正標記的延遲套用模組：只在可見範圍附近加上標籤
+"""
+# 可見範圍上下保留標籤的行數
+HIGHLIGHT_MARGIN_LINES = 100
+
+# 捲動停止多久後更新標籤 (毫秒)
+HIGHLIGHT_REFRESH_MS = 50
+
+def correction_tag(item):
+    """取得修正位置對應的標籤名稱"""
+    if len(item) > 2:
+        from text_11_pipeline import stage_tag
+        return stage_tag(item[2])
+    return "corrected"
+
+def add_correction_tags(self, text, corrections, first_line=1, line_range=None):
+    """依階段分組為修正位置加上標籤
+
+    參數:
+        text: 修正位置所在的文字 (文字區域中從 first_line 開始的內容)
+        corrections: (start, end, 階段代號, ...) 列表，位置相對於 text
+        first_line: text 在文字區域中的起始行號
+        line_range: 只標記起點落在此 (第一行, 最後一行) 範圍內的修正，None 表示全部
+    """
+    from text_05_offset_index import LineIndex, add_tag_ranges
+    line_index = LineIndex(text, first_line)
+    if line_range is not None:
+        line_count = len(line_index.line_starts)
+        first = max(line_range[0] - first_line, 0)
+        last = min(line_range[1] - first_line + 1, line_count)
+        if first >= last:
+            return
+        low = line_index.line_starts[first]
+        high = line_index.line_starts[last] if last < line_count else len(text) + 1
+        corrections = [item for item in corrections if low <= item[0] < high]
+
+    groups = {}
+    for item in corrections:
+        groups.setdefault(correction_tag(item), []).append(item)
+    for tag, ranges in groups.items():
+        add_tag_ranges(self.text_area, tag, line_index, ranges)
+
+def tag_lines(self, first_line, last_line):
+    """依增量校正紀錄為指定的行加上修正標籤
+
+    紀錄以段落內容的雜湊值為鍵，因此使用者在其他地方增刪行之後仍能找到正確的
+    修正位置；內容已被修改的段落不會再加上舊的標記。
+
+    參數:
+        first_line: 第一行
+        last_line: 最後一行
+    """
+    state = getattr(self, 'correction_state', None)
+    if not state or first_line > last_line:
+        return
+    from text_06_incremental import paragraph_hash
+    paragraph_state = state['paragraphs']
+    text = self.text_area.get(f"{first_line}.0", f"{last_line}.end")
+    corrections = []
+    offset = 0
+    for line in text.split('\n'):
+        if line:
+            local = paragraph_state.get(paragraph_hash(line))
+            if local:
+                corrections.extend((offset + item[0], offset + item[1]) + tuple(item[2:]) for item in local)
+        offset += len(line) + 1
+    if corrections:
+        add_correction_tags(self, text, corrections, first_line)
+
+def refresh_highlights(self):
+    """讓標籤只存在於可見範圍附近：移除範圍外的標籤，為新進入範圍的行加上標籤
+
+    回傳:
+        目前已套用標籤的 (第一行, 最後一行) 範圍
+    """
+    from text_01_correction import CORRECTION_TAGS
+    from text_14_live import visible_line_range
+
+    self.highlight_refresh_after = None
+    window = visible_line_range(self, HIGHLIGHT_MARGIN_LINES)
+    applied = self.highlight_window
+    if applied == window:
+        return window
+
+    first, last = window
+    for tag in CORRECTION_TAGS:
+        if first > 1:
+            self.text_area.tag_remove(tag, "1.0", f"{first}.0")
+        self.text_area.tag_remove(tag, f"{last}.end", "end")
+
+    if applied is None or applied[1] < first or applied[0] > last:
+        tag_lines(self, first, last)
+    else:
+        tag_lines(self, first, applied[0] - 1)
+        tag_lines(self, applied[1] + 1, last)
+    self.highlight_window = window
+    return window
+
+def schedule_highlight_refresh(self):
+    """捲動或內容變動後排程更新標籤 (短時間內多次觸發只更新一次)"""
+    if self.highlight_refresh_after is None:
+        self.highlight_refresh_after = self.root.after(HIGHLIGHT_REFRESH_MS, lambda: refresh_highlights(self))
+
+def reset_highlights(self):
+    """清除所有修正標籤與已套用範圍的紀錄"""
+    from text_01_correction import CORRECTION_TAGS
+    for tag in CORRECTION_TAGS:
+        self.text_area.tag_remove(tag, "1.0", "end")
+    self.highlight_window = None
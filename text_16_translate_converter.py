@@ -0,0 +1,268 @@
+"""
+OpenCC 混合轉換器模組：單字對照以 str.translate 轉換，只有可能組成詞組的片段交給 OpenCC 逐詞比對
+
+用法 (效能比較):
+    python text_16_translate_converter.py [轉換設定] [測試文字檔]
+"""
+import re
+import time
+
+class ConversionStep:
+    """轉換鏈中的一個步驟 (一組依序套用的字典)
+
+    OpenCC 在每個步驟中先比對最長的詞，找不到詞時才以單字對照轉換。若相鄰兩個字
+    不是任何詞組中相連的兩個字，就沒有詞能跨過它們之間，兩側可以分開轉換；切開後
+    只剩一個字的片段只可能套用單字對照，因此以 translate 表一次轉換。
+    步驟資料可以 pickle 保存，載入時只需重新編譯正規表示式。
+    """
+    def __init__(self, group, is_separator):
+        """建立步驟的 translate 表與詞組字元資料
+
+        參數:
+            group: 轉換鏈中的字典列表，每個字典為 (最長鍵長, 最短鍵長, 對照表)
+            is_separator: 判斷字元是否為 OpenCC 斷句字元的函式 (斷句字元不會被轉換)
+        """
+        self.group = [group] if isinstance(group, tuple) else group
+        # OpenCC 的 _convert 接受轉換鏈，這裡只含這一個步驟
+        self.chain = [self.group]
+        table = {}
+        bigrams = set()
+        phrase_chars = set()
+        # 可能被比對到的對照項目 (含斷句字元的鍵永遠不會出現在切開後的文字中)
+        self.entries = []
+        for max_len, min_len, mapping in self.group:
+            for key, value in mapping.items():
+                if any(is_separator(char) for char in key):
+                    continue
+                value = value.split(' ')[0]
+                self.entries.append((key, value))
+                if len(key) == 1:
+                    # 同一個字在多個字典中時，OpenCC 使用排在前面的字典
+                    table.setdefault(key, value)
+                else:
+                    phrase_chars.update(key)
+                    bigrams.update(key[i:i + 2] for i in range(len(key) - 1))
+        self.table = str.maketrans({key: value for key, value in table.items() if key != value})
+        self.bigrams = frozenset(bigrams)
+        self.phrase_chars = ''.join(sorted(phrase_chars))
+        self._compile_run_re()
+
+    def _compile_run_re(self):
+        """建立搜尋詞組字元片段用的正規表示式"""
+        if self.phrase_chars:
+            # 連續兩個以上的詞組字元才可能組成詞
+            self.run_re = re.compile('[' + ''.join(re.escape(char) for char in self.phrase_chars) + ']{2,}')
+        else:
+            self.run_re = None
+
+    def __getstate__(self):
+        # 正規表示式不存入快取，載入時重新建立
+        state = dict(self.__dict__)
+        del state['run_re']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile_run_re()
+
+    def convert(self, text, convert_phrases):
+        """轉換文字 (結果與 OpenCC 在這個步驟的轉換相同)
+
+        參數:
+            text: 要轉換的文字
+            convert_phrases: 以 OpenCC 逐詞比對轉換片段的函式
+
+        回傳:
+            轉換後的文字
+        """
+        if self.run_re is None:
+            return text.translate(self.table)
+        table = self.table
+        bigrams = self.bigrams
+        pieces = []
+        copied = 0
+        for match in self.run_re.finditer(text):
+            start, end = match.span()
+            # 在不屬於任何詞組的相鄰字元之間切開
+            piece_start = start
+            for position in range(start + 1, end):
+                if text[position - 1:position + 1] in bigrams:
+                    continue
+                if position - piece_start > 1:
+                    pieces.append(text[copied:piece_start].translate(table))
+                    pieces.append(convert_phrases(text[piece_start:position], self.chain))
+                    copied = position
+                piece_start = position
+            if end - piece_start > 1:
+                pieces.append(text[copied:piece_start].translate(table))
+                pieces.append(convert_phrases(text[piece_start:end], self.chain))
+                copied = end
+        if not pieces:
+            return text.translate(table)
+        pieces.append(text[copied:].translate(table))
+        return ''.join(pieces)
+
+class HybridConverter:
+    """包裝 OpenCC 轉換器，轉換結果與原本的 convert 完全相同
+
+    其他屬性 (conversion 等) 直接取自原本的轉換器，因此可以取代
+    self.converter 使用。轉換鏈不符合快速轉換的條件時，convert 直接使用原本的轉換器。
+    轉換步驟可以 pickle 保存 (見 ConversionStep)，之後以保存的步驟建立轉換器時，
+    原本的轉換器不必載入字典。
+    """
+    def __init__(self, converter, steps=None):
+        """建立各轉換步驟的 translate 表
+
+        參數:
+            converter: OpenCC 轉換器；未提供 steps 時必須已載入字典
+            steps: 先前由同一個轉換設定建立的 ConversionStep 列表，None 表示依
+                   converter 的字典重新建立
+        """
+        self.converter = converter
+        self.steps = steps if steps is not None else build_conversion_steps(converter)
+
+    def __getattr__(self, name):
+        if name == 'converter':
+            raise AttributeError(name)
+        return getattr(self.converter, name)
+
+    def convert(self, text):
+        """轉換文字
+
+        參數:
+            text: 要轉換的文字
+
+        回傳:
+            轉換後的文字
+        """
+        if self.steps is None:
+            return self.converter.convert(text)
+        convert_phrases = self.converter._convert
+        for step in self.steps:
+            text = step.convert(text, convert_phrases)
+        return text
+
+def build_conversion_steps(converter):
+    """依 OpenCC 轉換器的轉換鏈建立轉換步驟
+
+    OpenCC 先以斷句字元切開文字再逐段轉換，所有步驟都使用同一次的切割結果。
+    混合轉換器不切割文字，而是讓斷句字元保持不變並成為詞組的分界；若前面步驟的
+    轉換結果可能產生新的斷句字元，切割結果會不同，此時不使用快速轉換。
+
+    參數:
+        converter: OpenCC 轉換器
+
+    回傳:
+        ConversionStep 列表；無法保證結果相同時回傳 None
+    """
+    try:
+        if not getattr(converter, '_dict_init_done', True):
+            converter._init_dict()
+        chain = converter._dict_chain_data
+        split_re = converter.split_chars_re
+        converter._convert
+    except Exception as e:
+        print(f"無法建立快速轉換表，使用 OpenCC 原本的轉換: {str(e)}")
+        return None
+
+    def is_separator(char):
+        return split_re.fullmatch(char) is not None
+
+    steps = []
+    for index, group in enumerate(chain):
+        step = ConversionStep(group, is_separator)
+        if index < len(chain) - 1 and any(split_re.search(value) for _, value in step.entries):
+            return None
+        steps.append(step)
+    return steps
+
+def benchmark_conversion(conversion='s2t', text=None, repeat=3):
+    """比較 OpenCC 原本的轉換與混合轉換器的速度，並確認兩者結果相同
+
+    參數:
+        conversion: OpenCC 轉換設定名稱
+        text: 測試文字，None 表示以字典中的詞組與常用字組成測試文字
+        repeat: 重複次數 (取最快的一次)
+
+    回傳:
+        結果字典 (characters、opencc_seconds、hybrid_seconds、speedup、identical)
+    """
+    import opencc
+    converter = opencc.OpenCC(conversion)
+    started = time.perf_counter()
+    hybrid = HybridConverter(converter)
+    build_seconds = time.perf_counter() - started
+    if text is None:
+        text = sample_text(converter)
+
+    def best_time(convert):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = convert(text)
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        return result, best
+
+    expected, opencc_seconds = best_time(converter.convert)
+    result, hybrid_seconds = best_time(hybrid.convert)
+    return {
+        "conversion": conversion,
+        "characters": len(text),
+        "build_seconds": build_seconds,
+        "opencc_seconds": opencc_seconds,
+        "hybrid_seconds": hybrid_seconds,
+        "speedup": opencc_seconds / hybrid_seconds if hybrid_seconds else float('inf'),
+        "identical": result == expected,
+    }
+
+def sample_text(converter, size=200000, seed=0):
+    """以轉換器字典中的詞組、單字與標點符號組成測試文字
+
+    參數:
+        converter: OpenCC 轉換器
+        size: 大約的字元數
+        seed: 亂數種子
+
+    回傳:
+        測試文字
+    """
+    import random
+    generator = random.Random(seed)
+    chain = converter._dict_chain_data
+    keys = sorted({key for group in chain for item in (group if isinstance(group, list) else [group])
+                   for key in item[2]})
+    phrases = [key for key in keys if len(key) > 1] or keys
+    chars = [key for key in keys if len(key) == 1] or keys
+    plain = "的一是不了人我在有他這中大來上個國到說們為子和你地出道也時年"
+    punctuation = "，。、；：？！「」 \n"
+    pieces = []
+    length = 0
+    while length < size:
+        roll = generator.random()
+        if roll < 0.25:
+            piece = generator.choice(phrases)
+        elif roll < 0.55:
+            piece = generator.choice(chars)
+        elif roll < 0.9:
+            piece = generator.choice(plain)
+        else:
+            piece = generator.choice(punctuation)
+        pieces.append(piece)
+        length += len(piece)
+    return ''.join(pieces)
+
+if __name__ == "__main__":
+    import sys
+    conversion = sys.argv[1] if len(sys.argv) > 1 else 's2t'
+    text = None
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'r', encoding='utf-8-sig') as file:
+            text = file.read()
+    result = benchmark_conversion(conversion, text)
+    print(f"轉換設定: {result['conversion']}，文字長度: {result['characters']} 字")
+    print(f"建立轉換表: {result['build_seconds']:.3f} 秒")
+    print(f"OpenCC: {result['opencc_seconds']:.3f} 秒，混合轉換: {result['hybrid_seconds']:.3f} 秒，"
+          f"加速 {result['speedup']:.1f} 倍")
+    print("結果相同" if result['identical'] else "結果不同")
+    sys.exit(0 if result['identical'] else 1)
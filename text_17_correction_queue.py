@@ -0,0 +1,165 @@
+"""
+校正工作佇列模組：由單一常駐的背景執行緒依序執行校正工作，同類工作合併，過期的結果不套用
+"""
+import threading
+import traceback
+
+# 工作類型：完整校正 (文字修正按鈕) 與即時校正 (可見範圍)
+FULL_CORRECTION = "full"
+LIVE_CORRECTION = "live"
+
+class CorrectionJob:
+    """校正工作
+
+    generation 為建立工作時文字區域的修改次數；套用結果時若文字區域已被其他操作
+    修改，結果已經過期而不套用。
+    """
+    def __init__(self, kind, generation, func):
+        """建立校正工作
+
+        參數:
+            kind: 工作類型 (FULL_CORRECTION 或 LIVE_CORRECTION)
+            generation: 建立工作時的文字區域修改次數
+            func: 在背景執行緒中執行的函式，參數為這個工作
+        """
+        self.kind = kind
+        self.generation = generation
+        self.func = func
+        self.cancel_event = threading.Event()
+        # 結果因文字已被修改而被丟棄
+        self.stale = False
+
+    def cancelled(self):
+        """工作是否已被取消 (使用者停止、被較新的同類工作取代或結果已過期)"""
+        return self.cancel_event.is_set()
+
+class CorrectionQueue:
+    """校正工作佇列
+
+    只有一個常駐的背景執行緒，第一次加入工作時才建立。每種類型最多保留一個等待中的
+    工作：加入新工作時，取消同類型等待中與執行中的工作，因此連續多次要求只會執行
+    最新的一次。完整校正優先於即時校正執行。
+    """
+    def __init__(self, priorities=(FULL_CORRECTION, LIVE_CORRECTION)):
+        """建立佇列
+
+        參數:
+            priorities: 工作類型的執行優先順序
+        """
+        self.priorities = priorities
+        self.current = None
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, job):
+        """加入工作，取代同類型尚未完成的工作
+
+        參數:
+            job: CorrectionJob 物件
+
+        回傳:
+            加入的工作
+        """
+        with self._condition:
+            self._cancel_locked(job.kind)
+            self._pending[job.kind] = job
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="correction-worker", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return job
+
+    def cancel(self, kind):
+        """取消指定類型等待中與執行中的工作"""
+        with self._condition:
+            self._cancel_locked(kind)
+
+    def _cancel_locked(self, kind):
+        pending = self._pending.pop(kind, None)
+        if pending is not None:
+            pending.cancel_event.set()
+        current = self.current
+        if current is not None and current.kind == kind:
+            current.cancel_event.set()
+
+    def _next_job(self):
+        """等待並取出優先順序最高的工作"""
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            kind = next((kind for kind in self.priorities if kind in self._pending), None)
+            if kind is None:
+                kind = next(iter(self._pending))
+            job = self._pending.pop(kind)
+            self.current = job
+            return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            try:
+                if not job.cancelled():
+                    job.func(job)
+            except Exception as e:
+                print(f"校正工作執行時發生錯誤: {str(e)}")
+                print(traceback.format_exc())
+            finally:
+                with self._condition:
+                    self.current = None
+
+def track_buffer_edits(self):
+    """記錄文字區域的修改次數 (self.buffer_generation)
+
+    以 Tcl 程序包裝文字區域的元件命令，insert、delete、replace 與復原/重做時遞增
+    修改次數，其他命令與錯誤都原樣傳回。鍵盤輸入、貼上、拖放與程式修改都經過
+    元件命令，因此都會被記錄。
+    """
+    widget = self.text_area
+    name = str(widget)
+    original = name + "_tracked"
+
+    def bump():
+        self.buffer_generation += 1
+
+    bump_command = widget.register(bump)
+    widget.tk.eval(f"rename {name} {original}")
+    widget.tk.eval(f"""proc {name} {{args}} {{
+    set command [lindex $args 0]
+    if {{$command in {{insert delete replace}} || ($command eq "edit" && [lindex $args 1] in {{undo redo}})}} {{
+        {bump_command}
+    }}
+    uplevel 1 [list {original} {{*}}$args]
+}}""")
+
+def submit_correction_job(self, kind, func):
+    """建立校正工作並加入佇列
+
+    參數:
+        kind: 工作類型
+        func: 在背景執行緒中執行的函式，參數為工作
+
+    回傳:
+        CorrectionJob 物件
+    """
+    return self.correction_queue.submit(CorrectionJob(kind, self.buffer_generation, func))
+
+def apply_job_result(self, job, apply):
+    """在主線程中套用工作結果，文字區域在工作開始後被其他操作修改時丟棄結果並停止工作
+
+    套用結果本身造成的修改由工作承接，同一工作後續的結果仍可套用。
+
+    參數:
+        job: 產生結果的工作
+        apply: 套用結果的函式
+
+    回傳:
+        是否已套用
+    """
+    if job.generation != self.buffer_generation:
+        job.stale = True
+        job.cancel_event.set()
+        return False
+    apply()
+    job.generation = self.buffer_generation
+    return True
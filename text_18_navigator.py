@@ -0,0 +1,344 @@
+"""
+修正導覽模組：以排序的修正索引跳到上一個/下一個修正，逐一接受或拒絕 (還原原文)
+"""
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+
+# 目前選取的修正使用的標籤
+CURRENT_CORRECTION_TAG = "current_correction"
+
+class CorrectionIndex:
+    """文件中所有修正位置的排序索引
+
+    hits 為依 (行, 起始列) 排序的 (行, 起始列, 結束列, 階段代號, 原文片段, 修正後片段)
+    列表，positions 為對應的 (行, 起始列)，以二分搜尋從游標位置找到前後的修正。
+    同一行的修正在列表中相鄰，接受或拒絕時只替換該行的項目，不必重新建立索引。
+    """
+    def __init__(self, hits, generation, state):
+        """建立索引
+
+        參數:
+            hits: 依位置排序的修正列表
+            generation: 建立索引時的文字區域修改次數
+            state: 建立索引時的增量校正紀錄 (紀錄被取代時索引需要重建)
+        """
+        self.hits = hits
+        self.positions = [(hit[0], hit[1]) for hit in hits]
+        self.generation = generation
+        self.state = state
+        # 目前選取的修正位置 (行, 起始列)
+        self.selected = None
+
+    def __len__(self):
+        return len(self.hits)
+
+    def next_after(self, line, column):
+        """游標之後的第一個修正 (到結尾時從頭開始)，沒有修正時回傳 None"""
+        if not self.hits:
+            return None
+        i = bisect_right(self.positions, (line, column))
+        return i if i < len(self.hits) else 0
+
+    def next_from(self, line, column):
+        """位於游標或之後的第一個修正 (到結尾時從頭開始)，沒有修正時回傳 None"""
+        if not self.hits:
+            return None
+        i = bisect_left(self.positions, (line, column))
+        return i if i < len(self.hits) else 0
+
+    def previous_before(self, line, column):
+        """游標之前的最後一個修正 (到開頭時從結尾開始)，沒有修正時回傳 None"""
+        if not self.hits:
+            return None
+        i = bisect_left(self.positions, (line, column)) - 1
+        return i if i >= 0 else len(self.hits) - 1
+
+    def at(self, line, column):
+        """包含游標位置的修正，沒有時回傳 None"""
+        i = bisect_right(self.positions, (line, column)) - 1
+        if i >= 0:
+            hit = self.hits[i]
+            if hit[0] == line and hit[1] <= column <= hit[2]:
+                return i
+        return None
+
+    def line_span(self, line):
+        """指定行的修正在列表中的 (起始, 結束) 位置"""
+        return bisect_left(self.positions, (line, -1)), bisect_left(self.positions, (line + 1, -1))
+
+    def replace_line(self, line, hits):
+        """以新的修正列表取代指定行的項目"""
+        low, high = self.line_span(line)
+        self.hits[low:high] = hits
+        self.positions[low:high] = [(hit[0], hit[1]) for hit in hits]
+
+def build_correction_index(self):
+    """由增量校正紀錄與目前的文字建立修正索引
+
+    回傳:
+        CorrectionIndex 物件
+    """
+    from text_06_incremental import paragraph_hash
+    state = getattr(self, 'correction_state', None)
+    hits = []
+    if state:
+        paragraph_state = state['paragraphs']
+        text = self.text_area.get("1.0", "end-1c")
+        for line_number, line in enumerate(text.split('\n'), 1):
+            if not line:
+                continue
+            local = paragraph_state.get(paragraph_hash(line))
+            if local:
+                hits.extend(_line_hits(line_number, line, local))
+    return CorrectionIndex(hits, self.buffer_generation, state)
+
+def _line_hits(line_number, line, local):
+    """將段落內的修正位置轉換為索引項目"""
+    hits = []
+    for item in sorted(local):
+        start, end = item[0], item[1]
+        stage = item[2] if len(item) > 2 else ""
+        original = item[3] if len(item) > 3 else ""
+        hits.append((line_number, start, end, stage, original, line[start:end]))
+    return hits
+
+def get_correction_index(self):
+    """取得修正索引，文字被修改或重新校正後才重建"""
+    index = getattr(self, 'correction_index', None)
+    if index is None or index.generation != self.buffer_generation or index.state is not self.correction_state:
+        self.text_area.tag_remove(CURRENT_CORRECTION_TAG, "1.0", "end")
+        index = build_correction_index(self)
+        self.correction_index = index
+    return index
+
+def _cursor(self):
+    line, column = self.text_area.index(tk.INSERT).split('.')
+    return int(line), int(column)
+
+def select_correction(self, index, i):
+    """選取索引中的第 i 個修正：移動游標、捲動到該處並顯示修正內容"""
+    from text_11_pipeline import STAGES, is_suggestion_stage
+    line, start, end, stage, original, replacement = index.hits[i]
+    start_index = f"{line}.{start}"
+    self.text_area.tag_remove(CURRENT_CORRECTION_TAG, "1.0", "end")
+    self.text_area.tag_add(CURRENT_CORRECTION_TAG, start_index, f"{line}.{end}")
+    self.text_area.mark_set(tk.INSERT, start_index)
+    self.text_area.see(start_index)
+    index.selected = (line, start)
+    label = STAGES[stage][0] if stage in STAGES else stage
+    if is_suggestion_stage(stage):
+        # 建議不修改文字，original 欄位記錄的是建議的文字
+        self.status_bar.config(text=f"修正 {i + 1}/{len(index)}: 「{replacement}」建議改為「{original}」 ({label})")
+    else:
+        self.status_bar.config(text=f"修正 {i + 1}/{len(index)}: 「{original}」→「{replacement}」 ({label})")
+
+def goto_correction(self, forward=True):
+    """跳到游標之後 (或之前) 的修正
+
+    參數:
+        forward: True 為下一個，False 為上一個
+    """
+    index = get_correction_index(self)
+    line, column = _cursor(self)
+    if not forward:
+        i = index.previous_before(line, column)
+    elif index.selected == (line, column):
+        i = index.next_after(line, column)
+    else:
+        # 游標剛好在尚未選取的修正開頭時從這個修正開始
+        i = index.next_from(line, column)
+    if i is None:
+        self.status_bar.config(text="沒有修正可檢視")
+        return
+    select_correction(self, index, i)
+
+def _current_correction(self, index):
+    """游標所在的修正，沒有時在狀態欄提示並回傳 None"""
+    i = index.at(*_cursor(self))
+    if i is None:
+        self.status_bar.config(text="游標不在修正位置上，請先以「下一個修正」選取")
+    return i
+
+def _store_paragraphs(self, index, updates):
+    """將段落的新修正位置寫回增量校正紀錄 (以新的字典取代，背景執行緒不會讀到一半的內容)
+
+    相同內容的段落共用同一筆紀錄，因此決定也會套用到其他相同的段落。
+    """
+    state = self.correction_state
+    paragraphs = dict(state['paragraphs'])
+    paragraphs.update(updates)
+    self.correction_state = {'key': state['key'], 'paragraphs': paragraphs}
+    index.state = self.correction_state
+
+def _select_after(self, index, line, column):
+    """決定後選取下一個修正，已經沒有修正時清除選取標記"""
+    self.text_area.tag_remove(CURRENT_CORRECTION_TAG, "1.0", "end")
+    index.selected = None
+    if len(index):
+        select_correction(self, index, index.next_from(line, column))
+    else:
+        self.status_bar.config(text="所有修正都已檢視完畢")
+
+def accept_correction(self):
+    """接受游標所在的修正：保留修正後的文字，移除標記與索引項目；建議則套用建議的文字"""
+    from text_11_pipeline import is_suggestion_stage
+    index = get_correction_index(self)
+    i = _current_correction(self, index)
+    if i is None:
+        return
+    line, start = index.hits[i][:2]
+    if is_suggestion_stage(index.hits[i][3]):
+        _reject_hits(self, index, [i])
+        _select_after(self, index, line, start)
+        self.status_bar.config(text=f"已套用建議，剩餘 {len(index)} 處" if len(index) else "所有修正都已檢視完畢")
+        return
+    _dismiss_hits(self, index, [i])
+    _select_after(self, index, line, start)
+
+def reject_correction(self):
+    """拒絕游標所在的修正：還原為原文；建議則保留目前的文字並移除標記"""
+    from text_11_pipeline import is_suggestion_stage
+    index = get_correction_index(self)
+    i = _current_correction(self, index)
+    if i is None:
+        return
+    line, start = index.hits[i][:2]
+    if is_suggestion_stage(index.hits[i][3]):
+        _dismiss_hits(self, index, [i])
+        _select_after(self, index, line, start)
+        return
+    _reject_hits(self, index, [i])
+    _select_after(self, index, line, start)
+    self.status_bar.config(text=f"已還原 1 處修正，剩餘 {len(index)} 處" if len(index) else "所有修正都已檢視完畢")
+
+def reject_correction_pattern(self):
+    """拒絕所有與游標所在修正相同的修正 (原文與修正後文字都相同)；建議則全部忽略"""
+    from text_11_pipeline import is_suggestion_stage
+    index = get_correction_index(self)
+    i = _current_correction(self, index)
+    if i is None:
+        return
+    line, start, _, stage, original, replacement = index.hits[i]
+    matches = [j for j, hit in enumerate(index.hits) if hit[4] == original and hit[5] == replacement]
+    if is_suggestion_stage(stage):
+        _dismiss_hits(self, index, matches)
+        _select_after(self, index, line, start)
+        self.status_bar.config(text=f"已忽略 {len(matches)} 處「{replacement}」的建議")
+        return
+    _reject_hits(self, index, matches)
+    _select_after(self, index, line, start)
+    self.status_bar.config(text=f"已還原 {len(matches)} 處「{original}」→「{replacement}」的修正")
+
+def _dismiss_hits(self, index, dismissed):
+    """保留目前的文字，移除索引中指定項目的標記與紀錄
+
+    參數:
+        index: 修正索引
+        dismissed: 要移除的項目在索引中的位置列表
+    """
+    from text_01_correction import CORRECTION_TAGS
+    from text_06_incremental import paragraph_hash
+    by_line = {}
+    for i in dismissed:
+        by_line.setdefault(index.hits[i][0], set()).add(i)
+    updates = {}
+    # 由後往前處理，前面各行在索引中的位置不受影響
+    for line in sorted(by_line, reverse=True):
+        removed = by_line[line]
+        low, high = index.line_span(line)
+        kept = [hit for j, hit in enumerate(index.hits[low:high], low) if j not in removed]
+        text = self.text_area.get(f"{line}.0", f"{line}.end")
+        updates[paragraph_hash(text)] = [_local_item(hit) for hit in kept]
+        for j in removed:
+            start, end = index.hits[j][1:3]
+            for tag in CORRECTION_TAGS:
+                self.text_area.tag_remove(tag, f"{line}.{start}", f"{line}.{end}")
+        index.replace_line(line, kept)
+    _store_paragraphs(self, index, updates)
+
+def _local_item(hit, shift=0):
+    """索引項目轉換回段落內的修正位置 (start, end, 階段代號, 原文片段)"""
+    return (hit[1] + shift, hit[2] + shift, hit[3], hit[4])
+
+def _non_overlapping(index, rejected):
+    """從同一行要還原的修正中選出互不重疊的項目
+
+    重疊的修正 (例如建議與其範圍內的轉換) 只能還原其中一個：包含另一個的修正
+    取代被包含的修正，部分重疊時保留位置在前的修正，另一個隨著文字一起被取代。
+
+    參數:
+        index: 修正索引
+        rejected: 同一行要還原的項目在索引中的位置集合
+
+    回傳:
+        依位置排序的項目位置列表
+    """
+    applied = []
+    for j in sorted(rejected):
+        start, end = index.hits[j][1:3]
+        if applied:
+            last_start, last_end = index.hits[applied[-1]][1:3]
+            if start < last_end:
+                if start <= last_start and end >= last_end:
+                    applied[-1] = j
+                continue
+        applied.append(j)
+    return applied
+
+def _reject_hits(self, index, rejected):
+    """將索引中指定的修正還原為原文 (整組為一個復原步驟)，並更新紀錄與索引
+
+    參數:
+        index: 修正索引
+        rejected: 要還原的項目在索引中的位置列表
+    """
+    from text_01_correction import CORRECTION_TAGS
+    from text_06_incremental import paragraph_hash
+    by_line = {}
+    for i in rejected:
+        by_line.setdefault(index.hits[i][0], set()).add(i)
+
+    updates = {}
+    autoseparators = self.text_area.cget("autoseparators")
+    self.text_area.config(autoseparators=False)
+    self.text_area.edit_separator()
+    try:
+        # 由後往前修改，前面的行與列位置不受影響
+        for line in sorted(by_line, reverse=True):
+            low, high = index.line_span(line)
+            text = self.text_area.get(f"{line}.0", f"{line}.end")
+            applied = _non_overlapping(index, by_line[line])
+            pieces = []
+            kept = []
+            copied = 0
+            shift = 0
+            replaced = [index.hits[j][1:3] for j in applied]
+            for j in range(low, high):
+                hit = index.hits[j]
+                if j in applied:
+                    pieces.append(text[copied:hit[1]])
+                    pieces.append(hit[4])
+                    shift += len(hit[4]) - (hit[2] - hit[1])
+                    copied = hit[2]
+                elif j not in by_line[line] and not any(start < hit[2] and hit[1] < end for start, end in replaced):
+                    # 與被替換範圍重疊的修正 (例如建議範圍內的轉換) 隨著文字一起被取代
+                    kept.append(_local_item(hit, shift))
+            for j in sorted(applied, reverse=True):
+                _, start, end, _, original, _ = index.hits[j]
+                self.text_area.replace(f"{line}.{start}", f"{line}.{end}", original)
+            new_text = ''.join(pieces) + text[copied:]
+            for tag in CORRECTION_TAGS + (CURRENT_CORRECTION_TAG,):
+                self.text_area.tag_remove(tag, f"{line}.0", f"{line}.end")
+            updates[paragraph_hash(new_text)] = kept
+            index.replace_line(line, _line_hits(line, new_text, kept))
+    finally:
+        self.text_area.edit_separator()
+        self.text_area.config(autoseparators=autoseparators)
+
+    # 保留的修正重新加上標記
+    from text_15_highlights import tag_lines
+    _store_paragraphs(self, index, updates)
+    for line in by_line:
+        tag_lines(self, line, line)
+    # 索引已隨修改更新，承接這次修改造成的版本變化
+    index.generation = self.buffer_generation
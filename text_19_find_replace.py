@@ -0,0 +1,291 @@
+"""
+尋找與取代模組：在文字的 Python 副本上一次找出所有符合項目，全部取代時批次修改文字區域
+"""
+import re
+import tkinter as tk
+from bisect import bisect_left
+
+# 全部標示使用的標籤
+SEARCH_TAG = "search_match"
+
+def compile_search(pattern, regex=False, match_case=False):
+    """將搜尋條件編譯為正規表示式
+
+    參數:
+        pattern: 要尋找的文字或正規表示式
+        regex: 是否為正規表示式 (否則視為一般文字)
+        match_case: 是否區分大小寫
+
+    回傳:
+        編譯後的正規表示式 (格式錯誤時拋出 re.error)
+    """
+    flags = re.MULTILINE if regex else 0
+    if not match_case:
+        flags |= re.IGNORECASE
+    return re.compile(pattern if regex else re.escape(pattern), flags)
+
+def find_matches(text, compiled):
+    """一次掃描找出所有符合項目 (略過空字串的符合)
+
+    參數:
+        text: 要搜尋的文字
+        compiled: 編譯後的正規表示式
+
+    回傳:
+        依位置排序的 (start, end) 列表
+    """
+    return [match.span() for match in compiled.finditer(text) if match.end() > match.start()]
+
+def replace_matches(text, compiled, replacement, regex=False):
+    """取代所有符合項目
+
+    參數:
+        text: 原始文字
+        compiled: 編譯後的正規表示式
+        replacement: 取代文字 (正規表示式模式下可使用 \\1、\\g<name> 等群組參照)
+        regex: 是否為正規表示式模式
+
+    回傳:
+        (取代後的文字, (orig_start, orig_end, new_start, new_end) 差異區段列表)
+    """
+    pieces = []
+    edits = []
+    copied = 0
+    output_length = 0
+    for match in compiled.finditer(text):
+        start, end = match.span()
+        if start == end:
+            continue
+        new = match.expand(replacement) if regex else replacement
+        pieces.append(text[copied:start])
+        output_length += start - copied
+        pieces.append(new)
+        edits.append((start, end, output_length, output_length + len(new)))
+        output_length += len(new)
+        copied = end
+    if not edits:
+        return text, []
+    pieces.append(text[copied:])
+    return ''.join(pieces), edits
+
+def get_search_results(self, pattern, regex=False, match_case=False):
+    """取得目前文字的搜尋結果，文字與搜尋條件都沒有改變時沿用上次的結果
+
+    回傳:
+        結果字典 (text、matches、starts、line_index)
+    """
+    key = (self.buffer_generation, pattern, regex, match_case)
+    results = getattr(self, 'search_results', None)
+    if results is not None and results['key'] == key:
+        return results
+    from text_05_offset_index import LineIndex
+    text = self.text_area.get("1.0", "end-1c")
+    matches = find_matches(text, compile_search(pattern, regex, match_case))
+    results = {
+        'key': key,
+        'text': text,
+        'matches': matches,
+        'starts': [start for start, _ in matches],
+        'line_index': LineIndex(text),
+    }
+    self.search_results = results
+    return results
+
+def _selection(self, line_index):
+    """目前選取範圍的 (start, end) 偏移量，沒有選取時回傳 None"""
+    ranges = self.text_area.tag_ranges(tk.SEL)
+    if not ranges:
+        return None
+    return line_index.to_offset(str(ranges[0])), line_index.to_offset(str(ranges[1]))
+
+def find_next(self, pattern, regex=False, match_case=False, backwards=False):
+    """從游標 (或選取範圍) 往後或往前找到下一個符合項目並選取 (到結尾時從頭開始)
+
+    回傳:
+        (符合項目的序號, 符合項目總數)，沒有符合項目時序號為 None
+    """
+    results = get_search_results(self, pattern, regex, match_case)
+    matches = results['matches']
+    if not matches:
+        return None, 0
+    line_index = results['line_index']
+    selection = _selection(self, line_index)
+    if backwards:
+        position = selection[0] if selection else line_index.to_offset(self.text_area.index(tk.INSERT))
+        i = bisect_left(results['starts'], position) - 1
+        if i < 0:
+            i = len(matches) - 1
+    else:
+        position = selection[1] if selection else line_index.to_offset(self.text_area.index(tk.INSERT))
+        i = bisect_left(results['starts'], position)
+        if i >= len(matches):
+            i = 0
+    start, end = matches[i]
+    start_index = line_index.to_index(start)
+    end_index = line_index.to_index(end)
+    self.text_area.tag_remove(tk.SEL, "1.0", "end")
+    self.text_area.tag_add(tk.SEL, start_index, end_index)
+    self.text_area.mark_set(tk.INSERT, end_index)
+    self.text_area.see(start_index)
+    return i, len(matches)
+
+def highlight_matches(self, pattern, regex=False, match_case=False):
+    """標示所有符合項目
+
+    回傳:
+        符合項目數
+    """
+    from text_05_offset_index import add_tag_ranges
+    results = get_search_results(self, pattern, regex, match_case)
+    clear_search_highlight(self)
+    add_tag_ranges(self.text_area, SEARCH_TAG, results['line_index'], results['matches'])
+    return len(results['matches'])
+
+def clear_search_highlight(self):
+    """移除所有符合項目的標示"""
+    self.text_area.tag_remove(SEARCH_TAG, "1.0", "end")
+
+def replace_current(self, pattern, replacement, regex=False, match_case=False):
+    """選取範圍正好是符合項目時取代它，然後選取下一個符合項目
+
+    回傳:
+        (是否已取代, 下一個符合項目的序號, 剩餘的符合項目總數)
+    """
+    results = get_search_results(self, pattern, regex, match_case)
+    selection = _selection(self, results['line_index'])
+    replaced = False
+    if selection:
+        i = bisect_left(results['starts'], selection[0])
+        if i < len(results['matches']) and results['matches'][i] == selection:
+            match = compile_search(pattern, regex, match_case).match(results['text'], selection[0])
+            if match is not None and match.end() == selection[1]:
+                new = match.expand(replacement) if regex else replacement
+                line_index = results['line_index']
+                start_index = line_index.to_index(selection[0])
+                self.text_area.edit_separator()
+                self.text_area.replace(start_index, line_index.to_index(selection[1]), new)
+                self.text_area.edit_separator()
+                self.text_area.mark_set(tk.INSERT, f"{start_index}+{len(new)}c")
+                replaced = True
+    index, count = find_next(self, pattern, regex, match_case)
+    return replaced, index, count
+
+def replace_all(self, pattern, replacement, regex=False, match_case=False):
+    """取代所有符合項目，整批修改為一個復原步驟
+
+    回傳:
+        取代的數量
+    """
+    results = get_search_results(self, pattern, regex, match_case)
+    if not results['matches']:
+        return 0
+    text = results['text']
+    new_text, edits = replace_matches(text, compile_search(pattern, regex, match_case), replacement, regex)
+    if edits:
+        from text_01_correction import apply_minimal_edits
+        clear_search_highlight(self)
+        apply_minimal_edits(self, text, new_text, 1, edits)
+    return len(edits)
+
+def open_find_dialog(self, replace=False):
+    """開啟尋找與取代視窗 (已開啟時移到最上層)
+
+    參數:
+        replace: 是否將焦點放在取代欄位
+    """
+    dialog = getattr(self, 'find_dialog', None)
+    if dialog is not None and dialog.winfo_exists():
+        dialog.lift()
+        (dialog.replace_entry if replace else dialog.find_entry).focus_set()
+        return
+
+    dialog = tk.Toplevel(self.root)
+    dialog.title("尋找與取代")
+    dialog.transient(self.root)
+    dialog.resizable(False, False)
+    self.find_dialog = dialog
+
+    pattern_var = tk.StringVar()
+    replacement_var = tk.StringVar()
+    regex_var = tk.BooleanVar(value=False)
+    match_case_var = tk.BooleanVar(value=False)
+
+    # 預設尋找目前選取的文字 (單行)
+    selected = self.text_area.tag_ranges(tk.SEL)
+    if selected:
+        text = self.text_area.get(selected[0], selected[1])
+        if '\n' not in text:
+            pattern_var.set(text)
+
+    form = tk.Frame(dialog)
+    form.pack(fill=tk.X, padx=10, pady=10)
+    tk.Label(form, text="尋找:").grid(row=0, column=0, sticky=tk.W)
+    find_entry = tk.Entry(form, textvariable=pattern_var, width=36)
+    find_entry.grid(row=0, column=1, padx=5, pady=2)
+    tk.Label(form, text="取代為:").grid(row=1, column=0, sticky=tk.W)
+    replace_entry = tk.Entry(form, textvariable=replacement_var, width=36)
+    replace_entry.grid(row=1, column=1, padx=5, pady=2)
+    dialog.find_entry = find_entry
+    dialog.replace_entry = replace_entry
+
+    options = tk.Frame(dialog)
+    options.pack(fill=tk.X, padx=10)
+    tk.Checkbutton(options, text="正規表示式", variable=regex_var).pack(side=tk.LEFT)
+    tk.Checkbutton(options, text="區分大小寫", variable=match_case_var).pack(side=tk.LEFT)
+
+    result_label = tk.Label(dialog, text="", anchor=tk.W)
+    result_label.pack(fill=tk.X, padx=10, pady=5)
+
+    def run(action):
+        """以目前的搜尋條件執行動作，條件錯誤時在視窗中顯示原因"""
+        pattern = pattern_var.get()
+        if not pattern:
+            result_label.config(text="請輸入要尋找的文字")
+            return
+        try:
+            action(pattern, regex_var.get(), match_case_var.get())
+        except re.error as e:
+            result_label.config(text=f"正規表示式錯誤: {str(e)}")
+
+    def show_position(index, count):
+        if index is None:
+            result_label.config(text="找不到符合的文字")
+        else:
+            result_label.config(text=f"第 {index + 1} 個，共 {count} 個符合")
+
+    def on_find(backwards=False):
+        run(lambda pattern, regex, match_case: show_position(
+            *find_next(self, pattern, regex, match_case, backwards)))
+
+    def on_highlight(pattern, regex, match_case):
+        count = highlight_matches(self, pattern, regex, match_case)
+        result_label.config(text=f"共標示 {count} 個符合" if count else "找不到符合的文字")
+
+    def on_replace(pattern, regex, match_case):
+        _, index, count = replace_current(self, pattern, replacement_var.get(), regex, match_case)
+        show_position(index, count)
+
+    def on_replace_all(pattern, regex, match_case):
+        count = replace_all(self, pattern, replacement_var.get(), regex, match_case)
+        result_label.config(text=f"已取代 {count} 個" if count else "找不到符合的文字")
+        self.status_bar.config(text=f"已取代 {count} 個符合的文字")
+
+    def on_close():
+        clear_search_highlight(self)
+        self.find_dialog = None
+        dialog.destroy()
+
+    buttons = tk.Frame(dialog)
+    buttons.pack(fill=tk.X, padx=10, pady=(0, 10))
+    tk.Button(buttons, text="下一個", command=on_find).pack(side=tk.LEFT, padx=2)
+    tk.Button(buttons, text="上一個", command=lambda: on_find(True)).pack(side=tk.LEFT, padx=2)
+    tk.Button(buttons, text="全部標示", command=lambda: run(on_highlight)).pack(side=tk.LEFT, padx=2)
+    tk.Button(buttons, text="取代", command=lambda: run(on_replace)).pack(side=tk.LEFT, padx=2)
+    tk.Button(buttons, text="全部取代", command=lambda: run(on_replace_all)).pack(side=tk.LEFT, padx=2)
+
+    find_entry.bind("<Return>", lambda event: on_find())
+    replace_entry.bind("<Return>", lambda event: run(on_replace))
+    # 回傳 "break"：Escape 只用來關閉對話框，不再傳給其他綁定
+    dialog.bind("<Escape>", lambda event: on_close() or "break")
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
+    (replace_entry if replace else find_entry).focus_set()
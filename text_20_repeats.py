@@ -0,0 +1,179 @@
+"""
+重複字詞偵測模組：單次掃描找出緊接重複的中文字或短詞，以建議標示而不直接刪除
+"""
+import os
+import re
+import hashlib
+import threading
+
+# 使用者自訂允許重複詞檔案路徑 (每行一個詞，# 開頭為註解)
+REPEAT_ALLOWLIST_PATH = "repeat_allowlist.txt"
+
+# 偵測的重複單位最長字數 (「的的」為 1 字、「我們我們」為 2 字)
+MAX_REPEAT_UNIT = 4
+
+# 預設允許的疊字與重疊詞 (重複後的完整寫法，也包含「高高興興」等 AABB 疊字)
+DEFAULT_ALLOWED_REPEATS = frozenset("""
+常常 看看 謝謝 天天 人人 個個 家家 年年 日日 月月 時時 處處 事事 樣樣 步步 層層 代代 世世
+剛剛 往往 偏偏 漸漸 慢慢 悄悄 輕輕 靜靜 默默 紛紛 匆匆 久久 緊緊 牢牢 深深 遠遠 高高 大大 小小
+好好 多多 早早 快快 白白 明明 稍稍 微微 僅僅 頻頻 連連 恰恰 統統 通通 區區 種種 重重 隱隱
+點點 滴滴 絲絲 片片 條條 件件 次次 句句 字字 聲聲 陣陣 一一 兩兩 三三 星星 娃娃 寶寶 乖乖
+爸爸 媽媽 哥哥 姐姐 姊姊 弟弟 妹妹 爺爺 奶奶 叔叔 伯伯 舅舅 姑姑 公公 婆婆 太太 猩猩 蟈蟈
+想想 試試 說說 聽聽 走走 等等 問問 找找 談談 聊聊 玩玩 坐坐 逛逛 嚐嚐 嘗嘗 摸摸 笑笑 動動 歇歇
+哈哈 呵呵 嘻嘻 嘿嘿 嗚嗚 嘩嘩 轟轟 咚咚 啦啦 嗯嗯 喔喔 哦哦 嗡嗡 呼呼 滴答滴答
+洋洋 茫茫 蒼蒼 綿綿 楚楚 津津 勃勃 欣欣 奄奄 沉沉 昏昏 濛濛 冉冉 彬彬 翩翩 熊熊 滔滔 潺潺
+油油 晶晶 乎乎 茸茸 騰騰 巴巴 溜溜 嘟嘟 滋滋 淋淋 哄哄 灑灑 堂堂
+研究研究 討論討論 休息休息 考慮考慮 商量商量 收拾收拾 打聽打聽 活動活動 整理整理 學習學習
+介紹介紹 認識認識 了解了解 瞭解瞭解 輕鬆輕鬆 高興高興 熱鬧熱鬧 打掃打掃 檢查檢查
+雪白雪白 通紅通紅 冰涼冰涼 筆直筆直 碧綠碧綠
+高高興興 大大小小 大大方方 明明白白 多多少少 快快樂樂 輕輕鬆鬆 輕輕巧巧 慢慢吞吞 時時刻刻
+家家戶戶 世世代代 日日夜夜 點點滴滴 星星點點 三三兩兩 上上下下 高高低低 遠遠近近 深深淺淺
+重重疊疊 層層疊疊 隱隱約約 紛紛擾擾 匆匆忙忙 白白胖胖 堂堂正正 婆婆媽媽
+""".split())
+
+# 中文字範圍 (擴充 A 區、基本區與相容字)
+_CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+
+# 最短的重複單位優先 (「哈哈哈哈」的單位為「哈」而不是「哈哈」)
+_REPEAT_RE = re.compile(f'([{_CJK}]{{1,{MAX_REPEAT_UNIT}}}?)\\1+')
+
+class RepeatDetector:
+    """重複字詞偵測器
+
+    以一個正規表示式由左至右掃描一次文字，每個位置最多嘗試 MAX_REPEAT_UNIT 種
+    單位長度，因此耗時與文字長度成正比，不受允許清單大小影響。找到的重複只作為
+    建議：文字不會被修改，建議內容為保留一個單位。
+    「高高興興」等 AABB 疊字的兩組重複一併略過 (判斷方式見 is_aabb)。
+    """
+    def __init__(self, allowed, digest=''):
+        """建立偵測器
+
+        參數:
+            allowed: 允許重複的完整寫法集合 (例如「謝謝」、「研究研究」)
+            digest: 允許清單內容的雜湊值，用於區分不同版本的清單
+        """
+        self.allowed = frozenset(allowed)
+        self.digest = digest
+
+    def may_match(self, text):
+        """快速檢查文字是否含有重複字詞 (不檢查允許清單)"""
+        return _REPEAT_RE.search(text) is not None
+
+    def is_allowed(self, unit, converter=None):
+        """重複兩次的寫法是否在允許清單中
+
+        參數:
+            unit: 重複的單位
+            converter: 簡繁轉換器，提供時也以轉換後的寫法查詢 (允許清單以繁體中文撰寫)
+        """
+        doubled = unit + unit
+        if doubled in self.allowed:
+            return True
+        return converter is not None and converter.convert(doubled) in self.allowed
+
+    def is_aabb(self, word, converter=None):
+        """四個字的 AABB 寫法是否為疊字
+
+        在允許清單中的寫法 (高高興興) 是疊字；兩組都不在允許清單中時 (的的確確)
+        也視為疊字。只有一組在允許清單中時 (謝謝的的) 兩組分開判斷。
+        """
+        if word in self.allowed or (converter is not None and converter.convert(word) in self.allowed):
+            return True
+        return not self.is_allowed(word[0], converter) and not self.is_allowed(word[2], converter)
+
+    def find(self, text, protected_spans=(), converter=None):
+        """找出文字中緊接重複的字詞
+
+        參數:
+            text: 要檢查的文字
+            protected_spans: 不檢查的 (start, end) 區段列表 (依位置排序、不重疊)
+            converter: 簡繁轉換器，用於以繁體中文比對允許清單
+
+        回傳:
+            (start, end, 建議文字) 列表，start、end 為整段重複的範圍
+        """
+        spans = list(protected_spans)
+        span_index = 0
+        hits = []
+        search = _REPEAT_RE.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                break
+            start, end = match.span()
+            unit = match.group(1)
+            position = end
+            if (len(unit) == 1 and end - start == 2 and end + 1 < len(text)
+                    and text[end] == text[end + 1] and _REPEAT_RE.match(text, end, end + 2)
+                    and self.is_aabb(text[start:end + 2], converter)):
+                # AABB 疊字 (高高興興、的的確確)，兩組都不標示
+                position = end + 2
+                continue
+            if self.is_allowed(unit, converter):
+                continue
+            while span_index < len(spans) and spans[span_index][1] <= start:
+                span_index += 1
+            if span_index < len(spans) and spans[span_index][0] < end:
+                continue
+            hits.append((start, end, unit))
+        return hits
+
+def parse_allowlist(content):
+    """解析允許清單檔案內容
+
+    參數:
+        content: 檔案文字，每行一個詞 (也接受以空白分隔的多個詞)
+
+    回傳:
+        詞的列表
+    """
+    words = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        words.extend(line.split())
+    return words
+
+def load_repeat_detector(path=REPEAT_ALLOWLIST_PATH):
+    """建立偵測器 (預設允許清單加上使用者自訂的允許清單)
+
+    參數:
+        path: 使用者允許清單檔案路徑
+
+    回傳:
+        RepeatDetector 物件
+    """
+    words = list(DEFAULT_ALLOWED_REPEATS)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as file:
+                words.extend(parse_allowlist(file.read()))
+        except Exception as e:
+            print(f"載入允許重複詞清單時發生錯誤: {str(e)}")
+    digest = hashlib.blake2b('\n'.join(sorted(set(words))).encode('utf-8'), digest_size=8).hexdigest()
+    return RepeatDetector(words, digest)
+
+_detector = None
+_detector_mtime = None
+_detector_lock = threading.Lock()
+
+def get_repeat_detector():
+    """取得重複字詞偵測器，允許清單檔案變動時才重新載入
+
+    回傳:
+        RepeatDetector 物件
+    """
+    global _detector, _detector_mtime
+    try:
+        mtime = os.stat(REPEAT_ALLOWLIST_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _detector is not None and mtime == _detector_mtime:
+        return _detector
+    with _detector_lock:
+        if _detector is None or mtime != _detector_mtime:
+            _detector = load_repeat_detector()
+            _detector_mtime = mtime
+        return _detector
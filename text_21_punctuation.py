@@ -0,0 +1,157 @@
+"""
+全形/半形標點正規化模組：以預先建立的 translate 表與一次前後文掃描統一中英文標點
+"""
+import re
+
+# 全形數字與英文字母改為半形 (一對一對照，以 str.translate 一次轉換)
+FULLWIDTH_ALNUM_TABLE = str.maketrans({chr(code): chr(code - 0xfee0)
+                                       for code in list(range(0xff10, 0xff1a)) + list(range(0xff21, 0xff3b))
+                                       + list(range(0xff41, 0xff5b))})
+
+# 與中文相鄰時改為全形的半形標點
+HALF_TO_FULL = {
+    ',': '，',
+    '.': '。',
+    ';': '；',
+    ':': '：',
+    '?': '？',
+    '!': '！',
+    '(': '（',
+    ')': '）',
+}
+
+# 夾在兩個數字之間時改為半形的全形標點 (小數點、時間)
+FULL_TO_HALF_IN_NUMBERS = {
+    '．': '.',
+    '：': ':',
+}
+
+_FULLWIDTH_ALNUM_RE = re.compile('[\uff10-\uff19\uff21-\uff3a\uff41-\uff5a]+')
+
+# 可能需要正規化的字元 (預先檢查用)
+_PUNCTUATION_RE = re.compile('[,.;:?!()\uff0e\uff1a\uff10-\uff19\uff21-\uff3a\uff41-\uff5a]')
+
+# 要檢查前後文的字元；連續的句點 (刪節號) 與換行 (括號不跨段落配對) 也一併找出，
+# 連續的逗號、分號、冒號、問號與驚嘆號 (「!!」、「?!」) 視為一個標點一起決定
+_CANDIDATE_RE = re.compile('\\.{2,}|[,;:?!]+|[.()\uff0e\uff1a\n]')
+
+# 中文字與全形標點 (中文的前後文)
+_CJK_RE = re.compile('[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3000-\u303f'
+                     '\uff01-\uff0f\uff1a-\uff20\uff3b-\uff40\uff5b-\uff65]')
+
+def _is_cjk(char):
+    return bool(char) and _CJK_RE.match(char) is not None
+
+def _is_ascii_alnum(char):
+    return bool(char) and char.isascii() and char.isalnum()
+
+def _chinese_context(text, start, end=None, replacements=None):
+    """半形標點 (或連續的標點) 是否位於中文前後文中
+
+    前一個字是中文時改為全形 (但「檔名.txt」等句點後接英數字時不改)；後一個字是
+    中文且前一個字不是英數字時也改為全形。數字與英文中的標點 (3.14、Hello, world)
+    維持半形。
+
+    參數:
+        text: 文字
+        start: 標點的起點
+        end: 標點的終點，None 表示只有一個字元
+        replacements: 已決定的替換 (起點 -> (終點, 替換文字))，前一個字已決定替換時
+                      (例如改為「）」的右括號) 以替換後的字元判斷
+    """
+    if end is None:
+        end = start + 1
+    previous = text[start - 1] if start > 0 else ''
+    if replacements and start - 1 in replacements and replacements[start - 1][0] == start:
+        previous = replacements[start - 1][1][-1:]
+    following = text[end] if end < len(text) else ''
+    if _is_cjk(previous):
+        return not (text[start:end] == '.' and _is_ascii_alnum(following))
+    return _is_cjk(following) and not _is_ascii_alnum(previous)
+
+def normalize_punctuation(text):
+    """統一全形/半形的數字、英文字母與標點
+
+    先以 translate 表將全形數字與英文字母改為半形，再以一次掃描依前後文決定標點：
+    與中文相鄰的半形標點改為全形，夾在數字之間的全形小數點與冒號改為半形。連續的
+    標點 (「!!」) 一起決定；改為全形的標點後面的半形空白一併移除 (「元, Hello」改為
+    「元，Hello」)。成對的括號一起決定，只要其中一個位於中文前後文中，兩個都改為
+    全形。
+
+    參數:
+        text: 要正規化的文字
+
+    回傳:
+        (正規化後的文字, (start, end, 原文片段) 修正位置列表)，位置以正規化後的文字表示
+    """
+    original = text
+    # 起點 -> (終點, 替換文字)
+    replacements = {}
+    for match in _FULLWIDTH_ALNUM_RE.finditer(text):
+        replacements[match.start()] = (match.end(), match.group().translate(FULLWIDTH_ALNUM_TABLE))
+    if replacements:
+        text = text.translate(FULLWIDTH_ALNUM_TABLE)
+
+    open_parens = []
+    for match in _CANDIDATE_RE.finditer(text):
+        position, end = match.span()
+        char = match.group()
+        if char == '\n':
+            # 括號不跨段落配對，未配對的左括號各自決定
+            for open_position in open_parens:
+                if _chinese_context(text, open_position):
+                    replacements[open_position] = (open_position + 1, '（')
+            open_parens = []
+        elif char.startswith('.') and len(char) > 1:
+            # 刪節號由規則修正處理
+            continue
+        elif char in FULL_TO_HALF_IN_NUMBERS:
+            if (position > 0 and text[position - 1].isascii() and text[position - 1].isdigit()
+                    and end < len(text) and text[end].isascii() and text[end].isdigit()):
+                replacements[position] = (end, FULL_TO_HALF_IN_NUMBERS[char])
+        elif char == '(':
+            open_parens.append(position)
+        elif char == ')':
+            if open_parens:
+                open_position = open_parens.pop()
+                if _chinese_context(text, open_position) or _chinese_context(text, position):
+                    replacements[open_position] = (open_position + 1, '（')
+                    replacements[position] = (end, '）')
+            elif _chinese_context(text, position):
+                replacements[position] = (end, '）')
+        elif _chinese_context(text, position, end, replacements):
+            full = ''.join(HALF_TO_FULL[mark] for mark in char)
+            # 全形標點已含間距，後面的半形空白一併移除
+            while end < len(text) and text[end] == ' ':
+                end += 1
+            replacements[position] = (end, full)
+    for open_position in open_parens:
+        if _chinese_context(text, open_position):
+            replacements[open_position] = (open_position + 1, '（')
+
+    if not replacements:
+        return text, []
+
+    pieces = []
+    changes = []
+    copied = 0
+    length = 0
+    for position in sorted(replacements):
+        end, replacement = replacements[position]
+        pieces.append(text[copied:position])
+        length += position - copied
+        if changes and changes[-1][1] == length:
+            # 相鄰的修正合併為一個區段
+            start, _, snippet = changes[-1]
+            changes[-1] = (start, length + len(replacement), snippet + original[position:end])
+        else:
+            changes.append((length, length + len(replacement), original[position:end]))
+        pieces.append(replacement)
+        length += len(replacement)
+        copied = end
+    pieces.append(text[copied:])
+    return ''.join(pieces), changes
+
+def may_need_punctuation(text):
+    """快速檢查文字是否含有可能需要正規化的字元"""
+    return _PUNCTUATION_RE.search(text) is not None
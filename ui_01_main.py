@@ -6,6 +6,7 @@ import sys
 import tkinter as tk
 import traceback
 import logging
+import multiprocessing
 from tkinter import messagebox
 import platform
 
@@ -96,4 +97,10 @@ def main():
                 pass
 
 if __name__ == "__main__":
+    # 打包成執行檔後，平行校正的子行程需要此呼叫才能正確啟動
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        # 批次模式：不建立視窗，直接校正整個資料夾
+        from file_03_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
     main()
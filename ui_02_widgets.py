@@ -22,7 +22,8 @@ import msoffcrypto
 from utils_01_error_handler import setup_error_logging, log_error
 from config_01_settings import load_settings, save_settings
 from config_02_protected_words import load_protected_words, save_protected_words, manage_protected_words
-from text_01_correction import correct_text_thread, find_differences
+from text_01_correction import find_differences
+from text_17_correction_queue import CorrectionQueue, track_buffer_edits
 from text_02_formatting import adjust_indentation, adjust_text_formatting
 from file_01_word_processor import load_and_display_word_content, parse_word_document_com, handle_password_protected_file
 from file_02_image_handler import extract_images_from_docx, display_image, show_full_image, clear_images, download_images, choose_download_path
@@ -65,19 +66,40 @@ class TextCorrectionTool:
         # 載入詞彙保護表
         self.protected_words = load_protected_words()
 
+        # 增量校正紀錄 (上次校正後各段落的雜湊值與修正位置)
+        self.correction_state = None
+        # 目前校正工作的取消事件
+        self.correction_cancel_event = None
+        # 最近一次校正各階段的耗時統計
+        self.last_correction_timings = []
+        # 最近一次校正的修正紀錄 (供匯出校正報告)
+        self.last_correction_records = []
+        # 目前的完整校正工作
+        self.correction_job = None
+        # 文字區域的修改次數 (校正結果套用前用來判斷是否過期) 與常駐的校正工作佇列
+        self.buffer_generation = 0
+        self.correction_queue = CorrectionQueue()
+        # 即時校正的排程與上次校正後的範圍內容
+        self.live_correction_after = None
+        self.live_correction_last = None
+        # 修正導覽的索引 (第一次使用時建立)
+        self.correction_index = None
+        # 尋找與取代視窗與上次的搜尋結果
+        self.find_dialog = None
+        self.search_results = None
+        # 已套用修正標籤的行範圍與標籤更新排程
+        self.highlight_window = None
+        self.highlight_refresh_after = None
+
         # 載入設定 (包含自訂快捷字)
         self.settings = load_settings()
         # 確保 custom_shortcuts 存在且是列表
         if "custom_shortcuts" not in self.settings or not isinstance(self.settings["custom_shortcuts"], list):
              self.settings["custom_shortcuts"] = []
 
-        # 初始化OpenCC轉換器
-        try:
-            # 使用簡體到繁體的轉換
-            self.converter = opencc.OpenCC('s2t') if opencc else None  # 將簡體字轉為繁體字
-        except Exception as e:
-            messagebox.showerror("錯誤", f"無法初始化OpenCC轉換器: {str(e)}")
-            self.converter = None
+        # OpenCC轉換器在視窗顯示後於背景載入 (見 warm_up_converter)，
+        # 載入完成前開始的校正會等待載入完成
+        self.converter = None
 
         # --- 代辦事項相關初始化 (確保所有相關屬性在 create_widgets 前存在) ---
         self.task_groups = []
@@ -99,6 +121,41 @@ class TextCorrectionTool:
         # 應用深色模式設定
         self.apply_theme()
 
+        # 視窗顯示後再於背景載入 OpenCC 字典
+        self.root.after_idle(self.warm_up_converter)
+
+    def warm_up_converter(self):
+        """在背景執行緒中載入 OpenCC 轉換器 (簡體轉繁體)，完成後設定 self.converter"""
+        if not opencc:
+            return
+        from text_09_converter import get_converter_future, current_conversion
+        future = get_converter_future(current_conversion(self))
+        future.add_done_callback(lambda f: self.root.after(0, lambda: self._on_converter_ready(f)))
+
+    def _on_converter_ready(self, future):
+        """轉換器載入完成 (在主線程中呼叫)"""
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("錯誤", f"無法初始化OpenCC轉換器: {str(error)}")
+            return
+        # 載入期間已切換到其他轉換設定時不套用
+        from text_09_converter import current_conversion
+        converter = future.result()
+        if self.converter is None and converter.conversion == current_conversion(self):
+            self.converter = converter
+
+    def change_conversion(self):
+        """切換 OpenCC 轉換設定 (已載入過的設定直接沿用)"""
+        from text_09_converter import switch_conversion
+        conversion = self.conversion_var.get()
+        future = switch_conversion(self, conversion)
+        save_settings(self)
+        if self.converter is None:
+            self.status_bar.config(text=f"正在載入轉換設定 {conversion}...")
+            future.add_done_callback(lambda f: self.root.after(0, lambda: self._on_converter_ready(f)))
+        else:
+            self.status_bar.config(text=f"已切換轉換設定為 {conversion}")
+
     def setup_error_logging(self):
         """設定錯誤日誌記錄"""
         setup_error_logging()
@@ -123,6 +180,7 @@ class TextCorrectionTool:
         menubar.add_cascade(label="檔案", menu=file_menu)
         file_menu.add_command(label="開啟", command=self.open_file)
         file_menu.add_command(label="儲存", command=self.save_file)
+        file_menu.add_command(label="匯出校正報告", command=self.export_correction_report)
         file_menu.add_separator()
         file_menu.add_command(label="離開", command=self.root.quit)
 
@@ -130,20 +188,44 @@ class TextCorrectionTool:
         edit_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="編輯", menu=edit_menu)
         edit_menu.add_command(label="還原上一步", command=self.undo_last_action) # 加入還原
+        edit_menu.add_command(label="尋找", accelerator="Ctrl+F", command=self.find_text)
+        edit_menu.add_command(label="取代", accelerator="Ctrl+H", command=self.replace_text)
         edit_menu.add_separator()
         edit_menu.add_command(label="管理保護詞彙", command=self.manage_protected_words)
+        edit_menu.add_command(label="匯入錯字字典", command=self.import_typo_dictionary)
         edit_menu.add_command(label="清除紅色標記", command=self.clear_correction_highlights)
+        # 修正導覽子選單
+        navigator_menu = tk.Menu(edit_menu, tearoff=0)
+        edit_menu.add_cascade(label="修正導覽", menu=navigator_menu)
+        navigator_menu.add_command(label="下一個修正", accelerator="F8", command=self.next_correction)
+        navigator_menu.add_command(label="上一個修正", accelerator="Shift+F8", command=self.previous_correction)
+        navigator_menu.add_separator()
+        navigator_menu.add_command(label="接受此修正 (套用建議)", command=self.accept_correction)
+        navigator_menu.add_command(label="拒絕此修正 (還原原文 / 忽略建議)", command=self.reject_correction)
+        navigator_menu.add_command(label="拒絕所有相同修正", command=self.reject_correction_pattern)
 
         # 設定選單
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="設定", menu=settings_menu)
         settings_menu.add_command(label="文字格式", command=self.open_text_settings)
         settings_menu.add_command(label="換色模式", command=self.toggle_dark_mode)
+        # 轉換設定子選單
+        from text_09_converter import CONVERSION_PROFILES, current_conversion
+        conversion_menu = tk.Menu(settings_menu, tearoff=0)
+        settings_menu.add_cascade(label="轉換設定", menu=conversion_menu)
+        self.conversion_var = tk.StringVar(value=current_conversion(self))
+        for conversion, label in CONVERSION_PROFILES:
+            conversion_menu.add_radiobutton(label=f"{label} ({conversion})", value=conversion,
+                                            variable=self.conversion_var, command=self.change_conversion)
+        self.live_correction_var = tk.BooleanVar(value=bool(self.settings.get("live_correction")))
+        settings_menu.add_checkbutton(label="即時校正", variable=self.live_correction_var,
+                                      command=self.toggle_live_correction)
 
         # 檢視選單
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="檢視", menu=view_menu)
         view_menu.add_command(label="錯誤日誌", command=self.view_error_logs)
+        view_menu.add_command(label="校正耗時統計", command=self.show_correction_timings)
 
         # 主框架
         main_frame = tk.Frame(self.root)
@@ -215,6 +297,9 @@ class TextCorrectionTool:
         self.correct_button = tk.Button(self.toolbar_top_frame, text="文字修正", command=self.correct_text)
         self.correct_button.pack(side=tk.LEFT, padx=2, pady=2)
 
+        self.cancel_correct_button = tk.Button(self.toolbar_top_frame, text="停止校正", command=self.cancel_correction, state=tk.DISABLED)
+        self.cancel_correct_button.pack(side=tk.LEFT, padx=2, pady=2)
+
         self.add_shortcut_button = tk.Button(self.toolbar_top_frame, text="新增快捷字", command=self.add_shortcut)
         self.add_shortcut_button.pack(side=tk.LEFT, padx=2, pady=2)
 
@@ -278,6 +363,7 @@ class TextCorrectionTool:
 
         #   添加垂直滾動條 (父容器: text_frame)
         y_scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL)
+        self.y_scrollbar = y_scrollbar
         y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # 文字處理區域 - 啟用 undo
@@ -287,17 +373,36 @@ class TextCorrectionTool:
                                spacing1=self.settings["line_spacing_within"], # 使用 spacing1
                                wrap=tk.WORD,
                                undo=True, # 啟用 Undo/Redo
-                               yscrollcommand=y_scrollbar.set)
+                               yscrollcommand=self.on_text_scroll)
         self.text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # 創建紅色底線標籤
         self.text_area.tag_configure("corrected", underline=True, underlinefg="red")
+        # 錯字字典修正使用橘色底線
+        self.text_area.tag_configure("typo_corrected", underline=True, underlinefg="orange")
+        # 重複字詞建議使用藍色底線 (文字未被修改)
+        self.text_area.tag_configure("repeat_suggestion", underline=True, underlinefg="#1677ff")
+        # 修正導覽目前選取的修正
+        self.text_area.tag_configure("current_correction", background="#ffe58f")
+        # 尋找時全部標示的符合項目
+        self.text_area.tag_configure("search_match", background="#bae7ff")
 
         # 設置縮進
         self.text_area.config(tabs=("1c", "2c", "3c", "4c"), tabstyle="wordprocessor")
 
+        # 記錄文字區域的修改次數
+        track_buffer_edits(self)
+
         # 綁定事件
         self.text_area.bind("<<Modified>>", self.adjust_indentation)
+        # 即時校正：輸入停頓後校正可見範圍
+        self.text_area.bind("<KeyRelease>", self.schedule_live_correction, add="+")
+        # 修正導覽：F8 下一個、Shift+F8 上一個
+        self.text_area.bind("<F8>", lambda event: self.next_correction() or "break")
+        self.text_area.bind("<Shift-F8>", lambda event: self.previous_correction() or "break")
+        # 尋找與取代
+        self.text_area.bind("<Control-f>", lambda event: self.find_text() or "break")
+        self.text_area.bind("<Control-h>", lambda event: self.replace_text() or "break")
 
         #   設置滾動條命令
         y_scrollbar.config(command=self.text_area.yview)
@@ -537,21 +642,109 @@ class TextCorrectionTool:
         from text_01_correction import correct_text
         correct_text(self)
 
+    def cancel_correction(self):
+        """停止正在進行的文字校正"""
+        from text_01_correction import cancel_correction
+        cancel_correction(self)
+
+    def export_correction_report(self):
+        """匯出最近一次校正的修正紀錄"""
+        from text_13_report import export_correction_report
+        export_correction_report(self)
+
+    def show_correction_timings(self):
+        """顯示最近一次校正各階段的耗時與修正數"""
+        from text_11_pipeline import format_timings
+        messagebox.showinfo("校正耗時統計", format_timings(self.last_correction_timings))
+
     def clear_correction_highlights(self):
         """清除所有校正標記"""
-        self.text_area.tag_remove("corrected", "1.0", tk.END)
+        from text_15_highlights import reset_highlights
+        reset_highlights(self)
+        # 清除增量校正紀錄，避免下次校正時還原已清除的標記
+        from text_06_incremental import reset_correction_state
+        reset_correction_state(self)
         self.status_bar.config(text="已清除所有校正標記")
 
+    def find_text(self):
+        """開啟尋找視窗"""
+        from text_19_find_replace import open_find_dialog
+        open_find_dialog(self)
+
+    def replace_text(self):
+        """開啟取代視窗"""
+        from text_19_find_replace import open_find_dialog
+        open_find_dialog(self, replace=True)
+
+    def next_correction(self):
+        """跳到下一個修正"""
+        from text_18_navigator import goto_correction
+        goto_correction(self, forward=True)
+
+    def previous_correction(self):
+        """跳到上一個修正"""
+        from text_18_navigator import goto_correction
+        goto_correction(self, forward=False)
+
+    def accept_correction(self):
+        """接受游標所在的修正"""
+        from text_18_navigator import accept_correction
+        accept_correction(self)
+
+    def reject_correction(self):
+        """拒絕游標所在的修正，還原原文"""
+        from text_18_navigator import reject_correction
+        reject_correction(self)
+
+    def reject_correction_pattern(self):
+        """拒絕所有與游標所在修正相同的修正"""
+        from text_18_navigator import reject_correction_pattern
+        reject_correction_pattern(self)
+
     def manage_protected_words(self):
         """管理保護詞彙的視窗"""
         from config_02_protected_words import manage_protected_words
         manage_protected_words(self)
 
+    def import_typo_dictionary(self):
+        """匯入自訂錯字字典檔案"""
+        file_path = filedialog.askopenfilename(
+            title="匯入錯字字典",
+            filetypes=[("文字檔案", "*.txt"), ("所有檔案", "*.*")])
+        if not file_path:
+            return
+        try:
+            from text_12_typo_dictionary import import_typo_dictionary, get_typo_dictionary
+            count = import_typo_dictionary(file_path)
+            # 先編譯並寫入磁碟快取，下次啟動可直接載入
+            get_typo_dictionary()
+            self.status_bar.config(text=f"已匯入錯字字典，共 {count} 個錯誤詞")
+        except Exception as e:
+            error_msg = f"匯入錯字字典時發生錯誤: {str(e)}"
+            messagebox.showerror("錯誤", error_msg)
+            log_error(self, "Typo Dictionary Import Error", error_msg, traceback.format_exc())
+
     def open_text_settings(self):
         """開啟文字格式設定視窗"""
         from config_01_settings import open_text_settings
         open_text_settings(self)
 
+    def toggle_live_correction(self):
+        """切換即時校正模式"""
+        from text_14_live import toggle_live_correction
+        toggle_live_correction(self)
+
+    def on_text_scroll(self, first, last):
+        """文字區域捲動時更新捲軸，並排程更新可見範圍附近的修正標籤"""
+        self.y_scrollbar.set(first, last)
+        from text_15_highlights import schedule_highlight_refresh
+        schedule_highlight_refresh(self)
+
+    def schedule_live_correction(self, event=None):
+        """輸入後排程即時校正"""
+        from text_14_live import schedule_live_correction
+        schedule_live_correction(self, event)
+
     def toggle_dark_mode(self):
         """切換深色模式"""
         from config_01_settings import toggle_dark_mode